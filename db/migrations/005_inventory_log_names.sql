@@ -0,0 +1,39 @@
+-- Kullanıcı ve konum görünen adlarını log satırında sakla;
+-- listeleme sorguları users / lookup_items JOIN'lerine ihtiyaç duymaz.
+ALTER TABLE inventory_logs ADD COLUMN old_user_name TEXT;
+ALTER TABLE inventory_logs ADD COLUMN new_user_name TEXT;
+ALTER TABLE inventory_logs ADD COLUMN changed_by_name TEXT;
+ALTER TABLE inventory_logs ADD COLUMN old_location_name TEXT;
+ALTER TABLE inventory_logs ADD COLUMN new_location_name TEXT;
+
+-- Mevcut kayıtları doldur
+UPDATE inventory_logs SET
+  old_user_name = (SELECT COALESCE(TRIM(u.first_name || ' ' || u.last_name), u.username)
+                   FROM users u WHERE u.id = inventory_logs.old_user_id),
+  new_user_name = (SELECT COALESCE(TRIM(u.first_name || ' ' || u.last_name), u.username)
+                   FROM users u WHERE u.id = inventory_logs.new_user_id),
+  changed_by_name = (SELECT COALESCE(TRIM(u.first_name || ' ' || u.last_name), u.username)
+                     FROM users u WHERE u.id = inventory_logs.changed_by),
+  old_location_name = (SELECT l.name FROM lookup_items l
+                       WHERE l.id = CAST(inventory_logs.old_location AS INTEGER)),
+  new_location_name = (SELECT l.name FROM lookup_items l
+                       WHERE l.id = CAST(inventory_logs.new_location AS INTEGER));
+
+-- Yeni kayıtlarda adları birincil anahtar aramalarıyla doldur
+DROP TRIGGER IF EXISTS trg_inventory_logs_names;
+CREATE TRIGGER trg_inventory_logs_names
+AFTER INSERT ON inventory_logs
+BEGIN
+  UPDATE inventory_logs SET
+    old_user_name = (SELECT COALESCE(TRIM(u.first_name || ' ' || u.last_name), u.username)
+                     FROM users u WHERE u.id = NEW.old_user_id),
+    new_user_name = (SELECT COALESCE(TRIM(u.first_name || ' ' || u.last_name), u.username)
+                     FROM users u WHERE u.id = NEW.new_user_id),
+    changed_by_name = (SELECT COALESCE(TRIM(u.first_name || ' ' || u.last_name), u.username)
+                       FROM users u WHERE u.id = NEW.changed_by),
+    old_location_name = (SELECT l.name FROM lookup_items l
+                         WHERE l.id = CAST(NEW.old_location AS INTEGER)),
+    new_location_name = (SELECT l.name FROM lookup_items l
+                         WHERE l.id = CAST(NEW.new_location AS INTEGER))
+  WHERE id = NEW.id;
+END;
@@ -0,0 +1,43 @@
+-- Her envanter için son durumu tutan fiziksel tablo.
+-- v_inventory_latest VIEW'i her sorguda tüm log tablosunu tarıyordu;
+-- bu tablo her log eklemesinde trigger ile güncellenir.
+CREATE TABLE IF NOT EXISTS inventory_current_state (
+  inventory_type TEXT NOT NULL,
+  inventory_id INTEGER NOT NULL,
+  log_id INTEGER NOT NULL,                -- durumu belirleyen inventory_logs.id
+  new_user_id INTEGER,
+  new_location TEXT,
+  action TEXT NOT NULL,
+  change_date TIMESTAMP,
+  PRIMARY KEY (inventory_type, inventory_id)
+);
+
+-- Mevcut geçmişten doldur
+INSERT OR REPLACE INTO inventory_current_state
+  (inventory_type, inventory_id, log_id, new_user_id, new_location, action, change_date)
+SELECT inventory_type, inventory_id, id, new_user_id, new_location, action, change_date
+FROM v_inventory_latest;
+
+CREATE INDEX IF NOT EXISTS idx_ics_new_user ON inventory_current_state (new_user_id);
+CREATE INDEX IF NOT EXISTS idx_ics_new_location ON inventory_current_state (new_location);
+CREATE INDEX IF NOT EXISTS idx_ics_date ON inventory_current_state (change_date DESC, log_id DESC);
+
+-- Yeni log satırı yalnızca mevcut durumdan daha yeniyse durumu değiştirir
+-- (geriye tarihli toplu aktarımlar güncel durumu ezmez).
+DROP TRIGGER IF EXISTS trg_inventory_logs_current_state;
+CREATE TRIGGER trg_inventory_logs_current_state
+AFTER INSERT ON inventory_logs
+BEGIN
+  INSERT INTO inventory_current_state
+    (inventory_type, inventory_id, log_id, new_user_id, new_location, action, change_date)
+  VALUES
+    (NEW.inventory_type, NEW.inventory_id, NEW.id, NEW.new_user_id, NEW.new_location, NEW.action, NEW.change_date)
+  ON CONFLICT (inventory_type, inventory_id) DO UPDATE SET
+    log_id = excluded.log_id,
+    new_user_id = excluded.new_user_id,
+    new_location = excluded.new_location,
+    action = excluded.action,
+    change_date = excluded.change_date
+  WHERE (excluded.change_date, excluded.log_id)
+        >= (inventory_current_state.change_date, inventory_current_state.log_id);
+END;
@@ -0,0 +1,8 @@
+-- Kullanıcı geçmişi sorguları için tek kullanıcı kolonuyla başlayan index'ler.
+-- (old_user_id, new_user_id) bileşik index'i "old = ? OR new = ?" koşulunda
+-- new_user_id tarafı için kullanılamıyordu; sorgu iki UNION ALL koluna bölünür
+-- ve her kol kendi index'inden tarih sırasıyla okunur.
+CREATE INDEX IF NOT EXISTS idx_il_old_user_date
+  ON inventory_logs (old_user_id, change_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_il_new_user_date
+  ON inventory_logs (new_user_id, change_date DESC, id DESC);
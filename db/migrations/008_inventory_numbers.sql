@@ -0,0 +1,103 @@
+-- Tüm envanter tablolarındaki envanter numaralarını tek yerde tutan index tablosu.
+-- Kayıtlar sayfası daha önce dört tablonun tamamını okuyup açılır listeye
+-- basıyordu; arama artık bu tablo üzerinden önek/alt dize eşleşmesiyle yapılır.
+CREATE TABLE IF NOT EXISTS inventory_numbers (
+  inventory_type TEXT NOT NULL,            -- 'pc' | 'license' | 'accessory' | 'stock'
+  inventory_id INTEGER NOT NULL,
+  inventory_no TEXT COLLATE NOCASE,
+  name TEXT COLLATE NOCASE,
+  PRIMARY KEY (inventory_type, inventory_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_inventory_numbers_no ON inventory_numbers (inventory_no);
+CREATE INDEX IF NOT EXISTS idx_inventory_numbers_name ON inventory_numbers (name);
+
+-- Mevcut kayıtlardan doldur
+INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+SELECT 'pc', id, no, bilgisayar_adi FROM hardware_inventory;
+INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+SELECT 'license', id, envanter_no, yazilim_adi FROM license_inventory;
+INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+SELECT 'accessory', id, ifs_no, urun_adi FROM accessory_inventory;
+INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+SELECT 'stock', id, CAST(id AS TEXT), urun_adi FROM stock_tracking;
+
+-- Donanım
+DROP TRIGGER IF EXISTS trg_inventory_numbers_pc_ins;
+CREATE TRIGGER trg_inventory_numbers_pc_ins AFTER INSERT ON hardware_inventory
+BEGIN
+  INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+  VALUES ('pc', NEW.id, NEW.no, NEW.bilgisayar_adi);
+END;
+DROP TRIGGER IF EXISTS trg_inventory_numbers_pc_upd;
+CREATE TRIGGER trg_inventory_numbers_pc_upd AFTER UPDATE OF id, no, bilgisayar_adi ON hardware_inventory
+BEGIN
+  DELETE FROM inventory_numbers WHERE inventory_type = 'pc' AND inventory_id = OLD.id;
+  INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+  VALUES ('pc', NEW.id, NEW.no, NEW.bilgisayar_adi);
+END;
+DROP TRIGGER IF EXISTS trg_inventory_numbers_pc_del;
+CREATE TRIGGER trg_inventory_numbers_pc_del AFTER DELETE ON hardware_inventory
+BEGIN
+  DELETE FROM inventory_numbers WHERE inventory_type = 'pc' AND inventory_id = OLD.id;
+END;
+
+-- Lisans
+DROP TRIGGER IF EXISTS trg_inventory_numbers_license_ins;
+CREATE TRIGGER trg_inventory_numbers_license_ins AFTER INSERT ON license_inventory
+BEGIN
+  INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+  VALUES ('license', NEW.id, NEW.envanter_no, NEW.yazilim_adi);
+END;
+DROP TRIGGER IF EXISTS trg_inventory_numbers_license_upd;
+CREATE TRIGGER trg_inventory_numbers_license_upd AFTER UPDATE OF id, envanter_no, yazilim_adi ON license_inventory
+BEGIN
+  DELETE FROM inventory_numbers WHERE inventory_type = 'license' AND inventory_id = OLD.id;
+  INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+  VALUES ('license', NEW.id, NEW.envanter_no, NEW.yazilim_adi);
+END;
+DROP TRIGGER IF EXISTS trg_inventory_numbers_license_del;
+CREATE TRIGGER trg_inventory_numbers_license_del AFTER DELETE ON license_inventory
+BEGIN
+  DELETE FROM inventory_numbers WHERE inventory_type = 'license' AND inventory_id = OLD.id;
+END;
+
+-- Aksesuar
+DROP TRIGGER IF EXISTS trg_inventory_numbers_accessory_ins;
+CREATE TRIGGER trg_inventory_numbers_accessory_ins AFTER INSERT ON accessory_inventory
+BEGIN
+  INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+  VALUES ('accessory', NEW.id, NEW.ifs_no, NEW.urun_adi);
+END;
+DROP TRIGGER IF EXISTS trg_inventory_numbers_accessory_upd;
+CREATE TRIGGER trg_inventory_numbers_accessory_upd AFTER UPDATE OF id, ifs_no, urun_adi ON accessory_inventory
+BEGIN
+  DELETE FROM inventory_numbers WHERE inventory_type = 'accessory' AND inventory_id = OLD.id;
+  INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+  VALUES ('accessory', NEW.id, NEW.ifs_no, NEW.urun_adi);
+END;
+DROP TRIGGER IF EXISTS trg_inventory_numbers_accessory_del;
+CREATE TRIGGER trg_inventory_numbers_accessory_del AFTER DELETE ON accessory_inventory
+BEGIN
+  DELETE FROM inventory_numbers WHERE inventory_type = 'accessory' AND inventory_id = OLD.id;
+END;
+
+-- Stok (envanter numarası olarak kayıt id'si kullanılır)
+DROP TRIGGER IF EXISTS trg_inventory_numbers_stock_ins;
+CREATE TRIGGER trg_inventory_numbers_stock_ins AFTER INSERT ON stock_tracking
+BEGIN
+  INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+  VALUES ('stock', NEW.id, CAST(NEW.id AS TEXT), NEW.urun_adi);
+END;
+DROP TRIGGER IF EXISTS trg_inventory_numbers_stock_upd;
+CREATE TRIGGER trg_inventory_numbers_stock_upd AFTER UPDATE OF id, urun_adi ON stock_tracking
+BEGIN
+  DELETE FROM inventory_numbers WHERE inventory_type = 'stock' AND inventory_id = OLD.id;
+  INSERT OR REPLACE INTO inventory_numbers (inventory_type, inventory_id, inventory_no, name)
+  VALUES ('stock', NEW.id, CAST(NEW.id AS TEXT), NEW.urun_adi);
+END;
+DROP TRIGGER IF EXISTS trg_inventory_numbers_stock_del;
+CREATE TRIGGER trg_inventory_numbers_stock_del AFTER DELETE ON stock_tracking
+BEGIN
+  DELETE FROM inventory_numbers WHERE inventory_type = 'stock' AND inventory_id = OLD.id;
+END;
@@ -0,0 +1,6 @@
+-- activity_log yalnızca birincil anahtarla indeksliydi; ana sayfadaki son
+-- işlemler ve kullanıcı log sayfası her seferinde tüm tabloyu sıralıyordu.
+CREATE INDEX IF NOT EXISTS idx_activity_log_time
+  ON activity_log (timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_activity_log_user_time
+  ON activity_log (username, timestamp DESC, id DESC);
@@ -0,0 +1,127 @@
+-- Dış sistemlerin (CMDB senkronizasyonu, raporlama betikleri) yalnızca
+-- değişen satırları okuyabilmesi için değişiklik kaydı. Her envanter
+-- tablosundaki ekleme/güncelleme/silme bir satır ekler; /changes uç noktası
+-- seq değerini imleç olarak kullanır.
+CREATE TABLE IF NOT EXISTS change_log (
+  seq INTEGER PRIMARY KEY AUTOINCREMENT,
+  table_name TEXT NOT NULL,
+  row_id INTEGER NOT NULL,
+  op TEXT NOT NULL CHECK (op IN ('I','U','D')),
+  changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_change_log_row ON change_log (table_name, row_id, seq);
+
+-- hardware_inventory
+DROP TRIGGER IF EXISTS trg_change_log_hardware_inventory_ins;
+CREATE TRIGGER trg_change_log_hardware_inventory_ins AFTER INSERT ON hardware_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('hardware_inventory', NEW.id, 'I');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_hardware_inventory_upd;
+CREATE TRIGGER trg_change_log_hardware_inventory_upd AFTER UPDATE ON hardware_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op)
+  SELECT 'hardware_inventory', OLD.id, 'D' WHERE OLD.id IS NOT NEW.id;
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('hardware_inventory', NEW.id, 'U');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_hardware_inventory_del;
+CREATE TRIGGER trg_change_log_hardware_inventory_del AFTER DELETE ON hardware_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('hardware_inventory', OLD.id, 'D');
+END;
+
+-- printer_inventory
+DROP TRIGGER IF EXISTS trg_change_log_printer_inventory_ins;
+CREATE TRIGGER trg_change_log_printer_inventory_ins AFTER INSERT ON printer_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('printer_inventory', NEW.id, 'I');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_printer_inventory_upd;
+CREATE TRIGGER trg_change_log_printer_inventory_upd AFTER UPDATE ON printer_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op)
+  SELECT 'printer_inventory', OLD.id, 'D' WHERE OLD.id IS NOT NEW.id;
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('printer_inventory', NEW.id, 'U');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_printer_inventory_del;
+CREATE TRIGGER trg_change_log_printer_inventory_del AFTER DELETE ON printer_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('printer_inventory', OLD.id, 'D');
+END;
+
+-- license_inventory
+DROP TRIGGER IF EXISTS trg_change_log_license_inventory_ins;
+CREATE TRIGGER trg_change_log_license_inventory_ins AFTER INSERT ON license_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('license_inventory', NEW.id, 'I');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_license_inventory_upd;
+CREATE TRIGGER trg_change_log_license_inventory_upd AFTER UPDATE ON license_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op)
+  SELECT 'license_inventory', OLD.id, 'D' WHERE OLD.id IS NOT NEW.id;
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('license_inventory', NEW.id, 'U');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_license_inventory_del;
+CREATE TRIGGER trg_change_log_license_inventory_del AFTER DELETE ON license_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('license_inventory', OLD.id, 'D');
+END;
+
+-- accessory_inventory
+DROP TRIGGER IF EXISTS trg_change_log_accessory_inventory_ins;
+CREATE TRIGGER trg_change_log_accessory_inventory_ins AFTER INSERT ON accessory_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('accessory_inventory', NEW.id, 'I');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_accessory_inventory_upd;
+CREATE TRIGGER trg_change_log_accessory_inventory_upd AFTER UPDATE ON accessory_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op)
+  SELECT 'accessory_inventory', OLD.id, 'D' WHERE OLD.id IS NOT NEW.id;
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('accessory_inventory', NEW.id, 'U');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_accessory_inventory_del;
+CREATE TRIGGER trg_change_log_accessory_inventory_del AFTER DELETE ON accessory_inventory
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('accessory_inventory', OLD.id, 'D');
+END;
+
+-- stock_tracking
+DROP TRIGGER IF EXISTS trg_change_log_stock_tracking_ins;
+CREATE TRIGGER trg_change_log_stock_tracking_ins AFTER INSERT ON stock_tracking
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('stock_tracking', NEW.id, 'I');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_stock_tracking_upd;
+CREATE TRIGGER trg_change_log_stock_tracking_upd AFTER UPDATE ON stock_tracking
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op)
+  SELECT 'stock_tracking', OLD.id, 'D' WHERE OLD.id IS NOT NEW.id;
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('stock_tracking', NEW.id, 'U');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_stock_tracking_del;
+CREATE TRIGGER trg_change_log_stock_tracking_del AFTER DELETE ON stock_tracking
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('stock_tracking', OLD.id, 'D');
+END;
+
+-- license
+DROP TRIGGER IF EXISTS trg_change_log_license_ins;
+CREATE TRIGGER trg_change_log_license_ins AFTER INSERT ON license
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('license', NEW.id, 'I');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_license_upd;
+CREATE TRIGGER trg_change_log_license_upd AFTER UPDATE ON license
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op)
+  SELECT 'license', OLD.id, 'D' WHERE OLD.id IS NOT NEW.id;
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('license', NEW.id, 'U');
+END;
+DROP TRIGGER IF EXISTS trg_change_log_license_del;
+CREATE TRIGGER trg_change_log_license_del AFTER DELETE ON license
+BEGIN
+  INSERT INTO change_log (table_name, row_id, op) VALUES ('license', OLD.id, 'D');
+END;
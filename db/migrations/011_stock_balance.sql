@@ -0,0 +1,78 @@
+-- Ürün/kategori/lokasyon bazında net stok bakiyesi.
+-- Ana sayfa ve stok durumu sayfası her görüntülemede tüm stock_tracking
+-- tablosunu topluyordu; bakiye artık her harekette trigger ile güncellenir.
+-- Onarım için: python -m services.stock_service rebuild
+CREATE TABLE IF NOT EXISTS stock_balance (
+  urun_adi TEXT NOT NULL,
+  kategori TEXT NOT NULL,
+  lokasyon TEXT NOT NULL,
+  net_adet INTEGER NOT NULL DEFAULT 0,
+  movements INTEGER NOT NULL DEFAULT 0,   -- bakiyeye katkı veren hareket sayısı
+  PRIMARY KEY (urun_adi, kategori, lokasyon)
+);
+
+-- Mevcut hareketlerden doldur
+DELETE FROM stock_balance;
+INSERT INTO stock_balance (urun_adi, kategori, lokasyon, net_adet, movements)
+SELECT COALESCE(urun_adi, ''), COALESCE(kategori, ''), COALESCE(lokasyon, ''),
+       SUM(CASE WHEN islem = 'giris' THEN COALESCE(adet, 0) ELSE -COALESCE(adet, 0) END),
+       COUNT(*)
+FROM stock_tracking
+GROUP BY 1, 2, 3;
+
+DROP TRIGGER IF EXISTS trg_stock_balance_ins;
+CREATE TRIGGER trg_stock_balance_ins AFTER INSERT ON stock_tracking
+BEGIN
+  INSERT INTO stock_balance (urun_adi, kategori, lokasyon, net_adet, movements)
+  VALUES (
+    COALESCE(NEW.urun_adi, ''), COALESCE(NEW.kategori, ''), COALESCE(NEW.lokasyon, ''),
+    CASE WHEN NEW.islem = 'giris' THEN COALESCE(NEW.adet, 0) ELSE -COALESCE(NEW.adet, 0) END,
+    1
+  )
+  ON CONFLICT (urun_adi, kategori, lokasyon) DO UPDATE SET
+    net_adet = net_adet + excluded.net_adet,
+    movements = movements + 1;
+END;
+
+-- Güncelleme: eski katkıyı geri al, yenisini ekle (transfer/atama adet düşürür)
+DROP TRIGGER IF EXISTS trg_stock_balance_upd;
+CREATE TRIGGER trg_stock_balance_upd
+AFTER UPDATE OF urun_adi, kategori, lokasyon, islem, adet ON stock_tracking
+BEGIN
+  UPDATE stock_balance SET
+    net_adet = net_adet - CASE WHEN OLD.islem = 'giris' THEN COALESCE(OLD.adet, 0) ELSE -COALESCE(OLD.adet, 0) END,
+    movements = movements - 1
+  WHERE urun_adi = COALESCE(OLD.urun_adi, '')
+    AND kategori = COALESCE(OLD.kategori, '')
+    AND lokasyon = COALESCE(OLD.lokasyon, '');
+  INSERT INTO stock_balance (urun_adi, kategori, lokasyon, net_adet, movements)
+  VALUES (
+    COALESCE(NEW.urun_adi, ''), COALESCE(NEW.kategori, ''), COALESCE(NEW.lokasyon, ''),
+    CASE WHEN NEW.islem = 'giris' THEN COALESCE(NEW.adet, 0) ELSE -COALESCE(NEW.adet, 0) END,
+    1
+  )
+  ON CONFLICT (urun_adi, kategori, lokasyon) DO UPDATE SET
+    net_adet = net_adet + excluded.net_adet,
+    movements = movements + 1;
+  DELETE FROM stock_balance
+  WHERE movements <= 0
+    AND urun_adi = COALESCE(OLD.urun_adi, '')
+    AND kategori = COALESCE(OLD.kategori, '')
+    AND lokasyon = COALESCE(OLD.lokasyon, '');
+END;
+
+DROP TRIGGER IF EXISTS trg_stock_balance_del;
+CREATE TRIGGER trg_stock_balance_del AFTER DELETE ON stock_tracking
+BEGIN
+  UPDATE stock_balance SET
+    net_adet = net_adet - CASE WHEN OLD.islem = 'giris' THEN COALESCE(OLD.adet, 0) ELSE -COALESCE(OLD.adet, 0) END,
+    movements = movements - 1
+  WHERE urun_adi = COALESCE(OLD.urun_adi, '')
+    AND kategori = COALESCE(OLD.kategori, '')
+    AND lokasyon = COALESCE(OLD.lokasyon, '');
+  DELETE FROM stock_balance
+  WHERE movements <= 0
+    AND urun_adi = COALESCE(OLD.urun_adi, '')
+    AND kategori = COALESCE(OLD.kategori, '')
+    AND lokasyon = COALESCE(OLD.lokasyon, '');
+END;
@@ -0,0 +1,43 @@
+-- Günlük stok bakiyesi anlık görüntüleri. Geçmiş bir tarihteki bakiye en
+-- yakın görüntüden başlayıp yalnızca aradaki hareketler uygulanarak bulunur.
+-- Görüntüler yalnızca hareket olan günler için, sıfır olmayan bakiyelerle
+-- tutulur; bir gün için görüntü yoksa önceki görüntü geçerlidir.
+CREATE TABLE IF NOT EXISTS stock_balance_snapshots (
+  snapshot_date TEXT NOT NULL,           -- bu günün sonundaki bakiye
+  urun_adi TEXT NOT NULL,
+  kategori TEXT NOT NULL,
+  lokasyon TEXT NOT NULL,
+  net_adet INTEGER NOT NULL,
+  PRIMARY KEY (snapshot_date, urun_adi, kategori, lokasyon)
+);
+
+-- Hareket tarihi: tarih, yoksa guncelleme_tarihi
+CREATE INDEX IF NOT EXISTS idx_stock_tracking_move_date
+  ON stock_tracking (COALESCE(tarih, guncelleme_tarihi, ''));
+
+-- Geriye tarihli değişiklikler, o tarihten sonraki görüntüleri geçersiz kılar;
+-- silinen görüntüler bir sonraki çalıştırmada yeniden oluşturulur.
+DROP TRIGGER IF EXISTS trg_stock_snapshots_ins;
+CREATE TRIGGER trg_stock_snapshots_ins AFTER INSERT ON stock_tracking
+BEGIN
+  DELETE FROM stock_balance_snapshots
+  WHERE snapshot_date >= COALESCE(NEW.tarih, NEW.guncelleme_tarihi, '');
+END;
+
+DROP TRIGGER IF EXISTS trg_stock_snapshots_upd;
+CREATE TRIGGER trg_stock_snapshots_upd
+AFTER UPDATE OF urun_adi, kategori, lokasyon, islem, adet, tarih, guncelleme_tarihi ON stock_tracking
+BEGIN
+  DELETE FROM stock_balance_snapshots
+  WHERE snapshot_date >= MIN(
+    COALESCE(OLD.tarih, OLD.guncelleme_tarihi, ''),
+    COALESCE(NEW.tarih, NEW.guncelleme_tarihi, '')
+  );
+END;
+
+DROP TRIGGER IF EXISTS trg_stock_snapshots_del;
+CREATE TRIGGER trg_stock_snapshots_del AFTER DELETE ON stock_tracking
+BEGIN
+  DELETE FROM stock_balance_snapshots
+  WHERE snapshot_date >= COALESCE(OLD.tarih, OLD.guncelleme_tarihi, '');
+END;
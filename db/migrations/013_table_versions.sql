@@ -0,0 +1,201 @@
+-- Tablo bazında sürüm sayaçları. Her yazma işlemi ilgili satırı artırır;
+-- birden fazla uvicorn worker'ı kendi bellek içi önbelleklerini tek bir
+-- okuma ile (PRAGMA data_version + bu tablo) doğrulayabilir.
+CREATE TABLE IF NOT EXISTS table_versions (
+  table_name TEXT PRIMARY KEY,
+  version INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT OR IGNORE INTO table_versions (table_name) VALUES
+  ('hardware_inventory'),
+  ('printer_inventory'),
+  ('license_inventory'),
+  ('accessory_inventory'),
+  ('stock_tracking'),
+  ('license'),
+  ('lookup_items'),
+  ('users'),
+  ('inventory_logs'),
+  ('activity_log');
+
+DROP TRIGGER IF EXISTS trg_table_versions_hardware_inventory_ins;
+CREATE TRIGGER trg_table_versions_hardware_inventory_ins AFTER INSERT ON hardware_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'hardware_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_hardware_inventory_upd;
+CREATE TRIGGER trg_table_versions_hardware_inventory_upd AFTER UPDATE ON hardware_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'hardware_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_hardware_inventory_del;
+CREATE TRIGGER trg_table_versions_hardware_inventory_del AFTER DELETE ON hardware_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'hardware_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_printer_inventory_ins;
+CREATE TRIGGER trg_table_versions_printer_inventory_ins AFTER INSERT ON printer_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'printer_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_printer_inventory_upd;
+CREATE TRIGGER trg_table_versions_printer_inventory_upd AFTER UPDATE ON printer_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'printer_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_printer_inventory_del;
+CREATE TRIGGER trg_table_versions_printer_inventory_del AFTER DELETE ON printer_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'printer_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_license_inventory_ins;
+CREATE TRIGGER trg_table_versions_license_inventory_ins AFTER INSERT ON license_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'license_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_license_inventory_upd;
+CREATE TRIGGER trg_table_versions_license_inventory_upd AFTER UPDATE ON license_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'license_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_license_inventory_del;
+CREATE TRIGGER trg_table_versions_license_inventory_del AFTER DELETE ON license_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'license_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_accessory_inventory_ins;
+CREATE TRIGGER trg_table_versions_accessory_inventory_ins AFTER INSERT ON accessory_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'accessory_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_accessory_inventory_upd;
+CREATE TRIGGER trg_table_versions_accessory_inventory_upd AFTER UPDATE ON accessory_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'accessory_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_accessory_inventory_del;
+CREATE TRIGGER trg_table_versions_accessory_inventory_del AFTER DELETE ON accessory_inventory
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'accessory_inventory';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_stock_tracking_ins;
+CREATE TRIGGER trg_table_versions_stock_tracking_ins AFTER INSERT ON stock_tracking
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'stock_tracking';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_stock_tracking_upd;
+CREATE TRIGGER trg_table_versions_stock_tracking_upd AFTER UPDATE ON stock_tracking
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'stock_tracking';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_stock_tracking_del;
+CREATE TRIGGER trg_table_versions_stock_tracking_del AFTER DELETE ON stock_tracking
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'stock_tracking';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_license_ins;
+CREATE TRIGGER trg_table_versions_license_ins AFTER INSERT ON license
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'license';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_license_upd;
+CREATE TRIGGER trg_table_versions_license_upd AFTER UPDATE ON license
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'license';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_license_del;
+CREATE TRIGGER trg_table_versions_license_del AFTER DELETE ON license
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'license';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_lookup_items_ins;
+CREATE TRIGGER trg_table_versions_lookup_items_ins AFTER INSERT ON lookup_items
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'lookup_items';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_lookup_items_upd;
+CREATE TRIGGER trg_table_versions_lookup_items_upd AFTER UPDATE ON lookup_items
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'lookup_items';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_lookup_items_del;
+CREATE TRIGGER trg_table_versions_lookup_items_del AFTER DELETE ON lookup_items
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'lookup_items';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_users_ins;
+CREATE TRIGGER trg_table_versions_users_ins AFTER INSERT ON users
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'users';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_users_upd;
+CREATE TRIGGER trg_table_versions_users_upd AFTER UPDATE ON users
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'users';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_users_del;
+CREATE TRIGGER trg_table_versions_users_del AFTER DELETE ON users
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'users';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_inventory_logs_ins;
+CREATE TRIGGER trg_table_versions_inventory_logs_ins AFTER INSERT ON inventory_logs
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'inventory_logs';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_inventory_logs_upd;
+CREATE TRIGGER trg_table_versions_inventory_logs_upd AFTER UPDATE ON inventory_logs
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'inventory_logs';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_inventory_logs_del;
+CREATE TRIGGER trg_table_versions_inventory_logs_del AFTER DELETE ON inventory_logs
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'inventory_logs';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_activity_log_ins;
+CREATE TRIGGER trg_table_versions_activity_log_ins AFTER INSERT ON activity_log
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'activity_log';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_activity_log_upd;
+CREATE TRIGGER trg_table_versions_activity_log_upd AFTER UPDATE ON activity_log
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'activity_log';
+END;
+DROP TRIGGER IF EXISTS trg_table_versions_activity_log_del;
+CREATE TRIGGER trg_table_versions_activity_log_del AFTER DELETE ON activity_log
+BEGIN
+  UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+  WHERE table_name = 'activity_log';
+END;
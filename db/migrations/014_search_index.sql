@@ -0,0 +1,240 @@
+-- Tüm envanter tabloları, lisans kayıtları ve talepler için tek bir tam metin
+-- arama dizini (GET /search, services/global_search.py).
+-- rowid = kayıt id * 8 + tür kodu; tetikleyiciler satırı doğrudan rowid ile
+-- günceller:
+--   1 hardware_inventory, 2 printer_inventory, 3 license_inventory,
+--   4 accessory_inventory, 5 stock_tracking, 6 license, 7 request_tracking
+-- unicode61 büyük/küçük harfi ve aksanları katlar ama noktasız ı harfini
+-- katlamaz; ı içeren kayıtların ı -> i çevrilmiş metni gizli "folded"
+-- sütununa da yazılır, böylece "cagri" araması "Çağrı" kaydını bulur.
+-- Lisans anahtarları dizine alınmaz.
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+  title,
+  body,
+  folded,
+  tokenize = 'unicode61 remove_diacritics 2'
+);
+
+-- hardware_inventory
+DELETE FROM search_index WHERE rowid % 8 = 1;
+INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT id * 8 + 1 AS doc, COALESCE(no, '') AS title, trim(COALESCE(bilgisayar_adi || ' ', '') || COALESCE(sorumlu_personel || ' ', '') || COALESCE(departman || ' ', '') || COALESCE(fabrika || ' ', '') || COALESCE(blok || ' ', '') || COALESCE(donanim_tipi || ' ', '') || COALESCE(marka || ' ', '') || COALESCE(model || ' ', '') || COALESCE(seri_no || ' ', '') || COALESCE(bagli_makina_no || ' ', '') || COALESCE(ifs_no || ' ', '')) AS body FROM hardware_inventory);
+DROP TRIGGER IF EXISTS trg_search_index_hardware_inventory_ins;
+CREATE TRIGGER trg_search_index_hardware_inventory_ins AFTER INSERT ON hardware_inventory
+BEGIN
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 1 AS doc, COALESCE(NEW.no, '') AS title, trim(COALESCE(NEW.bilgisayar_adi || ' ', '') || COALESCE(NEW.sorumlu_personel || ' ', '') || COALESCE(NEW.departman || ' ', '') || COALESCE(NEW.fabrika || ' ', '') || COALESCE(NEW.blok || ' ', '') || COALESCE(NEW.donanim_tipi || ' ', '') || COALESCE(NEW.marka || ' ', '') || COALESCE(NEW.model || ' ', '') || COALESCE(NEW.seri_no || ' ', '') || COALESCE(NEW.bagli_makina_no || ' ', '') || COALESCE(NEW.ifs_no || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_hardware_inventory_upd;
+CREATE TRIGGER trg_search_index_hardware_inventory_upd AFTER UPDATE ON hardware_inventory
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 1;
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 1 AS doc, COALESCE(NEW.no, '') AS title, trim(COALESCE(NEW.bilgisayar_adi || ' ', '') || COALESCE(NEW.sorumlu_personel || ' ', '') || COALESCE(NEW.departman || ' ', '') || COALESCE(NEW.fabrika || ' ', '') || COALESCE(NEW.blok || ' ', '') || COALESCE(NEW.donanim_tipi || ' ', '') || COALESCE(NEW.marka || ' ', '') || COALESCE(NEW.model || ' ', '') || COALESCE(NEW.seri_no || ' ', '') || COALESCE(NEW.bagli_makina_no || ' ', '') || COALESCE(NEW.ifs_no || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_hardware_inventory_del;
+CREATE TRIGGER trg_search_index_hardware_inventory_del AFTER DELETE ON hardware_inventory
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 1;
+END;
+
+-- printer_inventory
+DELETE FROM search_index WHERE rowid % 8 = 2;
+INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT id * 8 + 2 AS doc, COALESCE(envanter_no, '') AS title, trim(COALESCE(hostname || ' ', '') || COALESCE(yazici_markasi || ' ', '') || COALESCE(yazici_modeli || ' ', '') || COALESCE(kullanim_alani || ' ', '') || COALESCE(ip_adresi || ' ', '') || COALESCE(mac || ' ', '') || COALESCE(notlar || ' ', '')) AS body FROM printer_inventory);
+DROP TRIGGER IF EXISTS trg_search_index_printer_inventory_ins;
+CREATE TRIGGER trg_search_index_printer_inventory_ins AFTER INSERT ON printer_inventory
+BEGIN
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 2 AS doc, COALESCE(NEW.envanter_no, '') AS title, trim(COALESCE(NEW.hostname || ' ', '') || COALESCE(NEW.yazici_markasi || ' ', '') || COALESCE(NEW.yazici_modeli || ' ', '') || COALESCE(NEW.kullanim_alani || ' ', '') || COALESCE(NEW.ip_adresi || ' ', '') || COALESCE(NEW.mac || ' ', '') || COALESCE(NEW.notlar || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_printer_inventory_upd;
+CREATE TRIGGER trg_search_index_printer_inventory_upd AFTER UPDATE ON printer_inventory
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 2;
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 2 AS doc, COALESCE(NEW.envanter_no, '') AS title, trim(COALESCE(NEW.hostname || ' ', '') || COALESCE(NEW.yazici_markasi || ' ', '') || COALESCE(NEW.yazici_modeli || ' ', '') || COALESCE(NEW.kullanim_alani || ' ', '') || COALESCE(NEW.ip_adresi || ' ', '') || COALESCE(NEW.mac || ' ', '') || COALESCE(NEW.notlar || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_printer_inventory_del;
+CREATE TRIGGER trg_search_index_printer_inventory_del AFTER DELETE ON printer_inventory
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 2;
+END;
+
+-- license_inventory
+DELETE FROM search_index WHERE rowid % 8 = 3;
+INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT id * 8 + 3 AS doc, COALESCE(envanter_no, '') AS title, trim(COALESCE(yazilim_adi || ' ', '') || COALESCE(kullanici || ' ', '') || COALESCE(departman || ' ', '') || COALESCE(mail_adresi || ' ', '') || COALESCE(ifs_no || ' ', '') || COALESCE(notlar || ' ', '')) AS body FROM license_inventory);
+DROP TRIGGER IF EXISTS trg_search_index_license_inventory_ins;
+CREATE TRIGGER trg_search_index_license_inventory_ins AFTER INSERT ON license_inventory
+BEGIN
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 3 AS doc, COALESCE(NEW.envanter_no, '') AS title, trim(COALESCE(NEW.yazilim_adi || ' ', '') || COALESCE(NEW.kullanici || ' ', '') || COALESCE(NEW.departman || ' ', '') || COALESCE(NEW.mail_adresi || ' ', '') || COALESCE(NEW.ifs_no || ' ', '') || COALESCE(NEW.notlar || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_license_inventory_upd;
+CREATE TRIGGER trg_search_index_license_inventory_upd AFTER UPDATE ON license_inventory
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 3;
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 3 AS doc, COALESCE(NEW.envanter_no, '') AS title, trim(COALESCE(NEW.yazilim_adi || ' ', '') || COALESCE(NEW.kullanici || ' ', '') || COALESCE(NEW.departman || ' ', '') || COALESCE(NEW.mail_adresi || ' ', '') || COALESCE(NEW.ifs_no || ' ', '') || COALESCE(NEW.notlar || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_license_inventory_del;
+CREATE TRIGGER trg_search_index_license_inventory_del AFTER DELETE ON license_inventory
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 3;
+END;
+
+-- accessory_inventory
+DELETE FROM search_index WHERE rowid % 8 = 4;
+INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT id * 8 + 4 AS doc, COALESCE(urun_adi, '') AS title, trim(COALESCE(kullanici || ' ', '') || COALESCE(departman || ' ', '') || COALESCE(ifs_no || ' ', '') || COALESCE(aciklama || ' ', '')) AS body FROM accessory_inventory);
+DROP TRIGGER IF EXISTS trg_search_index_accessory_inventory_ins;
+CREATE TRIGGER trg_search_index_accessory_inventory_ins AFTER INSERT ON accessory_inventory
+BEGIN
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 4 AS doc, COALESCE(NEW.urun_adi, '') AS title, trim(COALESCE(NEW.kullanici || ' ', '') || COALESCE(NEW.departman || ' ', '') || COALESCE(NEW.ifs_no || ' ', '') || COALESCE(NEW.aciklama || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_accessory_inventory_upd;
+CREATE TRIGGER trg_search_index_accessory_inventory_upd AFTER UPDATE ON accessory_inventory
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 4;
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 4 AS doc, COALESCE(NEW.urun_adi, '') AS title, trim(COALESCE(NEW.kullanici || ' ', '') || COALESCE(NEW.departman || ' ', '') || COALESCE(NEW.ifs_no || ' ', '') || COALESCE(NEW.aciklama || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_accessory_inventory_del;
+CREATE TRIGGER trg_search_index_accessory_inventory_del AFTER DELETE ON accessory_inventory
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 4;
+END;
+
+-- stock_tracking
+DELETE FROM search_index WHERE rowid % 8 = 5;
+INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT id * 8 + 5 AS doc, COALESCE(urun_adi, '') AS title, trim(COALESCE(kategori || ' ', '') || COALESCE(marka || ' ', '') || COALESCE(lokasyon || ' ', '') || COALESCE(ifs_no || ' ', '') || COALESCE(aciklama || ' ', '')) AS body FROM stock_tracking);
+DROP TRIGGER IF EXISTS trg_search_index_stock_tracking_ins;
+CREATE TRIGGER trg_search_index_stock_tracking_ins AFTER INSERT ON stock_tracking
+BEGIN
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 5 AS doc, COALESCE(NEW.urun_adi, '') AS title, trim(COALESCE(NEW.kategori || ' ', '') || COALESCE(NEW.marka || ' ', '') || COALESCE(NEW.lokasyon || ' ', '') || COALESCE(NEW.ifs_no || ' ', '') || COALESCE(NEW.aciklama || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_stock_tracking_upd;
+CREATE TRIGGER trg_search_index_stock_tracking_upd AFTER UPDATE ON stock_tracking
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 5;
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 5 AS doc, COALESCE(NEW.urun_adi, '') AS title, trim(COALESCE(NEW.kategori || ' ', '') || COALESCE(NEW.marka || ' ', '') || COALESCE(NEW.lokasyon || ' ', '') || COALESCE(NEW.ifs_no || ' ', '') || COALESCE(NEW.aciklama || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_stock_tracking_del;
+CREATE TRIGGER trg_search_index_stock_tracking_del AFTER DELETE ON stock_tracking
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 5;
+END;
+
+-- license
+DELETE FROM search_index WHERE rowid % 8 = 6;
+INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT id * 8 + 6 AS doc, COALESCE(adi, '') AS title, trim(COALESCE(sorumlu_personel || ' ', '') || COALESCE(mail_adresi || ' ', '') || COALESCE(ifs_no || ' ', '')) AS body FROM license);
+DROP TRIGGER IF EXISTS trg_search_index_license_ins;
+CREATE TRIGGER trg_search_index_license_ins AFTER INSERT ON license
+BEGIN
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 6 AS doc, COALESCE(NEW.adi, '') AS title, trim(COALESCE(NEW.sorumlu_personel || ' ', '') || COALESCE(NEW.mail_adresi || ' ', '') || COALESCE(NEW.ifs_no || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_license_upd;
+CREATE TRIGGER trg_search_index_license_upd AFTER UPDATE ON license
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 6;
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 6 AS doc, COALESCE(NEW.adi, '') AS title, trim(COALESCE(NEW.sorumlu_personel || ' ', '') || COALESCE(NEW.mail_adresi || ' ', '') || COALESCE(NEW.ifs_no || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_license_del;
+CREATE TRIGGER trg_search_index_license_del AFTER DELETE ON license
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 6;
+END;
+
+-- request_tracking
+DELETE FROM search_index WHERE rowid % 8 = 7;
+INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT id * 8 + 7 AS doc, COALESCE(COALESCE(urun_adi, yazilim_adi, donanim_tipi), '') AS title, trim(COALESCE(kategori || ' ', '') || COALESCE(marka || ' ', '') || COALESCE(model || ' ', '') || COALESCE(ifs_no || ' ', '') || COALESCE(aciklama || ' ', '') || COALESCE(talep_acan || ' ', '')) AS body FROM request_tracking);
+DROP TRIGGER IF EXISTS trg_search_index_request_tracking_ins;
+CREATE TRIGGER trg_search_index_request_tracking_ins AFTER INSERT ON request_tracking
+BEGIN
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 7 AS doc, COALESCE(COALESCE(NEW.urun_adi, NEW.yazilim_adi, NEW.donanim_tipi), '') AS title, trim(COALESCE(NEW.kategori || ' ', '') || COALESCE(NEW.marka || ' ', '') || COALESCE(NEW.model || ' ', '') || COALESCE(NEW.ifs_no || ' ', '') || COALESCE(NEW.aciklama || ' ', '') || COALESCE(NEW.talep_acan || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_request_tracking_upd;
+CREATE TRIGGER trg_search_index_request_tracking_upd AFTER UPDATE ON request_tracking
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 7;
+  INSERT INTO search_index (rowid, title, body, folded)
+  SELECT doc, title, body,
+         CASE WHEN instr(title || ' ' || body, 'ı') > 0
+              THEN replace(title || ' ' || body, 'ı', 'i') END
+  FROM (SELECT NEW.id * 8 + 7 AS doc, COALESCE(COALESCE(NEW.urun_adi, NEW.yazilim_adi, NEW.donanim_tipi), '') AS title, trim(COALESCE(NEW.kategori || ' ', '') || COALESCE(NEW.marka || ' ', '') || COALESCE(NEW.model || ' ', '') || COALESCE(NEW.ifs_no || ' ', '') || COALESCE(NEW.aciklama || ' ', '') || COALESCE(NEW.talep_acan || ' ', '')) AS body);
+END;
+DROP TRIGGER IF EXISTS trg_search_index_request_tracking_del;
+CREATE TRIGGER trg_search_index_request_tracking_del AFTER DELETE ON request_tracking
+BEGIN
+  DELETE FROM search_index WHERE rowid = OLD.id * 8 + 7;
+END;
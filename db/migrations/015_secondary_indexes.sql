@@ -0,0 +1,60 @@
+-- Envanter tablolarında birincil anahtar dışında indeks yoktu. Envanter
+-- numarasıyla anlık arama (/inventory/fetch/{no}, her tuş vuruşunda) ve
+-- liste sayfalarındaki filter_field eşitlik filtreleri her seferinde tüm
+-- tabloyu tarıyordu. SQLite indeks girdilerini (sütun, rowid) sırasıyla
+-- tuttuğundan tek sütunlu indeksler varsayılan "ORDER BY id" sıralamasını
+-- da geçici sıralama olmadan karşılar.
+-- Bu liste models.RECOMMENDED_INDEXES ile aynı tutulmalıdır; eksik indeksler
+-- açılışta uyarı olarak loglanır.
+
+-- Donanım envanteri
+CREATE INDEX IF NOT EXISTS idx_hardware_inventory_no
+  ON hardware_inventory (no);
+CREATE INDEX IF NOT EXISTS idx_hardware_inventory_departman
+  ON hardware_inventory (departman);
+CREATE INDEX IF NOT EXISTS idx_hardware_inventory_sorumlu_personel
+  ON hardware_inventory (sorumlu_personel);
+CREATE INDEX IF NOT EXISTS idx_hardware_inventory_donanim_tipi
+  ON hardware_inventory (donanim_tipi);
+CREATE INDEX IF NOT EXISTS idx_hardware_inventory_seri_no
+  ON hardware_inventory (seri_no);
+CREATE INDEX IF NOT EXISTS idx_hardware_inventory_ifs_no
+  ON hardware_inventory (ifs_no);
+
+-- Yazıcı envanteri
+CREATE INDEX IF NOT EXISTS idx_printer_inventory_envanter_no
+  ON printer_inventory (envanter_no);
+
+-- Lisans envanteri
+CREATE INDEX IF NOT EXISTS idx_license_inventory_envanter_no
+  ON license_inventory (envanter_no);
+CREATE INDEX IF NOT EXISTS idx_license_inventory_departman
+  ON license_inventory (departman);
+CREATE INDEX IF NOT EXISTS idx_license_inventory_kullanici
+  ON license_inventory (kullanici);
+CREATE INDEX IF NOT EXISTS idx_license_inventory_yazilim_adi
+  ON license_inventory (yazilim_adi);
+CREATE INDEX IF NOT EXISTS idx_license_inventory_ifs_no
+  ON license_inventory (ifs_no);
+
+-- Aksesuar envanteri
+CREATE INDEX IF NOT EXISTS idx_accessory_inventory_urun_adi
+  ON accessory_inventory (urun_adi);
+CREATE INDEX IF NOT EXISTS idx_accessory_inventory_departman
+  ON accessory_inventory (departman);
+CREATE INDEX IF NOT EXISTS idx_accessory_inventory_kullanici
+  ON accessory_inventory (kullanici);
+CREATE INDEX IF NOT EXISTS idx_accessory_inventory_ifs_no
+  ON accessory_inventory (ifs_no);
+
+-- Stok takibi: /stock her zaman kategoriye göre filtreler
+CREATE INDEX IF NOT EXISTS idx_stock_tracking_kategori
+  ON stock_tracking (kategori);
+CREATE INDEX IF NOT EXISTS idx_stock_tracking_urun_adi
+  ON stock_tracking (urun_adi);
+CREATE INDEX IF NOT EXISTS idx_stock_tracking_ifs_no
+  ON stock_tracking (ifs_no);
+
+-- Her liste sayfası seçim listelerini türe göre okur
+CREATE INDEX IF NOT EXISTS idx_lookup_items_type_name
+  ON lookup_items (type, name);
@@ -0,0 +1,40 @@
+-- 012'deki tetikleyiciler bir hareketin etkilediği tarihten sonraki tüm
+-- anlık görüntüleri siliyordu; tarihsiz hareketlerde (tarih ve
+-- guncelleme_tarihi boş) bu tarih '' olduğundan her görüntü siliniyordu.
+-- Görüntüler artık yalnızca tarihli hareketleri içerir (tarihsizler sorgu
+-- anında eklenir), bu yüzden tarihsiz hareketler hiçbir görüntüyü silmez.
+-- Silinen görüntüler bir sonraki bakiye sorgusunda kalan en son görüntüden
+-- başlayarak yeniden oluşturulur (services/stock_service.py).
+DELETE FROM stock_balance_snapshots;
+
+DROP TRIGGER IF EXISTS trg_stock_snapshots_ins;
+CREATE TRIGGER trg_stock_snapshots_ins AFTER INSERT ON stock_tracking
+WHEN COALESCE(NEW.tarih, NEW.guncelleme_tarihi, '') <> ''
+BEGIN
+  DELETE FROM stock_balance_snapshots
+  WHERE snapshot_date >= COALESCE(NEW.tarih, NEW.guncelleme_tarihi);
+END;
+
+-- Güncellemede eski ve yeni tarihlerden boş olmayan en erken olanı
+-- etkilenir; ikisi de boşsa hiçbir görüntü değişmez.
+DROP TRIGGER IF EXISTS trg_stock_snapshots_upd;
+CREATE TRIGGER trg_stock_snapshots_upd
+AFTER UPDATE OF urun_adi, kategori, lokasyon, islem, adet, tarih, guncelleme_tarihi ON stock_tracking
+BEGIN
+  DELETE FROM stock_balance_snapshots
+  WHERE snapshot_date >= (
+    SELECT MIN(d) FROM (
+      SELECT NULLIF(COALESCE(OLD.tarih, OLD.guncelleme_tarihi, ''), '') AS d
+      UNION ALL
+      SELECT NULLIF(COALESCE(NEW.tarih, NEW.guncelleme_tarihi, ''), '')
+    )
+  );
+END;
+
+DROP TRIGGER IF EXISTS trg_stock_snapshots_del;
+CREATE TRIGGER trg_stock_snapshots_del AFTER DELETE ON stock_tracking
+WHEN COALESCE(OLD.tarih, OLD.guncelleme_tarihi, '') <> ''
+BEGIN
+  DELETE FROM stock_balance_snapshots
+  WHERE snapshot_date >= COALESCE(OLD.tarih, OLD.guncelleme_tarihi);
+END;
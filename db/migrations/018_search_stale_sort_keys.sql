@@ -0,0 +1,92 @@
+-- 017'deki tetikleyiciler ham SQL güncellemelerinde yalnızca normalize
+-- arama sütunlarını boşaltıyor, Türkçe sıralama anahtarlarını (<alan>_sort)
+-- eski değerlerinde bırakıyordu. Tetikleyiciler bu anahtarları da
+-- boşaltacak şekilde yeniden oluşturulur; init_db bunları yeniden doldurur
+-- (models._backfill_shadow_columns).
+
+DROP TRIGGER IF EXISTS trg_hardware_inventory_search_stale;
+CREATE TRIGGER trg_hardware_inventory_search_stale
+AFTER UPDATE OF no, fabrika, blok, departman, donanim_tipi, bilgisayar_adi, marka, model, seri_no, sorumlu_personel, kullanim_alani, bagli_makina_no, ifs_no, islem_yapan
+ON hardware_inventory
+WHEN NEW.search_norm IS OLD.search_norm
+BEGIN
+  UPDATE hardware_inventory
+  SET search_norm = NULL,
+      no_norm = NULL,
+      bilgisayar_adi_norm = NULL,
+      seri_no_norm = NULL,
+      sorumlu_personel_norm = NULL,
+      departman_norm = NULL,
+      ifs_no_norm = NULL,
+      no_sort = NULL,
+      departman_sort = NULL,
+      sorumlu_personel_sort = NULL
+  WHERE id = NEW.id;
+END;
+
+DROP TRIGGER IF EXISTS trg_printer_inventory_search_stale;
+CREATE TRIGGER trg_printer_inventory_search_stale
+AFTER UPDATE OF envanter_no, yazici_markasi, yazici_modeli, kullanim_alani, ip_adresi, mac, hostname, islem_yapan, notlar
+ON printer_inventory
+WHEN NEW.search_norm IS OLD.search_norm
+BEGIN
+  UPDATE printer_inventory
+  SET search_norm = NULL,
+      envanter_no_norm = NULL,
+      hostname_norm = NULL,
+      ip_adresi_norm = NULL,
+      yazici_markasi_norm = NULL,
+      envanter_no_sort = NULL
+  WHERE id = NEW.id;
+END;
+
+DROP TRIGGER IF EXISTS trg_license_inventory_search_stale;
+CREATE TRIGGER trg_license_inventory_search_stale
+AFTER UPDATE OF departman, kullanici, yazilim_adi, lisans_anahtari, mail_adresi, envanter_no, ifs_no, islem_yapan, notlar
+ON license_inventory
+WHEN NEW.search_norm IS OLD.search_norm
+BEGIN
+  UPDATE license_inventory
+  SET search_norm = NULL,
+      envanter_no_norm = NULL,
+      yazilim_adi_norm = NULL,
+      kullanici_norm = NULL,
+      departman_norm = NULL,
+      ifs_no_norm = NULL,
+      envanter_no_sort = NULL,
+      departman_sort = NULL,
+      kullanici_sort = NULL
+  WHERE id = NEW.id;
+END;
+
+DROP TRIGGER IF EXISTS trg_accessory_inventory_search_stale;
+CREATE TRIGGER trg_accessory_inventory_search_stale
+AFTER UPDATE OF urun_adi, ifs_no, departman, kullanici, aciklama, islem_yapan
+ON accessory_inventory
+WHEN NEW.search_norm IS OLD.search_norm
+BEGIN
+  UPDATE accessory_inventory
+  SET search_norm = NULL,
+      urun_adi_norm = NULL,
+      kullanici_norm = NULL,
+      departman_norm = NULL,
+      ifs_no_norm = NULL,
+      departman_sort = NULL,
+      kullanici_sort = NULL
+  WHERE id = NEW.id;
+END;
+
+DROP TRIGGER IF EXISTS trg_stock_tracking_search_stale;
+CREATE TRIGGER trg_stock_tracking_search_stale
+AFTER UPDATE OF urun_adi, kategori, marka, lokasyon, islem, ifs_no, aciklama, islem_yapan
+ON stock_tracking
+WHEN NEW.search_norm IS OLD.search_norm
+BEGIN
+  UPDATE stock_tracking
+  SET search_norm = NULL,
+      urun_adi_norm = NULL,
+      marka_norm = NULL,
+      ifs_no_norm = NULL,
+      urun_adi_sort = NULL
+  WHERE id = NEW.id;
+END;
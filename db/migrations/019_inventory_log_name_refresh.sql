@@ -0,0 +1,30 @@
+-- 005 log satırlarındaki kullanıcı ve konum adlarını yalnızca eklemede
+-- dolduruyordu; adlar yalnızca yönetici ekranından yapılan kullanıcı
+-- düzenlemelerinde yenileniyordu. Başka bir yoldan (ORM dışı yazımlar
+-- dahil) yapılan değişiklikler eski adları bırakıyordu. Aşağıdaki
+-- tetikleyiciler ad değiştiğinde ilgili log satırlarını günceller
+-- (kullanıcılar index üzerinden; konum adı değişiklikleri seyrektir).
+DROP TRIGGER IF EXISTS trg_users_log_names;
+CREATE TRIGGER trg_users_log_names
+AFTER UPDATE OF username, first_name, last_name ON users
+BEGIN
+  UPDATE inventory_logs
+  SET old_user_name = COALESCE(TRIM(NEW.first_name || ' ' || NEW.last_name), NEW.username)
+  WHERE old_user_id = NEW.id;
+  UPDATE inventory_logs
+  SET new_user_name = COALESCE(TRIM(NEW.first_name || ' ' || NEW.last_name), NEW.username)
+  WHERE new_user_id = NEW.id;
+  UPDATE inventory_logs
+  SET changed_by_name = COALESCE(TRIM(NEW.first_name || ' ' || NEW.last_name), NEW.username)
+  WHERE changed_by = NEW.id;
+END;
+
+DROP TRIGGER IF EXISTS trg_lookup_items_log_names;
+CREATE TRIGGER trg_lookup_items_log_names
+AFTER UPDATE OF name ON lookup_items
+BEGIN
+  UPDATE inventory_logs SET old_location_name = NEW.name
+  WHERE old_location = CAST(NEW.id AS TEXT);
+  UPDATE inventory_logs SET new_location_name = NEW.name
+  WHERE new_location = CAST(NEW.id AS TEXT);
+END;
@@ -1,6 +1,7 @@
 import os
 import secrets
 import logging
+import threading
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -13,6 +14,9 @@ from pydantic_settings import BaseSettings
 
 from models import init_db, init_admin, SessionLocal
 from routes import router as api_router
+from services.activity_log import activity_writer
+from services.fuzzy_index import build_fuzzy_index
+from services.stock_service import ensure_stock_snapshots
 from utils import cleanup_deleted
 from utils.auth import RememberMeMiddleware
 
@@ -27,7 +31,12 @@ if not secret_key:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database tables and default admin user on startup."""
+    """Initialize database tables and default admin user on startup.
+
+    Missing stock balance snapshots are written and the fuzzy search index
+    is built in the background. Buffered activity log entries are flushed on
+    shutdown.
+    """
     init_db()
     init_admin()
     db = SessionLocal()
@@ -35,7 +44,10 @@ async def lifespan(app: FastAPI):
         cleanup_deleted(db)
     finally:
         db.close()
+    threading.Thread(target=ensure_stock_snapshots, daemon=True).start()
+    threading.Thread(target=build_fuzzy_index, daemon=True).start()
     yield
+    activity_writer.flush()
 
 
 app = FastAPI(lifespan=lifespan)
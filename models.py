@@ -1,8 +1,10 @@
+import logging
 import os
 from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import (
+    event,
     Column,
     Date,
     DateTime,
@@ -17,6 +19,10 @@ from sqlalchemy import (
 from sqlalchemy.orm import declarative_base, sessionmaker, Session, relationship
 from passlib.context import CryptContext
 
+from services.search_text import normalize_tr, search_document, sort_key
+
+logger = logging.getLogger(__name__)
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_DB_FILE = os.path.join(BASE_DIR, "data", "envanter.db")
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DEFAULT_DB_FILE}")
@@ -44,8 +50,21 @@ class HardwareInventory(Base):
     kullanim_alani = Column(String)
     bagli_makina_no = Column(String)
     ifs_no = Column(String)
-    tarih = Column(Date)
+    tarih = Column(Date, index=True)
     islem_yapan = Column(String)
+    # Normalized copies of the commonly searched fields (ranking prefix
+    # matches first), of all text fields (searching) and Turkish sort keys
+    # for commonly sorted columns; see services.search_text.
+    no_norm = Column(Text(collation="NOCASE"), index=True)
+    bilgisayar_adi_norm = Column(Text(collation="NOCASE"), index=True)
+    seri_no_norm = Column(Text(collation="NOCASE"), index=True)
+    sorumlu_personel_norm = Column(Text(collation="NOCASE"), index=True)
+    departman_norm = Column(Text(collation="NOCASE"), index=True)
+    ifs_no_norm = Column(Text(collation="NOCASE"), index=True)
+    search_norm = Column(Text(collation="NOCASE"), index=True)
+    no_sort = Column(Text, index=True)
+    departman_sort = Column(Text, index=True)
+    sorumlu_personel_sort = Column(Text, index=True)
     licenses = relationship(
         "License", back_populates="inventory", passive_deletes=True
     )
@@ -128,9 +147,18 @@ class PrinterInventory(Base):
     ip_adresi = Column(String)
     mac = Column(String)
     hostname = Column(String)
-    tarih = Column(Date)
+    tarih = Column(Date, index=True)
     islem_yapan = Column(String)
     notlar = Column(Text)
+    # Normalized copies of the commonly searched fields (ranking prefix
+    # matches first), of all text fields (searching) and Turkish sort keys
+    # for commonly sorted columns; see services.search_text.
+    envanter_no_norm = Column(Text(collation="NOCASE"), index=True)
+    hostname_norm = Column(Text(collation="NOCASE"), index=True)
+    ip_adresi_norm = Column(Text(collation="NOCASE"), index=True)
+    yazici_markasi_norm = Column(Text(collation="NOCASE"), index=True)
+    search_norm = Column(Text(collation="NOCASE"), index=True)
+    envanter_no_sort = Column(Text, index=True)
 
 
 class LicenseInventory(Base):
@@ -143,9 +171,21 @@ class LicenseInventory(Base):
     mail_adresi = Column(String)
     envanter_no = Column(String)
     ifs_no = Column(String)
-    tarih = Column(Date)
+    tarih = Column(Date, index=True)
     islem_yapan = Column(String)
     notlar = Column(Text)
+    # Normalized copies of the commonly searched fields (ranking prefix
+    # matches first), of all text fields (searching) and Turkish sort keys
+    # for commonly sorted columns; see services.search_text.
+    envanter_no_norm = Column(Text(collation="NOCASE"), index=True)
+    yazilim_adi_norm = Column(Text(collation="NOCASE"), index=True)
+    kullanici_norm = Column(Text(collation="NOCASE"), index=True)
+    departman_norm = Column(Text(collation="NOCASE"), index=True)
+    ifs_no_norm = Column(Text(collation="NOCASE"), index=True)
+    search_norm = Column(Text(collation="NOCASE"), index=True)
+    envanter_no_sort = Column(Text, index=True)
+    departman_sort = Column(Text, index=True)
+    kullanici_sort = Column(Text, index=True)
 
 
 class License(Base):
@@ -190,10 +230,18 @@ class StockItem(Base):
     departman = Column("lokasyon", String)
     guncelleme_tarihi = Column(Date)
     islem = Column(String)
-    tarih = Column(Date)
+    tarih = Column(Date, index=True)
     ifs_no = Column(String)
     aciklama = Column(String)
     islem_yapan = Column(String)
+    # Normalized copies of the commonly searched fields (ranking prefix
+    # matches first), of all text fields (searching) and Turkish sort keys
+    # for commonly sorted columns; see services.search_text.
+    urun_adi_norm = Column(Text(collation="NOCASE"), index=True)
+    marka_norm = Column(Text(collation="NOCASE"), index=True)
+    ifs_no_norm = Column(Text(collation="NOCASE"), index=True)
+    search_norm = Column(Text(collation="NOCASE"), index=True)
+    urun_adi_sort = Column(Text, index=True)
 
 
 class DeletedAccessoryInventory(Base):
@@ -215,12 +263,22 @@ class AccessoryInventory(Base):
     id = Column(Integer, primary_key=True, index=True)
     urun_adi = Column(String)
     adet = Column(Integer)
-    tarih = Column(Date)
+    tarih = Column(Date, index=True)
     ifs_no = Column(String)
     departman = Column(String)
     kullanici = Column(String)
     aciklama = Column(String)
     islem_yapan = Column(String)
+    # Normalized copies of the commonly searched fields (ranking prefix
+    # matches first), of all text fields (searching) and Turkish sort keys
+    # for commonly sorted columns; see services.search_text.
+    urun_adi_norm = Column(Text(collation="NOCASE"), index=True)
+    kullanici_norm = Column(Text(collation="NOCASE"), index=True)
+    departman_norm = Column(Text(collation="NOCASE"), index=True)
+    ifs_no_norm = Column(Text(collation="NOCASE"), index=True)
+    search_norm = Column(Text(collation="NOCASE"), index=True)
+    departman_sort = Column(Text, index=True)
+    kullanici_sort = Column(Text, index=True)
 
 
 class RequestItem(Base):
@@ -274,6 +332,171 @@ class RememberToken(Base):
     created_at = Column(DateTime, default=func.now())
 
 
+def is_shadow_column(name: str) -> bool:
+    """Return whether ``name`` is a derived column hidden from users."""
+    return name.endswith("_norm") or name.endswith("_sort")
+
+
+# Models whose text fields are searched through their ``_norm`` shadow columns.
+SEARCHABLE_MODELS = (
+    HardwareInventory,
+    PrinterInventory,
+    LicenseInventory,
+    AccessoryInventory,
+    StockItem,
+)
+
+
+def data_columns(model):
+    """Return the columns of ``model`` holding record data (no shadow columns)."""
+    return [col for col in model.__table__.columns if not is_shadow_column(col.name)]
+
+
+def search_columns(model):
+    """Return the text columns of ``model`` covered by ``search_norm``."""
+    return [col for col in data_columns(model) if isinstance(col.type, String)]
+
+
+def prefix_search_columns(model):
+    """Return ``{column name: normalized column}`` for the prefix-searched fields."""
+    columns = model.__table__.columns
+    return {
+        col.name[: -len("_norm")]: col
+        for col in columns
+        if col.name.endswith("_norm") and col.name[: -len("_norm")] in columns
+    }
+
+
+def sort_key_columns(model):
+    """Return ``{column name: sort key column}`` for the sort keys of ``model``."""
+    columns = model.__table__.columns
+    return {
+        col.name[: -len("_sort")]: col
+        for col in columns
+        if col.name.endswith("_sort") and col.name[: -len("_sort")] in columns
+    }
+
+
+def _update_shadow_columns(mapper, connection, target) -> None:
+    def value(col):
+        return getattr(target, mapper.get_property_by_column(col).key)
+
+    columns = mapper.class_.__table__.columns
+    target.search_norm = search_document(value(col) for col in search_columns(mapper.class_))
+    for name, norm_col in prefix_search_columns(mapper.class_).items():
+        setattr(target, norm_col.name, normalize_tr(value(columns[name])))
+    for name, key_col in sort_key_columns(mapper.class_).items():
+        setattr(target, key_col.name, sort_key(value(columns[name])))
+
+
+for _model in SEARCHABLE_MODELS:
+    event.listen(_model, "before_insert", _update_shadow_columns)
+    event.listen(_model, "before_update", _update_shadow_columns)
+
+
+def _backfill_shadow_columns(con) -> None:
+    """Add and fill shadow columns on databases created before they existed.
+
+    Also refills rows whose shadow columns raw SQL writes left empty (see
+    ``db/migrations/018_search_stale_sort_keys.sql``).
+    """
+    for model in SEARCHABLE_MODELS:
+        table = model.__tablename__
+        cols = {row[1] for row in con.execute(f"PRAGMA table_info({table})")}
+        norms = {
+            name: norm_col.name
+            for name, norm_col in prefix_search_columns(model).items()
+            if name in cols
+        }
+        sort_keys = {
+            name: key_col.name
+            for name, key_col in sort_key_columns(model).items()
+            if name in cols
+        }
+        shadow = ["search_norm", *norms.values(), *sort_keys.values()]
+        for column in ["search_norm", *norms.values()]:
+            if column not in cols:
+                con.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT COLLATE NOCASE")
+        for key_name in sort_keys.values():
+            if key_name not in cols:
+                con.execute(f"ALTER TABLE {table} ADD COLUMN {key_name} TEXT")
+        indexed = list(shadow)
+        if "tarih" in cols:
+            indexed.append("tarih")
+        for column in indexed:
+            con.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})"
+            )
+
+        names = [col.name for col in search_columns(model) if col.name in cols]
+        if not names:
+            continue
+        missing = " OR ".join(f"{c} IS NULL" for c in shadow)
+        rows = con.execute(
+            f"SELECT id, {', '.join(names)} FROM {table} WHERE {missing}"
+        ).fetchall()
+        updates = []
+        for row in rows:
+            record = dict(zip(names, row[1:]))
+            updates.append(
+                (
+                    search_document(row[1:]),
+                    *(normalize_tr(record.get(name)) for name in norms),
+                    *(sort_key(record.get(name)) for name in sort_keys),
+                    row[0],
+                )
+            )
+        assignments = ", ".join(f"{c} = ?" for c in shadow)
+        con.executemany(f"UPDATE {table} SET {assignments} WHERE id = ?", updates)
+
+
+# Indexes serving the lookups and list filters, created by
+# db/migrations/015_secondary_indexes.sql: table -> leading column tuples.
+RECOMMENDED_INDEXES = {
+    "hardware_inventory": (
+        ("no",),
+        ("departman",),
+        ("sorumlu_personel",),
+        ("donanim_tipi",),
+        ("seri_no",),
+        ("ifs_no",),
+    ),
+    "printer_inventory": (("envanter_no",),),
+    "license_inventory": (
+        ("envanter_no",),
+        ("departman",),
+        ("kullanici",),
+        ("yazilim_adi",),
+        ("ifs_no",),
+    ),
+    "accessory_inventory": (
+        ("urun_adi",),
+        ("departman",),
+        ("kullanici",),
+        ("ifs_no",),
+    ),
+    "stock_tracking": (("kategori",), ("urun_adi",), ("ifs_no",)),
+    "lookup_items": (("type", "name"),),
+}
+
+
+def missing_indexes(con) -> list:
+    """Return ``(table, columns)`` for recommended indexes ``con`` lacks.
+
+    Any index whose leading columns are ``columns`` counts, whatever its name.
+    """
+    missing = []
+    for table, wanted in RECOMMENDED_INDEXES.items():
+        leading = []
+        for row in con.execute(f"PRAGMA index_list({table})"):
+            info = con.execute(f"PRAGMA index_info({row[1]})").fetchall()
+            leading.append(tuple(col[2] for col in sorted(info)))
+        for columns in wanted:
+            if not any(index[: len(columns)] == columns for index in leading):
+                missing.append((table, columns))
+    return missing
+
+
 def init_db():
     """Create database tables if they don't exist."""
     Base.metadata.create_all(bind=engine)
@@ -287,19 +510,6 @@ def init_db():
             con.execute(
                 "CREATE TABLE IF NOT EXISTS schema_migrations (filename TEXT PRIMARY KEY)"
             )
-            applied = {
-                row[0] for row in con.execute("SELECT filename FROM schema_migrations")
-            }
-            for path in sorted(glob.glob(os.path.join(migrations_dir, "*.sql"))):
-                filename = os.path.basename(path)
-                if filename in applied:
-                    continue
-                with open(path, "r") as fh:
-                    con.executescript(fh.read())
-                con.execute(
-                    "INSERT INTO schema_migrations (filename) VALUES (?)", (filename,)
-                )
-
             # Ensure older databases have the printer inventory number column
             for table in ("printer_inventory", "deleted_printer_inventory"):
                 cols = {row[1] for row in con.execute(f"PRAGMA table_info({table})")}
@@ -339,6 +549,34 @@ def init_db():
                         f"ALTER TABLE {table} ADD COLUMN tarih DATE"
                     )
 
+            # Migrations run after the column upgrades above so they may
+            # refer to any column of the current models (008 and 014 read
+            # ifs_no and envanter_no). The order is safe for 001-013: their
+            # only ALTERs add columns to inventory_logs, which the upgrades
+            # above never touch.
+            applied = {
+                row[0] for row in con.execute("SELECT filename FROM schema_migrations")
+            }
+            for path in sorted(glob.glob(os.path.join(migrations_dir, "*.sql"))):
+                filename = os.path.basename(path)
+                if filename in applied:
+                    continue
+                with open(path, "r", encoding="utf-8") as fh:
+                    con.executescript(fh.read())
+                con.execute(
+                    "INSERT INTO schema_migrations (filename) VALUES (?)", (filename,)
+                )
+
+            _backfill_shadow_columns(con)
+
+            for table, columns in missing_indexes(con):
+                logger.warning(
+                    "Recommended index on %s (%s) is missing; lookups and "
+                    "filters on it scan the whole table",
+                    table,
+                    ", ".join(columns),
+                )
+
 
 def init_admin():
     """Create default admin user using environment variables."""
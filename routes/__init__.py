@@ -14,6 +14,9 @@ from .inventory import router as inventory_router
 from .connections import router as connections_router
 from .trash import router as trash_router
 from .license import router as license_router
+from .events import router as events_router
+from .changes import router as changes_router
+from .search import router as search_router
 
 router = APIRouter()
 router.include_router(auth_router)
@@ -28,5 +31,8 @@ router.include_router(inventory_logs_router)
 router.include_router(reports_router)
 router.include_router(trash_router)
 router.include_router(license_router)
+router.include_router(events_router)
+router.include_router(changes_router)
+router.include_router(search_router)
 
 __all__ = ["router"]
@@ -0,0 +1,32 @@
+"""Incremental change feed for external consumers."""
+
+import sqlite3
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from services.change_feed import MAX_LIMIT, CursorExpired, get_changes, latest_seq
+from utils.auth import require_login
+
+router = APIRouter(dependencies=[Depends(require_login)])
+
+
+@router.get("/changes")
+def list_changes(
+    since: Optional[int] = Query(default=None, ge=0),
+    limit: int = Query(default=500, ge=1, le=MAX_LIMIT),
+):
+    """Return inventory row changes after the ``since`` cursor.
+
+    Without ``since`` only the current cursor is returned; consumers take a
+    full export first and then poll from that cursor. A cursor older than the
+    retained changes is answered with 410 and needs a new full export.
+    """
+    try:
+        if since is None:
+            return {"changes": [], "next": latest_seq(), "has_more": False}
+        return get_changes(since, limit)
+    except CursorExpired:
+        raise HTTPException(status_code=410, detail="Cursor expired; take a full export")
+    except sqlite3.OperationalError:
+        raise HTTPException(status_code=503, detail="Change feed is not available")
@@ -1,16 +1,135 @@
-"""Common utilities for listing routes with filtering and pagination."""
+"""Common utilities for listing routes with filtering and pagination.
 
-from typing import Iterable
+Page results, user options and lookup lists are cached as plain row tuples
+until their tables change, so paging back and forth through the same list
+runs no SQL.
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
 import math
+import os
 
 from fastapi import Request
 from fastapi.responses import HTMLResponse
 from fastapi_csrf_protect import CsrfProtect
-from sqlalchemy import String, or_
 from sqlalchemy.orm import Session
 
-from models import User
+from models import LookupItem, User, data_columns, is_shadow_column, sort_key_columns
+from services.cache import SnapshotCache
+from services.search_text import prefix_rank, search_condition
 from utils import templates, get_table_columns
+from utils.etag import apply_etag
+
+# Maximum age in seconds of a cached list page.
+LIST_CACHE_TTL = 300.0
+
+# Memory budget for cached pages of each table.
+LIST_CACHE_MAX_BYTES = int(os.getenv("LIST_CACHE_MAX_MB", "16")) * 1024 * 1024
+
+_page_caches: Dict[str, SnapshotCache] = {}
+_user_cache = SnapshotCache(("users",), LIST_CACHE_TTL)
+_lookup_cache = SnapshotCache(("lookup_items",), LIST_CACHE_TTL)
+
+
+def _page_cache(table: str) -> SnapshotCache:
+    cache = _page_caches.get(table)
+    if cache is None:
+        cache = _page_caches.setdefault(
+            table, SnapshotCache((table,), LIST_CACHE_TTL, max_bytes=LIST_CACHE_MAX_BYTES)
+        )
+    return cache
+
+
+def sort_order(Model, sort: str) -> List[Any]:
+    """Return ``ORDER BY`` clauses for ``sort`` (``"column"`` or ``"-column"``).
+
+    Columns with a Turkish sort key order by the key, so an index serves the
+    order; ``id`` breaks ties so pages stay stable. Unknown columns order by
+    ``id``.
+    """
+    columns = Model.__table__.columns
+    name = sort.lstrip("-")
+    keys = sort_key_columns(Model)
+    if name in keys:
+        column = keys[name]
+    elif name in columns and not is_shadow_column(name):
+        column = columns[name]
+    else:
+        return [columns["id"]]
+    if sort.startswith("-"):
+        return [column.desc(), columns["id"].desc()]
+    return [column, columns["id"]]
+
+
+def fetch_page(
+    db: Session,
+    Model,
+    filters: Sequence[Dict[str, Any]],
+    q: str,
+    page: int,
+    per_page: int,
+    sort: str = "",
+) -> Tuple[int, List[Any]]:
+    """Return the total count and one page of ``Model`` rows.
+
+    ``filters`` holds ``{"field", "value"}`` exact matches on columns of
+    ``Model``, ``q`` a substring searched in its text columns and ``sort``
+    the column to order by, prefixed with ``-`` for descending order.
+    Without ``sort``, rows with a field starting with ``q`` come first. Rows
+    are returned as tuples of the data columns (no shadow columns) with
+    attribute access by column name.
+    """
+    columns = Model.__table__.columns
+    key = (
+        db.get_bind(),
+        tuple((f["field"], f["value"]) for f in filters),
+        q,
+        sort,
+        page,
+        per_page,
+    )
+
+    def load() -> Tuple[int, List[Any]]:
+        query = db.query(*data_columns(Model))
+        for f in filters:
+            query = query.filter(columns[f["field"]] == f["value"])
+        order = sort_order(Model, sort)
+        if q:
+            query = query.filter(search_condition(Model, q))
+            rank = prefix_rank(Model, q)
+            if rank is not None and not sort:
+                order.insert(0, rank)
+        total_count = query.count()
+        query = query.order_by(*order)
+        rows = query.offset((page - 1) * per_page).limit(per_page).all()
+        return total_count, rows
+
+    return _page_cache(Model.__tablename__).get(key, load)
+
+
+def user_options(db: Session) -> List[Dict[str, Any]]:
+    """Return ``{"id", "name"}`` for every user, named by full name if set."""
+
+    def load() -> List[Dict[str, Any]]:
+        users = db.query(User.id, User.first_name, User.last_name, User.username).all()
+        return [
+            {
+                "id": u.id,
+                "name": (f"{u.first_name or ''} {u.last_name or ''}".strip() or u.username),
+            }
+            for u in users
+        ]
+
+    return [dict(u) for u in _user_cache.get(db.get_bind(), load)]
+
+
+def lookup_names(db: Session, lookup_type: str) -> List[str]:
+    """Return the names of the lookup items of ``lookup_type``."""
+
+    def load() -> List[str]:
+        return [row.name for row in db.query(LookupItem.name).filter_by(type=lookup_type)]
+
+    return list(_lookup_cache.get((db.get_bind(), lookup_type), load))
 
 
 def list_items(
@@ -41,34 +160,16 @@ def list_items(
     page = int(params.get("page", 1))
     per_page = int(params.get("per_page", 25))
 
-    filters = []
-    query = db.query(Model)
-    for field, value in zip(request_filter_fields, request_filter_values):
-        if field in filter_fields and value and hasattr(Model, field):
-            query = query.filter(getattr(Model, field) == value)
-            filters.append({"field": field, "value": value})
-
-    if q:
-        search_conditions = []
-        for column in Model.__table__.columns:
-            if isinstance(column.type, String):
-                search_conditions.append(column.ilike(f"%{q}%"))
-        if search_conditions:
-            query = query.filter(or_(*search_conditions))
-
-    total_count = query.count()
+    filters = [
+        {"field": field, "value": value}
+        for field, value in zip(request_filter_fields, request_filter_values)
+        if field in filter_fields and value and field in Model.__table__.columns
+    ]
+    sort = params.get("sort", "")
+    total_count, items = fetch_page(db, Model, filters, q, page, per_page, sort)
     total_pages = max(1, math.ceil(total_count / per_page))
     offset = (page - 1) * per_page
-    items = query.offset(offset).limit(per_page).all()
-    users = db.query(User).all()
-
-    user_list = [
-        {
-            "id": u.id,
-            "name": (f"{u.first_name or ''} {u.last_name or ''}".strip() or u.username),
-        }
-        for u in users
-    ]
+    user_list = user_options(db)
 
     context = {
         "request": request,
@@ -85,6 +186,7 @@ def list_items(
         "count": total_count,
         "filter_field": filter_field,
         "filter_value": filter_value,
+        "sort": sort,
         "users": user_list,
         "current_user_id": request.session.get("user_id"),
     }
@@ -94,4 +196,4 @@ def list_items(
     context["csrf_token"] = token
     response = templates.TemplateResponse(template_name, context)
     csrf_protect.set_csrf_cookie(signed, response)
-    return response
+    return apply_etag(response, request, signed)
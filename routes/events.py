@@ -0,0 +1,44 @@
+"""Server-Sent Events stream of new activity and inventory log entries."""
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from services.broadcaster import broadcaster
+from utils.auth import require_admin
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+# Seconds between keep-alive comments so proxies don't close idle streams.
+HEARTBEAT_INTERVAL = 15.0
+
+
+async def _event_stream(request: Request, queue: asyncio.Queue):
+    try:
+        # Tell the browser how long to wait before reconnecting.
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            try:
+                event, data = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+@router.get("/events")
+async def events(request: Request) -> StreamingResponse:
+    """Stream ``activity`` and ``inventory_log`` events as they are written.
+
+    Events cover every user's actions, so only admins may subscribe.
+    """
+    queue = broadcaster.subscribe()
+    return StreamingResponse(
+        _event_stream(request, queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -7,6 +7,7 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
 from utils.auth import require_login
+from utils.etag import ConditionalGet
 from utils import log_action
 from models import HardwareInventory, get_db
 from routes.common_list import list_items
@@ -14,7 +15,11 @@ from routes.common_list import list_items
 router = APIRouter(dependencies=[Depends(require_login)])
 
 
-@router.get("", response_class=HTMLResponse)
+@router.get(
+    "",
+    response_class=HTMLResponse,
+    dependencies=[Depends(ConditionalGet("hardware_inventory", "users", page=True))],
+)
 def list_hardware(
     request: Request, db: Session = Depends(get_db)
 ) -> HTMLResponse:
@@ -45,6 +50,7 @@ async def add_hardware(
             tarih=date.fromisoformat(form.get("tarih")) if form.get("tarih") else None,
         )
     db.add(item)
+    db.commit()
     log_action(
         db,
         request.session.get("username", ""),
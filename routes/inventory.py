@@ -5,11 +5,12 @@ from datetime import date, datetime
 import csv
 from io import StringIO
 
-from fastapi import APIRouter, Body, Depends, File, Request, UploadFile
+from fastapi import APIRouter, Depends, File, Request, UploadFile
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from utils.auth import require_login
+from utils.etag import ConditionalGet
 from models import (
     AccessoryInventory,
     HardwareInventory,
@@ -21,12 +22,13 @@ from models import (
     DeletedPrinterInventory,
     DeletedAccessoryInventory,
     DeletedStockItem,
+    data_columns,
     get_db,
     SessionLocal,
 )
-from utils import get_table_columns, load_settings, save_settings, log_action
+from utils import log_action
 from logs import InventoryLogCreate
-from services.log_service import add_inventory_log
+from services.log_service import stage_inventory_log, stage_inventory_logs
 from .stock import list_stock as stock_list
 
 
@@ -45,7 +47,9 @@ MODEL_MAP = {
 }
 
 
-@router.get("/inventory/fetch/{no}")
+@router.get(
+    "/inventory/fetch/{no}", dependencies=[Depends(ConditionalGet("hardware_inventory"))]
+)
 def inventory_fetch(no: str, db: Session = Depends(get_db)):
     """Fetch hardware inventory details by inventory number."""
     item = db.query(HardwareInventory).filter(HardwareInventory.no == no).first()
@@ -68,7 +72,7 @@ def _export_model(model, filename: str, db: Session) -> StreamingResponse:
     items = db.query(model).all()
     output = StringIO()
     writer = csv.writer(output)
-    columns = [col.name for col in model.__table__.columns]
+    columns = [col.name for col in data_columns(model)]
     writer.writerow(columns)
     for item in items:
         row = []
@@ -94,7 +98,7 @@ def _soft_delete(ids: list[int], model, deleted_model, db: Session) -> None:
     for record in records:
         data = {
             col.name: getattr(record, col.name)
-            for col in model.__table__.columns
+            for col in data_columns(model)
             if col.name != "id"
         }
         deleted = deleted_model(**data, deleted_at=date.today())
@@ -156,6 +160,8 @@ async def stock_add(request: Request, db: Session = Depends(get_db)):
             islem_yapan=request.session.get("full_name", ""),
         )
         db.add(item)
+    db.commit()
+    if not stock_id:
         action = f"Added stock item {item.id}"
     log_action(db, request.session.get("username", ""), action)
     return RedirectResponse(f"/stock?kategori={kategori}", status_code=303)
@@ -177,7 +183,7 @@ async def printer_add(request: Request, db: Session = Depends(get_db)):
         if existing:
             data = {
                 col.name: getattr(existing, col.name)
-                for col in PrinterInventory.__table__.columns
+                for col in data_columns(PrinterInventory)
                 if col.name != "id"
             }
             deleted = DeletedPrinterInventory(**data, deleted_at=date.today())
@@ -214,6 +220,8 @@ async def printer_add(request: Request, db: Session = Depends(get_db)):
             notlar=form.get("notlar"),
         )
         db.add(item)
+    db.commit()
+    if not printer_id:
         action = f"Added printer item {item.id}"
     log_action(db, request.session.get("username", ""), action)
     return RedirectResponse("/printer", status_code=303)
@@ -236,7 +244,7 @@ async def inventory_add(request: Request):
                 old_user = existing.sorumlu_personel
                 data = {
                     col.name: getattr(existing, col.name)
-                    for col in HardwareInventory.__table__.columns
+                    for col in data_columns(HardwareInventory)
                     if col.name != "id"
                 }
                 deleted = DeletedHardwareInventory(**data, deleted_at=date.today())
@@ -304,9 +312,10 @@ async def inventory_add(request: Request):
             )
             db.add(item)
             action = f"Added hardware item {item.id}"
-        db.commit()
+        db.flush()
+        inventory_logs = []
         if item_id and old_user != new_user:
-            add_inventory_log(
+            inventory_logs.append(
                 InventoryLogCreate(
                     inventory_type="pc",
                     inventory_id=item.id,
@@ -318,7 +327,7 @@ async def inventory_add(request: Request):
                 )
             )
         if item_id and relabel:
-            add_inventory_log(
+            inventory_logs.append(
                 InventoryLogCreate(
                     inventory_type="pc",
                     inventory_id=item.id,
@@ -328,6 +337,8 @@ async def inventory_add(request: Request):
                     new_inventory_no=new_no,
                 )
             )
+        stage_inventory_logs(db, inventory_logs)
+        db.commit()
         log_action(db, request.session.get("username", ""), action)
     finally:
         db.close()
@@ -351,7 +362,7 @@ async def license_add(request: Request):
                 old_user = existing.kullanici
                 data = {
                     col.name: getattr(existing, col.name)
-                    for col in LicenseInventory.__table__.columns
+                    for col in data_columns(LicenseInventory)
                     if col.name != "id"
                 }
                 deleted = DeletedLicenseInventory(**data, deleted_at=date.today())
@@ -404,9 +415,10 @@ async def license_add(request: Request):
             )
             db.add(item)
             action = f"Added license item {item.id}"
-        db.commit()
+        db.flush()
+        inventory_logs = []
         if license_id and old_user != new_user:
-            add_inventory_log(
+            inventory_logs.append(
                 InventoryLogCreate(
                     inventory_type="license",
                     inventory_id=item.id,
@@ -418,7 +430,7 @@ async def license_add(request: Request):
                 )
             )
         if license_id and relabel:
-            add_inventory_log(
+            inventory_logs.append(
                 InventoryLogCreate(
                     inventory_type="license",
                     inventory_id=item.id,
@@ -428,6 +440,8 @@ async def license_add(request: Request):
                     new_inventory_no=new_no,
                 )
             )
+        stage_inventory_logs(db, inventory_logs)
+        db.commit()
         log_action(db, request.session.get("username", ""), action)
     finally:
         db.close()
@@ -454,7 +468,7 @@ async def accessories_add(request: Request, db: Session = Depends(get_db)):
             old_user = existing.kullanici
             data = {
                 col.name: getattr(existing, col.name)
-                for col in AccessoryInventory.__table__.columns
+                for col in data_columns(AccessoryInventory)
                 if col.name != "id"
             }
             deleted = DeletedAccessoryInventory(**data, deleted_at=date.today())
@@ -502,9 +516,10 @@ async def accessories_add(request: Request, db: Session = Depends(get_db)):
         )
         db.add(item)
         action = f"Added accessory item {item.id}"
-    db.commit()
+    db.flush()
     if accessory_id and old_user != new_user:
-        add_inventory_log(
+        stage_inventory_log(
+            db,
             InventoryLogCreate(
                 inventory_type="accessory",
                 inventory_id=item.id,
@@ -512,8 +527,9 @@ async def accessories_add(request: Request, db: Session = Depends(get_db)):
                 changed_by=request.session.get("user_id", 0),
                 old_user_id=int(old_user) if old_user and str(old_user).isdigit() else None,
                 new_user_id=int(new_user) if new_user and str(new_user).isdigit() else None,
-            )
+            ),
         )
+    db.commit()
     log_action(db, request.session.get("username", ""), action)
     return RedirectResponse("/accessories", status_code=303)
 
@@ -627,47 +643,5 @@ async def printer_delete(request: Request):
     return {"status": "ok"}
 
 
-@router.get("/table-columns")
-def table_columns(request: Request, table_name: str):
-    """Return available columns for the requested table."""
-    model = MODEL_MAP.get(table_name)
-    if not model:
-        return {"columns": []}
-    cols = get_table_columns(model.__tablename__)
-    return {"columns": cols}
-
-
-@router.get("/column-settings")
-def column_settings(request: Request, table_name: str):
-    """Fetch stored column settings for a table."""
-    settings = load_settings()
-    return settings.get(table_name, {})
-
-
-@router.post("/column-settings")
-def save_column_settings(request: Request, table_name: str, data: dict = Body(...)):
-    """Persist column settings for a table."""
-    settings = load_settings()
-    settings[table_name] = data
-    save_settings(settings)
-    return {"status": "ok"}
-
-
-@router.get("/column-values")
-def column_values(request: Request, table_name: str, column: str | None = None):
-    """Return distinct values for a column to power client-side filters."""
-    if not column:
-        return {"values": []}
-    model = MODEL_MAP.get(table_name)
-    if not model or not hasattr(model, column):
-        return {"values": []}
-    db = SessionLocal()
-    try:
-        values = [row[0] for row in db.query(getattr(model, column)).distinct()]
-    finally:
-        db.close()
-    return {"values": values}
-
-
 __all__ = ["router"]
 
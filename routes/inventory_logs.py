@@ -1,39 +1,106 @@
-from fastapi import APIRouter, Depends, Request
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import HTMLResponse
-from typing import Optional
-from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
 
 from logs import InventoryLogCreate
 from services.log_service import (
     add_inventory_log,
+    add_inventory_logs,
     get_inventory_logs,
     get_activity_logs,
-    get_inventory_items,
+    find_inventory_item,
+    search_inventory_items,
     get_inventory_no,
+    decode_cursor,
+    next_cursor,
+    parse_date_bound,
 )
 from utils import templates
 from utils.auth import require_admin
+from utils.etag import ConditionalGet
 from models import User, get_db
 
 router = APIRouter(prefix="/logs", tags=["Inventory Logs"])
 
-@router.get("")
+def log_range_params(
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    date_from: Optional[str] = Query(default=None, alias="from"),
+    date_to: Optional[str] = Query(default=None, alias="to"),
+) -> dict:
+    """Parse cursor and date-range query parameters shared by log listings."""
+    try:
+        if before:
+            decode_cursor(before)
+        if after:
+            decode_cursor(after)
+        return {
+            "before": before or None,
+            "after": after or None,
+            "date_from": parse_date_bound(date_from),
+            "date_to": parse_date_bound(date_to, end=True),
+        }
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor or date range")
+
+
+@router.get("", dependencies=[Depends(ConditionalGet("inventory_logs"))])
 def list_logs(
+    response: Response,
     type: Optional[str] = None,
     id: Optional[int] = None,
     user_id: Optional[str] = None,
     limit: int = 200,
     offset: int = 0,
+    log_range: dict = Depends(log_range_params),
 ):
+    """Return inventory logs; the next page cursor is sent as ``X-Next-Cursor``."""
     user_id_int = int(user_id) if user_id and user_id.isdigit() else None
-    return get_inventory_logs(
+    logs = get_inventory_logs(
         inventory_type=type,
         inventory_id=id,
         user_id=user_id_int,
         limit=limit,
         offset=offset,
+        **log_range,
+    )
+    cursor = next_cursor(logs, limit)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return logs
+
+
+@router.get("/activity", dependencies=[Depends(require_admin)])
+def list_activity(
+    response: Response,
+    username: Optional[str] = None,
+    action: Optional[str] = None,
+    limit: int = Query(default=200, ge=1, le=1000),
+    log_range: dict = Depends(log_range_params),
+):
+    """Return activity log entries; ``action`` filters by action prefix.
+
+    The next page cursor is sent as ``X-Next-Cursor``.
+    """
+    logs = get_activity_logs(
+        username=username, action_prefix=action, limit=limit, **log_range
     )
+    cursor = next_cursor(logs, limit, date_key="timestamp")
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return logs
+
+
+@router.get("/inventory-search", dependencies=[Depends(require_admin)])
+def inventory_search(q: str = "", limit: int = Query(default=20, ge=1, le=100)):
+    """Return inventory numbers matching ``q`` for the records page typeahead."""
+    return search_inventory_items(q, limit=limit)
 
 
 @router.get("/records", response_class=HTMLResponse, dependencies=[Depends(require_admin)])
@@ -44,32 +111,34 @@ def logs_page(
     inventory_no: Optional[str] = None,
     limit: int = 200,
     offset: int = 0,
+    log_range: dict = Depends(log_range_params),
     db: Session = Depends(get_db),
 ):
     logs = []
     users = []
-    inventory_items = []
     selected_inv_type = None
     selected_inv_id = None
     selected_inv_no = inventory_no
+    cursor = None
 
     if log_type == "user":
-        logs = get_activity_logs(username=username, limit=limit, offset=offset)
+        logs = get_activity_logs(
+            username=username, limit=limit, offset=offset, **log_range
+        )
+        cursor = next_cursor(logs, limit, date_key="timestamp")
         users = [u[0] for u in db.query(User.username).order_by(User.username).all()]
     else:  # log_type == 'inventory'
-        inventory_items = get_inventory_items()
-        if inventory_no:
-            for item in inventory_items:
-                if item.get("inv_no") == inventory_no:
-                    selected_inv_type = item["type"]
-                    selected_inv_id = item["id"]
-                    break
+        found = find_inventory_item(inventory_no) if inventory_no else None
+        if found:
+            selected_inv_type, selected_inv_id = found
         logs = get_inventory_logs(
             inventory_type=selected_inv_type,
             inventory_id=selected_inv_id,
             limit=limit,
             offset=offset,
+            **log_range,
         )
+        cursor = next_cursor(logs, limit)
 
     return templates.TemplateResponse(
         "kayitlar.html",
@@ -78,11 +147,13 @@ def logs_page(
             "logs": logs,
             "log_type": log_type,
             "users": users,
-            "inventory_items": inventory_items,
             "selected_username": username,
             "selected_inv_type": selected_inv_type,
             "selected_inv_id": selected_inv_id,
             "selected_inv_no": selected_inv_no,
+            "next_cursor": cursor,
+            "date_from": request.query_params.get("from", ""),
+            "date_to": request.query_params.get("to", ""),
         },
     )
 
@@ -91,6 +162,35 @@ def create_log(payload: InventoryLogCreate):
     log_id = add_inventory_log(payload)
     return {"ok": True, "id": log_id}
 
+
+_BATCH_ADAPTER = TypeAdapter(List[InventoryLogCreate])
+
+
+@router.post("/batch")
+async def create_logs_batch(request: Request):
+    """Insert many log events at once.
+
+    Accepts a JSON array of ``InventoryLogCreate`` objects or, with an
+    ``application/x-ndjson`` content type, one object per line. The batch is
+    validated as a whole and stored in a single transaction.
+    """
+    body = await request.body()
+    try:
+        if "ndjson" in request.headers.get("content-type", ""):
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body or b"[]")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a list of log events")
+    try:
+        payloads = _BATCH_ADAPTER.validate_python(items)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False))
+    count = await run_in_threadpool(add_inventory_logs, payloads)
+    return {"ok": True, "count": count}
+
 class AssignRequest(BaseModel):
     inventory_type: str
     inventory_id: int
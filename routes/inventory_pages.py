@@ -5,7 +5,6 @@ from datetime import date
 from fastapi import APIRouter, Body, Depends, Form, Request
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi_csrf_protect import CsrfProtect
-from sqlalchemy import String, or_
 from sqlalchemy.orm import Session
 import math
 
@@ -21,8 +20,12 @@ from models import (
     get_db,
     pwd_context,
 )
-from utils import get_table_columns, load_settings, save_settings, templates
+from routes.common_list import fetch_page, lookup_names, user_options
+from services.facet_service import column_facets
+from services.search_text import search_condition
+from utils import SETTINGS_FILE, get_table_columns, load_settings, save_settings, templates
 from utils.auth import require_login
+from utils.etag import ConditionalGet, apply_etag
 
 router = APIRouter(dependencies=[Depends(require_login)])
 
@@ -35,8 +38,19 @@ MODEL_MAP = {
     "accessory": AccessoryInventory,
 }
 
+# Tables read by the column helper endpoints.
+COLUMN_TABLES = tuple(model.__tablename__ for model in MODEL_MAP.values())
 
-@router.get("/inventory", response_class=HTMLResponse)
+
+def _page_etag(model) -> ConditionalGet:
+    return ConditionalGet(model.__tablename__, "users", "lookup_items", page=True)
+
+
+@router.get(
+    "/inventory",
+    response_class=HTMLResponse,
+    dependencies=[Depends(_page_etag(HardwareInventory))],
+)
 def inventory_page(
     request: Request,
     csrf_protect: CsrfProtect = Depends(),
@@ -52,43 +66,27 @@ def inventory_page(
     page = int(params.get("page", 1))
     per_page = int(params.get("per_page", 25))
 
-    filters = []
-    query = db.query(HardwareInventory)
-
-    for field, value in zip(filter_fields, filter_values):
-        if field and value and hasattr(HardwareInventory, field):
-            query = query.filter(getattr(HardwareInventory, field) == value)
-            filters.append({"field": field, "value": value})
-
-    if q:
-        search_conditions = []
-        for column in HardwareInventory.__table__.columns:
-            if isinstance(column.type, String):
-                search_conditions.append(column.ilike(f"%{q}%"))
-        if search_conditions:
-            query = query.filter(or_(*search_conditions))
-
-    total_count = query.count()
+    filters = [
+        {"field": field, "value": value}
+        for field, value in zip(filter_fields, filter_values)
+        if field and value and field in HardwareInventory.__table__.columns
+    ]
+    sort = params.get("sort", "")
+    total_count, items = fetch_page(
+        db, HardwareInventory, filters, q, page, per_page, sort
+    )
     total_pages = max(1, math.ceil(total_count / per_page))
     offset = (page - 1) * per_page
-    items = query.offset(offset).limit(per_page).all()
-    users = db.query(User).all()
-    user_list = [
-        {
-            "id": u.id,
-            "name": (f"{u.first_name or ''} {u.last_name or ''}".strip() or u.username),
-        }
-        for u in users
-    ]
+    user_list = user_options(db)
     user_names = [u["name"] for u in user_list]
     lookups = {
         "sorumlu_personel": user_names,
-        "fabrika": [i.name for i in db.query(LookupItem).filter_by(type="fabrika").all()],
-        "blok": [i.name for i in db.query(LookupItem).filter_by(type="blok").all()],
-        "departman": [i.name for i in db.query(LookupItem).filter_by(type="departman").all()],
-        "donanim_tipi": [i.name for i in db.query(LookupItem).filter_by(type="donanim_tipi").all()],
-        "marka": [i.name for i in db.query(LookupItem).filter_by(type="marka").all()],
-        "model": [i.name for i in db.query(LookupItem).filter_by(type="model").all()],
+        "fabrika": lookup_names(db, "fabrika"),
+        "blok": lookup_names(db, "blok"),
+        "departman": lookup_names(db, "departman"),
+        "donanim_tipi": lookup_names(db, "donanim_tipi"),
+        "marka": lookup_names(db, "marka"),
+        "model": lookup_names(db, "model"),
         "kullanim_alani": ["kullanıcı", "üretim", "dışarı"],
     }
 
@@ -109,6 +107,7 @@ def inventory_page(
         "count": total_count,
         "filter_field": filter_field,
         "filter_value": filter_value,
+        "sort": sort,
         "today": date.today().isoformat(),
         "users": user_list,
         "current_user_id": request.session.get("user_id"),
@@ -116,10 +115,14 @@ def inventory_page(
     }
     response = templates.TemplateResponse("envanter.html", context)
     csrf_protect.set_csrf_cookie(signed, response)
-    return response
+    return apply_etag(response, request, signed)
 
 
-@router.get("/printer", response_class=HTMLResponse)
+@router.get(
+    "/printer",
+    response_class=HTMLResponse,
+    dependencies=[Depends(_page_etag(PrinterInventory))],
+)
 def printer_page(
     request: Request,
     csrf_protect: CsrfProtect = Depends(),
@@ -135,47 +138,22 @@ def printer_page(
     page = int(params.get("page", 1))
     per_page = int(params.get("per_page", 25))
 
-    filters = []
-    query = db.query(PrinterInventory)
-
-    for field, value in zip(filter_fields, filter_values):
-        if field and value and hasattr(PrinterInventory, field):
-            query = query.filter(getattr(PrinterInventory, field) == value)
-            filters.append({"field": field, "value": value})
-
-    if q:
-        search_conditions = []
-        for column in PrinterInventory.__table__.columns:
-            if isinstance(column.type, String):
-                search_conditions.append(column.ilike(f"%{q}%"))
-        if search_conditions:
-            query = query.filter(or_(*search_conditions))
-
-    total_count = query.count()
+    filters = [
+        {"field": field, "value": value}
+        for field, value in zip(filter_fields, filter_values)
+        if field and value and field in PrinterInventory.__table__.columns
+    ]
+    sort = params.get("sort", "")
+    total_count, printers = fetch_page(
+        db, PrinterInventory, filters, q, page, per_page, sort
+    )
     total_pages = max(1, math.ceil(total_count / per_page))
     offset = (page - 1) * per_page
-    printers = query.offset(offset).limit(per_page).all()
-    users = db.query(User).all()
-    user_list = [
-        {
-            "id": u.id,
-            "name": (f"{u.first_name or ''} {u.last_name or ''}".strip() or u.username),
-        }
-        for u in users
-    ]
+    user_list = user_options(db)
     lookups = {
-        "yazici_markasi": [
-            i.name
-            for i in db.query(LookupItem).filter_by(type="yazici_marka").all()
-        ],
-        "yazici_modeli": [
-            i.name
-            for i in db.query(LookupItem).filter_by(type="yazici_model").all()
-        ],
-        "kullanim_alani": [
-            i.name
-            for i in db.query(LookupItem).filter_by(type="lokasyon").all()
-        ],
+        "yazici_markasi": lookup_names(db, "yazici_marka"),
+        "yazici_modeli": lookup_names(db, "yazici_model"),
+        "kullanim_alani": lookup_names(db, "lokasyon"),
     }
 
     token, signed = csrf_protect.generate_csrf_tokens()
@@ -195,6 +173,7 @@ def printer_page(
         "count": total_count,
         "filter_field": filter_field,
         "filter_value": filter_value,
+        "sort": sort,
         "today": date.today().isoformat(),
         "users": user_list,
         "current_user_id": request.session.get("user_id"),
@@ -202,10 +181,14 @@ def printer_page(
     }
     response = templates.TemplateResponse("yazici.html", context)
     csrf_protect.set_csrf_cookie(signed, response)
-    return response
+    return apply_etag(response, request, signed)
 
 
-@router.get("/license", response_class=HTMLResponse)
+@router.get(
+    "/license",
+    response_class=HTMLResponse,
+    dependencies=[Depends(_page_etag(LicenseInventory))],
+)
 def license_page(
     request: Request,
     csrf_protect: CsrfProtect = Depends(),
@@ -221,44 +204,23 @@ def license_page(
     page = int(params.get("page", 1))
     per_page = int(params.get("per_page", 25))
 
-    filters = []
-    query = db.query(LicenseInventory)
-
-    for field, value in zip(filter_fields, filter_values):
-        if field and value and hasattr(LicenseInventory, field):
-            query = query.filter(getattr(LicenseInventory, field) == value)
-            filters.append({"field": field, "value": value})
-
-    if q:
-        search_conditions = []
-        for column in LicenseInventory.__table__.columns:
-            if isinstance(column.type, String):
-                search_conditions.append(column.ilike(f"%{q}%"))
-        if search_conditions:
-            query = query.filter(or_(*search_conditions))
-
-    total_count = query.count()
+    filters = [
+        {"field": field, "value": value}
+        for field, value in zip(filter_fields, filter_values)
+        if field and value and field in LicenseInventory.__table__.columns
+    ]
+    sort = params.get("sort", "")
+    total_count, licenses = fetch_page(
+        db, LicenseInventory, filters, q, page, per_page, sort
+    )
     total_pages = max(1, math.ceil(total_count / per_page))
     offset = (page - 1) * per_page
-    licenses = query.offset(offset).limit(per_page).all()
-    users = db.query(User).all()
-    user_list = [
-        {
-            "id": u.id,
-            "name": (f"{u.first_name or ''} {u.last_name or ''}".strip() or u.username),
-        }
-        for u in users
-    ]
+    user_list = user_options(db)
     user_names = [u["name"] for u in user_list]
     lookups = {
         "kullanici": user_names,
-        "departman": [
-            i.name
-            for i in db.query(LookupItem).filter_by(type="departman").all()
-        ],
-        "yazilim_adi": [
-            i.name for i in db.query(LookupItem).filter_by(type="yazilim").all()
-        ],
+        "departman": lookup_names(db, "departman"),
+        "yazilim_adi": lookup_names(db, "yazilim"),
     }
 
     token, signed = csrf_protect.generate_csrf_tokens()
@@ -290,6 +252,7 @@ def license_page(
         "count": total_count,
         "filter_field": filter_field,
         "filter_value": filter_value,
+        "sort": sort,
         "today": date.today().isoformat(),
         "users": user_list,
         "current_user_id": request.session.get("user_id"),
@@ -298,10 +261,14 @@ def license_page(
     }
     response = templates.TemplateResponse("lisans.html", context)
     csrf_protect.set_csrf_cookie(signed, response)
-    return response
+    return apply_etag(response, request, signed)
 
 
-@router.get("/accessories", response_class=HTMLResponse)
+@router.get(
+    "/accessories",
+    response_class=HTMLResponse,
+    dependencies=[Depends(_page_etag(AccessoryInventory))],
+)
 def accessories_page(
     request: Request,
     csrf_protect: CsrfProtect = Depends(),
@@ -317,34 +284,18 @@ def accessories_page(
     page = int(params.get("page", 1))
     per_page = int(params.get("per_page", 25))
 
-    filters = []
-    query = db.query(AccessoryInventory)
-
-    for field, value in zip(filter_fields, filter_values):
-        if field and value and hasattr(AccessoryInventory, field):
-            query = query.filter(getattr(AccessoryInventory, field) == value)
-            filters.append({"field": field, "value": value})
-
-    if q:
-        search_conditions = []
-        for column in AccessoryInventory.__table__.columns:
-            if isinstance(column.type, String):
-                search_conditions.append(column.ilike(f"%{q}%"))
-        if search_conditions:
-            query = query.filter(or_(*search_conditions))
-
-    total_count = query.count()
+    filters = [
+        {"field": field, "value": value}
+        for field, value in zip(filter_fields, filter_values)
+        if field and value and field in AccessoryInventory.__table__.columns
+    ]
+    sort = params.get("sort", "")
+    total_count, accessories = fetch_page(
+        db, AccessoryInventory, filters, q, page, per_page, sort
+    )
     total_pages = max(1, math.ceil(total_count / per_page))
     offset = (page - 1) * per_page
-    accessories = query.offset(offset).limit(per_page).all()
-    users = db.query(User).all()
-    user_list = [
-        {
-            "id": u.id,
-            "name": (f"{u.first_name or ''} {u.last_name or ''}".strip() or u.username),
-        }
-        for u in users
-    ]
+    user_list = user_options(db)
     user_names = [u["name"] for u in user_list]
 
     token, signed = csrf_protect.generate_csrf_tokens()
@@ -364,6 +315,7 @@ def accessories_page(
         "count": total_count,
         "filter_field": filter_field,
         "filter_value": filter_value,
+        "sort": sort,
         "today": date.today().isoformat(),
         "users": user_list,
         "current_user_id": request.session.get("user_id"),
@@ -371,16 +323,17 @@ def accessories_page(
     }
     response = templates.TemplateResponse("aksesuar.html", context)
     csrf_protect.set_csrf_cookie(signed, response)
-    return response
+    return apply_etag(response, request, signed)
 
 
 @router.get("/requests", response_class=HTMLResponse)
 def requests_page(
     request: Request,
+    q: str = "",
     csrf_protect: CsrfProtect = Depends(),
     db: Session = Depends(get_db),
 ) -> HTMLResponse:
-    """Render the requests tracking page."""
+    """Render the requests tracking page, limited to requests matching ``q``."""
     lookups = {
         "donanim_tipi": [],
         "marka": [],
@@ -389,14 +342,18 @@ def requests_page(
         "urun_adi": [],
     }
 
+    query = db.query(RequestItem)
+    if q:
+        query = query.filter(search_condition(RequestItem, q))
     groups = {}
-    for item in db.query(RequestItem).all():
+    for item in query.all():
         groups.setdefault(item.ifs_no, []).append(item)
 
     token, signed = csrf_protect.generate_csrf_tokens()
     context = {
         "request": request,
         "groups": groups,
+        "q": q,
         "lookups": lookups,
         "today": date.today().isoformat(),
         "csrf_token": token,
@@ -743,7 +700,9 @@ async def change_password(
     return RedirectResponse("/profile", status_code=303)
 
 
-@router.get("/table-columns")
+@router.get(
+    "/table-columns", dependencies=[Depends(ConditionalGet(schema=True))]
+)
 def table_columns(request: Request, table_name: str):
     """Return available columns for the requested table."""
     model = MODEL_MAP.get(table_name)
@@ -753,7 +712,9 @@ def table_columns(request: Request, table_name: str):
     return {"columns": cols}
 
 
-@router.get("/column-settings")
+@router.get(
+    "/column-settings", dependencies=[Depends(ConditionalGet(files=[SETTINGS_FILE]))]
+)
 def column_settings(request: Request, table_name: str):
     """Fetch stored column settings for a table."""
     settings = load_settings()
@@ -776,18 +737,30 @@ async def save_column_settings(
     return {"status": "ok"}
 
 
-@router.get("/column-values")
+@router.get("/column-values", dependencies=[Depends(ConditionalGet(*COLUMN_TABLES))])
 def column_values(
     request: Request, table_name: str, column: str | None = None, db: Session = Depends(get_db)
 ):
-    """Return distinct values for a column to power client-side filters."""
-    if not column:
-        return {"values": []}
+    """Return distinct values and their counts for a column filter.
+
+    Counts honour the page's other ``filter_field``/``filter_value`` pairs
+    and its ``q`` search, passed along in the query string.
+    """
     model = MODEL_MAP.get(table_name)
-    if not model or not hasattr(model, column):
-        return {"values": []}
-    values = [row[0] for row in db.query(getattr(model, column)).distinct()]
-    return {"values": values}
+    if not column or not model or column not in model.__table__.columns:
+        return {"values": [], "facets": []}
+    params = request.query_params
+    facets = column_facets(
+        db,
+        model,
+        column,
+        filters=zip(params.getlist("filter_field"), params.getlist("filter_value")),
+        q=params.get("q", ""),
+    )
+    return {
+        "values": [value for value, _ in facets],
+        "facets": [{"value": value, "count": count} for value, count in facets],
+    }
 
 
 __all__ = ["router"]
@@ -3,52 +3,62 @@
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi_csrf_protect import CsrfProtect
-from sqlalchemy import case, func
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from utils.auth import require_login
 from utils import templates, load_home_stock, save_home_stock
-from models import ActivityLog, HardwareInventory, StockItem, get_db
+from models import ActivityLog, HardwareInventory, get_db
+from services.cache import SnapshotCache
+from services.stock_service import stock_totals
 
 router = APIRouter(dependencies=[Depends(require_login)])
 
 
-def _main_context(db: Session) -> dict:
-    """Gather summary info for the main dashboard."""
+# Maximum age in seconds of a cached dashboard context.
+DASHBOARD_TTL = 30.0
+
+dashboard_cache = SnapshotCache(
+    tables=("hardware_inventory", "stock_tracking", "activity_log", "home_stock"),
+    ttl=DASHBOARD_TTL,
+)
+
+
+def _load_main_context(db: Session) -> dict:
     device_totals = (
         db.query(HardwareInventory.donanim_tipi, func.count())
         .group_by(HardwareInventory.donanim_tipi)
         .all()
     )
-    stock_totals = (
-        db.query(
-            StockItem.urun_adi,
-            func.sum(
-                case((StockItem.islem == "giris", StockItem.adet), else_=-StockItem.adet)
-            ).label("net_adet"),
-        )
-        .group_by(StockItem.urun_adi)
-        .all()
-    )
     selected = set(load_home_stock())
     stock_summary = [
-        (name, qty or 0)
-        for name, qty in stock_totals
+        (name, qty)
+        for name, qty in stock_totals(db)
         if not selected or name in selected
     ]
     actions = (
-        db.query(ActivityLog)
-        .order_by(ActivityLog.timestamp.desc())
+        db.query(ActivityLog.timestamp, ActivityLog.username, ActivityLog.action)
+        .order_by(ActivityLog.timestamp.desc(), ActivityLog.id.desc())
         .limit(10)
         .all()
     )
     return {
-        "device_summary": device_totals,
+        "device_summary": [tuple(row) for row in device_totals],
         "stock_summary": stock_summary,
-        "actions": actions,
+        "actions": [row._asdict() for row in actions],
     }
 
 
+def _main_context(db: Session) -> dict:
+    """Gather summary info for the main dashboard.
+
+    The result is served from ``dashboard_cache`` until a write to one of
+    the summarized tables or the TTL invalidates it.
+    """
+    context = dashboard_cache.get(db.get_bind(), lambda: _load_main_context(db))
+    return dict(context)
+
+
 @router.get("/", response_class=HTMLResponse)
 def root(request: Request, db: Session = Depends(get_db)) -> HTMLResponse:
     """Render the main dashboard page."""
@@ -73,21 +83,7 @@ def stock_status_page(
 ) -> HTMLResponse:
     """Render stock status page with dashboard selection controls."""
 
-    totals = (
-        db.query(
-            StockItem.urun_adi,
-            func.sum(
-                case(
-                    (StockItem.islem == "giris", StockItem.adet),
-                    else_=-StockItem.adet,
-                )
-            ).label("net_adet"),
-        )
-        .group_by(StockItem.urun_adi)
-        .all()
-    )
-
-    summary = [(name, qty or 0) for name, qty in totals]
+    summary = stock_totals(db)
     selected = load_home_stock()
     token, signed = csrf_protect.generate_csrf_tokens()
     context = {
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query, Response
 import sqlite3
-from services.log_service import get_inventory_logs
+from services.log_service import get_inventory_logs, next_cursor
+from routes.inventory_logs import log_range_params
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 DB_PATH = "data/envanter.db"
@@ -33,10 +34,20 @@ def current_assignments(
     limit: int = 200,
     offset: int = 0,
 ):
-    q = """
-      SELECT inventory_type, inventory_id, new_user_id, new_location, action, change_date, id
-      FROM v_inventory_latest
-    """
+    # The materialized table is kept current by a trigger on inventory_logs;
+    # databases without it fall back to the window-function view.
+    sources = [
+        (
+            "SELECT inventory_type, inventory_id, new_user_id, new_location, action, change_date, log_id "
+            "FROM inventory_current_state",
+            "log_id",
+        ),
+        (
+            "SELECT inventory_type, inventory_id, new_user_id, new_location, action, change_date, id "
+            "FROM v_inventory_latest",
+            "id",
+        ),
+    ]
     conds, params = [], []
     if inv_type:
         conds.append("inventory_type = ?")
@@ -44,14 +55,20 @@ def current_assignments(
     if user_id is not None:
         conds.append("new_user_id = ?")
         params.append(user_id)
-    if conds:
-        q += " WHERE " + " AND ".join(conds)
-    q += " ORDER BY change_date DESC, id DESC LIMIT ? OFFSET ?"
     params.extend([limit, offset])
 
     with sqlite3.connect(DB_PATH) as con:
         cur = con.cursor()
-        cur.execute(q, params)
+        for q, id_col in sources:
+            if conds:
+                q += " WHERE " + " AND ".join(conds)
+            q += f" ORDER BY change_date DESC, {id_col} DESC LIMIT ? OFFSET ?"
+            try:
+                cur.execute(q, params)
+                break
+            except sqlite3.OperationalError:
+                if id_col == "id":
+                    raise
         rows = cur.fetchall()
     return [
         {
@@ -68,5 +85,15 @@ def current_assignments(
 
 
 @router.get("/user-history")
-def user_history(user_id: int, limit: int = 200, offset: int = 0):
-    return get_inventory_logs(user_id=user_id, limit=limit, offset=offset)
+def user_history(
+    response: Response,
+    user_id: int,
+    limit: int = 200,
+    offset: int = 0,
+    log_range: dict = Depends(log_range_params),
+):
+    logs = get_inventory_logs(user_id=user_id, limit=limit, offset=offset, **log_range)
+    cursor = next_cursor(logs, limit)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return logs
@@ -0,0 +1,51 @@
+"""Search endpoints spanning the inventory tables."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from models import get_db
+from services.fuzzy_index import FUZZY_FIELDS, fuzzy_index
+from services.global_search import global_search
+from utils.auth import require_login
+
+router = APIRouter(prefix="/search", dependencies=[Depends(require_login)])
+
+
+@router.get("/fuzzy")
+def fuzzy_search(
+    q: str = "",
+    type: Optional[str] = Query(default=None, description="Comma separated types"),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Return devices whose number, name or serial resemble ``q``.
+
+    Types are ``hardware``, ``printer`` and ``license``; hits are ordered by
+    similarity, best first.
+    """
+    kinds = [t for t in type.split(",") if t in FUZZY_FIELDS] if type else None
+    return {"query": q, "results": fuzzy_index.search(db, q, limit=limit, kinds=kinds)}
+
+
+@router.get("")
+def search(
+    q: str = "",
+    type: Optional[str] = Query(default=None, description="Comma separated types"),
+    per_type: int = Query(default=5, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """Return matching records of every inventory type, grouped by type.
+
+    Each group carries the total number of matches of its type and the best
+    ``per_type`` hits ranked by relevance.
+    """
+    try:
+        return global_search(
+            db, q, per_type=per_type, types=type.split(",") if type else None
+        )
+    except OperationalError:
+        db.rollback()
+        raise HTTPException(status_code=503, detail="Search index is not available")
@@ -11,10 +11,12 @@ from pydantic_settings import BaseSettings
 from sqlalchemy.orm import Session
 
 from utils.auth import require_login
+from utils.etag import ConditionalGet
 from utils import log_action
 import utils
 from logs import InventoryLogCreate
-from services.log_service import add_inventory_log
+from services.log_service import stage_inventory_log
+from services.stock_service import stock_balance_as_of
 
 os.environ.setdefault("FASTAPI_CSRF_SECRET", "dev-secret")
 
@@ -33,6 +35,7 @@ from models import (
     LicenseInventory,
     AccessoryInventory,
     User,
+    data_columns,
     get_db,
 )
 from routes.common_list import list_items
@@ -52,7 +55,11 @@ INVENTORY_MODEL_MAP = {
 }
 
 
-@router.get("", response_class=HTMLResponse)
+@router.get(
+    "",
+    response_class=HTMLResponse,
+    dependencies=[Depends(ConditionalGet("stock_tracking", "users", page=True))],
+)
 def list_stock(
     request: Request,
     db: Session = Depends(get_db),
@@ -112,18 +119,19 @@ async def add_stock(request: Request, db: Session = Depends(get_db)):
             islem_yapan=request.session.get("full_name", ""),
         )
     db.add(item)
-    db.commit()
-    db.refresh(item)
-
-    add_inventory_log(
+    db.flush()
+    stage_inventory_log(
+        db,
         InventoryLogCreate(
             inventory_type="stock",
             inventory_id=item.id,
             action="assign",
             changed_by=request.session.get("user_id", 0),
             new_location=form.get("departman"),
-        )
+        ),
     )
+    db.commit()
+
     log_action(
         db,
         request.session.get("username", ""),
@@ -155,7 +163,7 @@ async def assign_stock(request: Request, db: Session = Depends(get_db)):
     if not stock or (stock.adet or 0) < qty:
         return JSONResponse({"status": "error"}, status_code=400)
 
-    columns = set(model.__table__.columns.keys()) - {"id"}
+    columns = {col.name for col in data_columns(model)} - {"id"}
     item_data = {k: v for k, v in data.items() if k in columns}
     if "tarih" in columns and "tarih" not in item_data:
         item_data["tarih"] = date.today()
@@ -179,9 +187,8 @@ async def assign_stock(request: Request, db: Session = Depends(get_db)):
         db.add(model(**item_data))
 
     stock.adet = (stock.adet or 0) - qty
-    db.commit()
-
-    add_inventory_log(
+    stage_inventory_log(
+        db,
         InventoryLogCreate(
             inventory_type="stock",
             inventory_id=stock.id,
@@ -189,8 +196,9 @@ async def assign_stock(request: Request, db: Session = Depends(get_db)):
             changed_by=request.session.get("user_id", 0),
             old_location=stock.departman,
             note=f"Assigned {qty} to {target} for user {user.username}",
-        )
+        ),
     )
+    db.commit()
 
     log_action(
         db,
@@ -221,7 +229,7 @@ async def transfer_stock(request: Request, db: Session = Depends(get_db)):
     if not stock or (stock.adet or 0) < qty:
         return JSONResponse({"status": "error"}, status_code=400)
 
-    columns = set(model.__table__.columns.keys()) - {"id"}
+    columns = {col.name for col in data_columns(model)} - {"id"}
     item_data = {k: v for k, v in data.items() if k in columns}
     if "tarih" in columns and "tarih" not in item_data:
         item_data["tarih"] = date.today()
@@ -240,10 +248,8 @@ async def transfer_stock(request: Request, db: Session = Depends(get_db)):
         db.add(model(**item_data))
 
     stock.adet = (stock.adet or 0) - qty
-    db.commit()
-    db.refresh(stock)
-
-    add_inventory_log(
+    stage_inventory_log(
+        db,
         InventoryLogCreate(
             inventory_type="stock",
             inventory_id=stock.id,
@@ -251,8 +257,10 @@ async def transfer_stock(request: Request, db: Session = Depends(get_db)):
             changed_by=request.session.get("user_id", 0),
             old_location=stock.departman,
             note=f"Transferred {qty} to {target}",
-        )
+        ),
     )
+    db.commit()
+    db.refresh(stock)
 
     log_action(
         db,
@@ -260,3 +268,13 @@ async def transfer_stock(request: Request, db: Session = Depends(get_db)):
         f"Transferred {qty} of stock item {stock.id} to {target}",
     )
     return JSONResponse({"status": "ok", "remaining": stock.adet})
+
+
+@router.get("/balance")
+def stock_balance(as_of: date | None = None):
+    """Return per-product stock balances at the end of ``as_of`` (default today).
+
+    Past balances follow later assignments and transfers, which lower the
+    quantity of the stock row they draw from.
+    """
+    return stock_balance_as_of(as_of or date.today())
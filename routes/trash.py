@@ -14,6 +14,7 @@ from models import (
     LicenseInventory,
     PrinterInventory,
     StockItem,
+    data_columns,
     get_db,
 )
 from utils import log_action, templates
@@ -65,6 +66,7 @@ async def trash_delete(request: Request, db: Session = Depends(get_db)):
     model = DELETED_MODELS.get(item_type)
     if model and ids:
         db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
         log_action(
             db,
             request.session.get("username", ""),
@@ -79,7 +81,7 @@ def _restore_item(item_id: int, models_pair: Tuple[object, object], db: Session)
     if item:
         data = {
             col.name: getattr(item, col.name, None)
-            for col in active_model.__table__.columns
+            for col in data_columns(active_model)
             if col.name != "id"
         }
         restored = active_model(**data)
@@ -98,6 +100,7 @@ def restore_item(
         raise HTTPException(status_code=404, detail="Invalid item type")
 
     _restore_item(item_id, (deleted_model, active_model), db)
+    db.commit()
     log_action(
         db,
         request.session.get("username", ""),
@@ -0,0 +1,92 @@
+"""Buffered writer for the ``activity_log`` table.
+
+Activity entries are collected in memory and written with a single
+``executemany`` insert once enough entries accumulate or a short interval
+elapses. The application's lifespan hook flushes the remaining entries at
+shutdown. Written entries are published to the live activity feed.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from models import ActivityLog
+from services.broadcaster import broadcaster
+from services.cache import bump
+
+logger = logging.getLogger(__name__)
+
+# Flush when this many entries are buffered ...
+MAX_BATCH = 100
+# ... or when the oldest buffered entry is this many seconds old.
+FLUSH_INTERVAL = 1.0
+
+
+class ActivityLogWriter:
+    """Collect activity log entries and insert them in batches."""
+
+    def __init__(self, max_batch: int = MAX_BATCH, flush_interval: float = FLUSH_INTERVAL):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._pending: List[Tuple[Engine, Dict]] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, bind: Engine, username: str, action: str) -> None:
+        """Buffer an entry destined for the database behind ``bind``."""
+        entry = {
+            "username": username,
+            "action": action,
+            # Stamp the entry now so that batching does not shift its time.
+            "timestamp": datetime.utcnow().replace(microsecond=0),
+        }
+        with self._lock:
+            self._pending.append((bind, entry))
+            full = len(self._pending) >= self.max_batch
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all buffered entries and return how many were written."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+        by_bind: Dict[Engine, List[Dict]] = {}
+        for bind, entry in pending:
+            by_bind.setdefault(bind, []).append(entry)
+        written = 0
+        for bind, rows in by_bind.items():
+            try:
+                with bind.begin() as conn:
+                    conn.execute(ActivityLog.__table__.insert(), rows)
+                written += len(rows)
+            except Exception:  # pragma: no cover - logged, never raised to callers
+                logger.exception("Failed to write %d activity log entries", len(rows))
+                continue
+            bump("activity_log")
+            for row in rows:
+                broadcaster.publish(
+                    "activity", {**row, "timestamp": row["timestamp"].isoformat(sep=" ")}
+                )
+        return written
+
+    def pending(self) -> int:
+        """Return the number of entries waiting to be written."""
+        with self._lock:
+            return len(self._pending)
+
+
+activity_writer = ActivityLogWriter()
+
+__all__ = ["ActivityLogWriter", "activity_writer", "MAX_BATCH", "FLUSH_INTERVAL"]
@@ -0,0 +1,238 @@
+"""Move old log rows into an attached archive database.
+
+``inventory_logs`` and ``activity_log`` only ever grow. Rows older than a
+configurable horizon are moved in batches into a sibling SQLite file
+(``envanter_archive.db`` next to ``envanter.db`` by default) so the hot
+tables and their indexes stay small. The cut-off reached for each table is
+recorded in ``archive_state`` in the main database; readers attach the
+archive only when a requested range reaches past that boundary.
+
+Run ``python -m services.archive_service`` (e.g. from cron) to archive.
+The same run prunes ``change_log`` past its retention (see
+:func:`services.change_feed.prune_change_log`).
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rows older than this many days are archived.
+ARCHIVE_AFTER_DAYS = int(os.getenv("LOG_ARCHIVE_DAYS", "365"))
+# Rows moved per transaction; keeps write locks on the hot database short.
+BATCH_SIZE = 1000
+ARCHIVE_ALIAS = "archive"
+
+# Archived tables and the column their age is measured by.
+ARCHIVED_TABLES = {
+    "inventory_logs": "change_date",
+    "activity_log": "timestamp",
+}
+
+
+def archive_path_for(db_path: str) -> str:
+    """Return the archive database used for ``db_path``."""
+    override = os.getenv("LOG_ARCHIVE_PATH")
+    if override:
+        return override
+    root, ext = os.path.splitext(db_path)
+    return f"{root}_archive{ext or '.db'}"
+
+
+def _plain(con: sqlite3.Connection) -> sqlite3.Cursor:
+    """Return a tuple-row cursor regardless of the connection's row factory."""
+    cur = con.cursor()
+    cur.row_factory = None
+    return cur
+
+
+def _ensure_state_table(con: sqlite3.Connection) -> None:
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS archive_state ("
+        "table_name TEXT PRIMARY KEY, archived_before TEXT NOT NULL)"
+    )
+
+
+def archive_boundary(con: sqlite3.Connection, table: str) -> Optional[str]:
+    """Return the date before which ``table`` rows may live in the archive."""
+    try:
+        row = _plain(con).execute(
+            "SELECT archived_before FROM archive_state WHERE table_name = ?", (table,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def _columns(con: sqlite3.Connection, table: str, schema: str = "main") -> List[str]:
+    return [row[1] for row in _plain(con).execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def _attached(con: sqlite3.Connection) -> bool:
+    return any(row[1] == ARCHIVE_ALIAS for row in _plain(con).execute("PRAGMA database_list"))
+
+
+def attach_archive(con: sqlite3.Connection, db_path: str) -> bool:
+    """Attach the archive for ``db_path`` to ``con``; return ``False`` if absent."""
+    if _attached(con):
+        return True
+    path = archive_path_for(db_path)
+    if not os.path.exists(path):
+        return False
+    con.execute(f"ATTACH DATABASE ? AS {ARCHIVE_ALIAS}", (path,))
+    return True
+
+
+def union_source(con: sqlite3.Connection, db_path: str, table: str) -> Optional[str]:
+    """Return a subquery over hot and archived rows of ``table``.
+
+    The archive is attached to ``con`` on demand. ``None`` is returned when
+    there is no archive or it has no copy of ``table``.
+    """
+    if not attach_archive(con, db_path):
+        return None
+    archived = set(_columns(con, table, ARCHIVE_ALIAS))
+    if not archived:
+        return None
+    cols = ", ".join(
+        c if c in archived else f"NULL AS {c}" for c in _columns(con, table)
+    )
+    hot_cols = ", ".join(_columns(con, table))
+    return (
+        f"(SELECT {hot_cols} FROM main.{table} "
+        f"UNION ALL SELECT {cols} FROM {ARCHIVE_ALIAS}.{table})"
+    )
+
+
+def needs_archive(
+    con: sqlite3.Connection, table: str, lower_bound: Optional[str]
+) -> bool:
+    """Return whether a range starting at ``lower_bound`` may reach archived rows."""
+    boundary = archive_boundary(con, table)
+    if boundary is None:
+        return False
+    return lower_bound is None or str(lower_bound) < boundary
+
+
+def _prepare_archive_table(con: sqlite3.Connection, table: str, date_col: str) -> List[str]:
+    """Create or widen the archive copy of ``table`` and return shared columns."""
+    hot = _columns(con, table)
+    archived = _columns(con, table, ARCHIVE_ALIAS)
+    if not archived:
+        con.execute(
+            f"CREATE TABLE {ARCHIVE_ALIAS}.{table} AS SELECT * FROM main.{table} WHERE 0"
+        )
+        con.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {ARCHIVE_ALIAS}.idx_{table}_id "
+            f"ON {table} (id)"
+        )
+        con.execute(
+            f"CREATE INDEX IF NOT EXISTS {ARCHIVE_ALIAS}.idx_{table}_date "
+            f"ON {table} ({date_col} DESC, id DESC)"
+        )
+        return hot
+    for col in hot:
+        if col not in archived:
+            con.execute(f"ALTER TABLE {ARCHIVE_ALIAS}.{table} ADD COLUMN {col}")
+    return hot
+
+
+def archive_logs(
+    db_path: str,
+    before: Optional[datetime] = None,
+    batch_size: int = BATCH_SIZE,
+) -> Dict[str, int]:
+    """Move log rows older than ``before`` into the archive database.
+
+    ``before`` defaults to ``ARCHIVE_AFTER_DAYS`` days ago. Each batch is
+    copied and deleted in one transaction, so an interrupted run can simply
+    be restarted. Returns the number of rows moved per table.
+    """
+    if before is None:
+        before = datetime.utcnow() - timedelta(days=ARCHIVE_AFTER_DAYS)
+    cutoff = before.strftime("%Y-%m-%d %H:%M:%S")
+    moved: Dict[str, int] = {}
+    con = sqlite3.connect(db_path)
+    try:
+        _ensure_state_table(con)
+        con.execute(
+            f"ATTACH DATABASE ? AS {ARCHIVE_ALIAS}", (archive_path_for(db_path),)
+        )
+        for table, date_col in ARCHIVED_TABLES.items():
+            if not _columns(con, table):
+                continue
+            with con:
+                cols = ", ".join(_prepare_archive_table(con, table, date_col))
+            moved[table] = 0
+            while True:
+                with con:
+                    ids = [
+                        row[0]
+                        for row in con.execute(
+                            f"SELECT id FROM main.{table} WHERE {date_col} < ? "
+                            "ORDER BY id LIMIT ?",
+                            (cutoff, batch_size),
+                        )
+                    ]
+                    if not ids:
+                        break
+                    marks = ", ".join("?" * len(ids))
+                    con.execute(
+                        f"INSERT OR IGNORE INTO {ARCHIVE_ALIAS}.{table} ({cols}) "
+                        f"SELECT {cols} FROM main.{table} WHERE id IN ({marks})",
+                        ids,
+                    )
+                    con.execute(f"DELETE FROM main.{table} WHERE id IN ({marks})", ids)
+                moved[table] += len(ids)
+            with con:
+                con.execute(
+                    "INSERT INTO archive_state (table_name, archived_before) VALUES (?, ?) "
+                    "ON CONFLICT(table_name) DO UPDATE SET archived_before = "
+                    "MAX(archived_before, excluded.archived_before)",
+                    (table, cutoff),
+                )
+            logger.info("Archived %d rows from %s", moved[table], table)
+    finally:
+        con.close()
+    return moved
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from services import change_feed, log_service
+
+    parser = argparse.ArgumentParser(description="Archive old inventory and activity logs.")
+    parser.add_argument("--db", default=log_service.DB_PATH, help="main database file")
+    parser.add_argument(
+        "--days", type=int, default=ARCHIVE_AFTER_DAYS, help="archive rows older than this"
+    )
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+    before = datetime.utcnow() - timedelta(days=args.days)
+    moved = archive_logs(args.db, before=before, batch_size=args.batch_size)
+    for table, count in moved.items():
+        print(f"{table}: {count} rows archived")
+    try:
+        pruned = change_feed.prune_change_log(args.db)
+    except sqlite3.OperationalError:
+        return
+    print(f"change_log: {pruned} rows pruned")
+
+
+__all__ = [
+    "ARCHIVE_AFTER_DAYS",
+    "BATCH_SIZE",
+    "archive_logs",
+    "archive_boundary",
+    "archive_path_for",
+    "attach_archive",
+    "needs_archive",
+    "union_source",
+]
+
+
+if __name__ == "__main__":
+    main()
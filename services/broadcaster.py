@@ -0,0 +1,69 @@
+"""In-process fan-out of log events to connected browsers.
+
+Writers call :meth:`Broadcaster.publish` from any thread once their rows are
+committed. Each subscriber owns a bounded ``asyncio.Queue`` on its event
+loop; when a slow client falls behind, its oldest events are dropped rather
+than letting the queue grow or blocking the writer.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per client before the oldest ones are dropped.
+QUEUE_SIZE = 100
+
+Message = Tuple[str, Dict[str, Any]]
+
+
+class Broadcaster:
+    """Deliver published events to every subscribed queue."""
+
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        """Return a new queue receiving ``(event, data)`` tuples.
+
+        Must be called from the event loop that will read the queue.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop delivering events to ``queue``."""
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s[1] is not queue]
+
+    def subscriber_count(self) -> int:
+        """Return the number of connected subscribers."""
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        """Queue ``data`` under ``event`` for every subscriber; safe from any thread."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, (event, data))
+            except RuntimeError:  # loop already closed
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: Message) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+
+broadcaster = Broadcaster()
+
+__all__ = ["Broadcaster", "broadcaster", "QUEUE_SIZE"]
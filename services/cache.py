@@ -0,0 +1,229 @@
+"""Write-invalidated caches for computed page data.
+
+Every committed ORM write bumps an in-process version counter for the
+tables it touched; writers outside the ORM call :func:`bump` themselves.
+Writes from other processes are seen through the ``table_versions`` table,
+which triggers keep current (see ``db/migrations/013_table_versions.sql``).
+
+A :class:`SnapshotCache` entry stays valid while the versions of the tables
+it depends on are unchanged and it is younger than the cache's TTL. The TTL
+bounds staleness for changes the versions cannot see, such as writes by
+other processes to a database without ``table_versions`` or to files.
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+import models
+
+_versions: Dict[str, int] = {}
+_lock = threading.Lock()
+
+# Session.info key collecting tables written in the current transaction.
+_DIRTY_TABLES = "dirty_tables"
+
+
+def bump(*tables: str) -> None:
+    """Mark ``tables`` as changed."""
+    with _lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+
+class TableVersions:
+    """Read ``table_versions`` only when another connection has committed.
+
+    A dedicated read-only connection checks ``PRAGMA data_version``, which
+    changes whenever any other connection commits to the database file; the
+    version rows are re-read only then.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._con: Optional[sqlite3.Connection] = None
+        self._path: Optional[str] = None
+        self._data_version: Optional[int] = None
+        self._rows: Dict[str, Tuple[int, Optional[str]]] = {}
+
+    @staticmethod
+    def _db_path() -> Optional[str]:
+        url = models.engine.url
+        if url.drivername != "sqlite" or url.database in (None, "", ":memory:"):
+            return None
+        return url.database
+
+    def snapshot(self) -> Dict[str, Tuple[int, Optional[str]]]:
+        """Return ``{table: (version, updated_at)}``; empty without the table."""
+        path = self._db_path()
+        if path is None:
+            return {}
+        with self._lock:
+            if path != self._path:
+                self.close()
+                self._con = sqlite3.connect(path, check_same_thread=False)
+                self._path = path
+            try:
+                data_version = self._con.execute("PRAGMA data_version").fetchone()[0]
+                if data_version != self._data_version:
+                    self._rows = {
+                        name: (version, updated_at)
+                        for name, version, updated_at in self._con.execute(
+                            "SELECT table_name, version, updated_at FROM table_versions"
+                        )
+                    }
+                    self._data_version = data_version
+            except sqlite3.OperationalError:
+                self._rows = {}
+            return self._rows
+
+    def close(self) -> None:
+        if self._con is not None:
+            self._con.close()
+        self._con = None
+        self._path = None
+        self._data_version = None
+        self._rows = {}
+
+
+table_versions = TableVersions()
+
+
+def versions(tables: Iterable[str]) -> Tuple[Tuple[int, int], ...]:
+    """Return ``(local, shared)`` version pairs for each table in ``tables``."""
+    shared = table_versions.snapshot()
+    with _lock:
+        return tuple(
+            (_versions.get(table, 0), shared.get(table, (0, None))[0]) for table in tables
+        )
+
+
+def last_modified(tables: Iterable[str]) -> Optional[str]:
+    """Return the latest ``updated_at`` recorded for ``tables``, if known."""
+    shared = table_versions.snapshot()
+    stamps = [shared[t][1] for t in tables if t in shared and shared[t][1]]
+    return max(stamps) if stamps else None
+
+
+def _dirty(session: Session) -> Set[str]:
+    return session.info.setdefault(_DIRTY_TABLES, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            _dirty(session).add(table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_tables(state: ORMExecuteState) -> None:
+    # Bulk ``query(...).update()/delete()`` bypasses the flush.
+    if (state.is_update or state.is_delete) and state.bind_mapper is not None:
+        _dirty(state.session).add(state.bind_mapper.local_table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session: Session) -> None:
+    tables = session.info.pop(_DIRTY_TABLES, None)
+    if tables:
+        bump(*tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session: Session) -> None:
+    session.info.pop(_DIRTY_TABLES, None)
+
+
+def approx_size(value: Any) -> int:
+    """Estimate the memory held by ``value`` and the containers inside it."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)) or hasattr(value, "_mapping"):
+        # ``_mapping`` marks SQLAlchemy ``Row`` tuples.
+        size += sum(approx_size(item) for item in value)
+    return size
+
+
+class SnapshotCache:
+    """Cache values computed from ``tables`` until one of them changes.
+
+    With ``max_entries`` or ``max_bytes`` the least recently used entries are
+    dropped once the cache holds more keys, or more data as estimated by
+    :func:`approx_size`, than allowed.
+    """
+
+    def __init__(
+        self,
+        tables: Iterable[str],
+        ttl: float,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.tables = tuple(tables)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[Any, ...], float, Any]]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated size of the cached values when ``max_bytes`` is set."""
+        return self._bytes
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key, _ = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(key, 0)
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key`` or compute it with ``loader``."""
+        current = versions(self.tables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == current and now - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                return entry[2]
+        value = loader()
+        size = approx_size(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._bytes += size - self._sizes.pop(key, 0)
+            self._entries[key] = (current, now, value)
+            self._entries.move_to_end(key)
+            if size:
+                self._sizes[key] = size
+            self._evict()
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached value."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+
+__all__ = [
+    "SnapshotCache",
+    "TableVersions",
+    "approx_size",
+    "bump",
+    "last_modified",
+    "table_versions",
+    "versions",
+]
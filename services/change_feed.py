@@ -0,0 +1,190 @@
+"""Read the ``change_log`` table filled by inventory table triggers.
+
+Consumers keep the ``seq`` of the last change they saw and ask for the
+changes after it. Several changes to one row since the cursor collapse into
+a single entry carrying the row's current data, or a delete marker when the
+row no longer exists.
+
+Changes older than :data:`RETENTION_DAYS` are pruned by
+:func:`prune_change_log`, which the archive job runs; consumers whose cursor
+falls behind the pruned range get :class:`CursorExpired` and must take a
+full export again.
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from models import Base, data_columns
+
+DB_PATH = "data/envanter.db"
+
+# Tables whose changes are recorded (see db/migrations/010_change_log.sql).
+TRACKED_TABLES = (
+    "hardware_inventory",
+    "printer_inventory",
+    "license_inventory",
+    "accessory_inventory",
+    "stock_tracking",
+    "license",
+)
+
+# Model of each table, for the data columns reported with a change.
+_MODELS = {mapper.class_.__tablename__: mapper.class_ for mapper in Base.registry.mappers}
+
+# Upper bound for one page of changes.
+MAX_LIMIT = 1000
+
+# Raw change_log rows read per page, as a multiple of the page size; bounds
+# the work for a page whose rows were mostly superseded by later changes.
+SCAN_FACTOR = 10
+
+# Days changes are kept for consumers to catch up.
+RETENTION_DAYS = int(os.getenv("CHANGE_LOG_RETENTION_DAYS", "30"))
+
+# Rows deleted per transaction when pruning.
+PRUNE_BATCH_SIZE = 5000
+
+
+class CursorExpired(Exception):
+    """The requested cursor points before the oldest retained change."""
+
+
+def latest_seq() -> int:
+    """Return the sequence number of the newest recorded change."""
+    with sqlite3.connect(DB_PATH) as con:
+        return con.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+
+
+def _pruned_through(con: sqlite3.Connection) -> int:
+    """Return the newest ``seq`` removed by pruning (0 if none was)."""
+    oldest = con.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+    if oldest is not None:
+        # AUTOINCREMENT numbers are contiguous and pruning removes a prefix.
+        return oldest - 1
+    try:
+        row = con.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'change_log'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] if row else 0
+
+
+def get_changes(since: int, limit: int = 500) -> Dict[str, Any]:
+    """Return changes with ``seq > since`` ordered by their latest change.
+
+    The result holds ``changes``, the ``next`` cursor and ``has_more``.
+    Raises ``sqlite3.OperationalError`` when the change log is missing and
+    :class:`CursorExpired` when changes after ``since`` were pruned.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    with sqlite3.connect(DB_PATH) as con:
+        con.row_factory = sqlite3.Row
+        if since < _pruned_through(con):
+            raise CursorExpired(since)
+        # Walk the seq range in order and keep each row's latest change; a
+        # change superseded later is skipped (the later one is reported).
+        # Both steps use indexes, so a page reads at most SCAN_FACTOR * limit
+        # rows however large the backlog is.
+        window = con.execute(
+            "SELECT c.seq, c.table_name, c.row_id, c.op, c.changed_at, "
+            "NOT EXISTS (SELECT 1 FROM change_log l WHERE l.table_name = c.table_name "
+            "AND l.row_id = c.row_id AND l.seq > c.seq) AS is_latest "
+            "FROM change_log c WHERE c.seq > ? ORDER BY c.seq LIMIT ?",
+            (since, limit * SCAN_FACTOR),
+        ).fetchall()
+        latest = []
+        cursor = since
+        has_more = len(window) == limit * SCAN_FACTOR
+        for row in window:
+            if len(latest) == limit:
+                has_more = True
+                break
+            cursor = row["seq"]
+            if row["is_latest"]:
+                latest.append(row)
+
+        ids_by_table: Dict[str, List[int]] = {}
+        for row in latest:
+            if row["op"] != "D":
+                ids_by_table.setdefault(row["table_name"], []).append(row["row_id"])
+        current: Dict[tuple, Dict[str, Any]] = {}
+        for table, ids in ids_by_table.items():
+            marks = ", ".join("?" * len(ids))
+            names = ", ".join(col.name for col in data_columns(_MODELS[table]))
+            for data in con.execute(
+                f"SELECT {names} FROM {table} WHERE id IN ({marks})", ids
+            ):
+                current[(table, data["id"])] = dict(data)
+
+    changes = []
+    for row in latest:
+        data: Optional[Dict[str, Any]] = current.get((row["table_name"], row["row_id"]))
+        change = {
+            "seq": row["seq"],
+            "table": row["table_name"],
+            "id": row["row_id"],
+            "op": "upsert" if data is not None else "delete",
+            "changed_at": row["changed_at"],
+        }
+        if data is not None:
+            change["data"] = data
+        changes.append(change)
+    return {
+        "changes": changes,
+        "next": cursor,
+        "has_more": has_more,
+    }
+
+
+def prune_change_log(
+    db_path: Optional[str] = None,
+    before: Optional[datetime] = None,
+    batch_size: int = PRUNE_BATCH_SIZE,
+) -> int:
+    """Delete changes recorded before ``before``; return how many were removed.
+
+    ``before`` defaults to ``RETENTION_DAYS`` days ago. Only the oldest
+    contiguous run of changes is removed, walking ``seq`` in batches.
+    """
+    if before is None:
+        before = datetime.utcnow() - timedelta(days=RETENTION_DAYS)
+    cutoff = before.strftime("%Y-%m-%d %H:%M:%S")
+    removed = 0
+    con = sqlite3.connect(db_path or DB_PATH)
+    try:
+        while True:
+            with con:
+                rows = con.execute(
+                    "SELECT seq, changed_at FROM change_log ORDER BY seq LIMIT ?",
+                    (batch_size,),
+                ).fetchall()
+                last = None
+                for seq, changed_at in rows:
+                    if changed_at is None or changed_at >= cutoff:
+                        break
+                    last = seq
+                if last is None:
+                    break
+                removed += con.execute(
+                    "DELETE FROM change_log WHERE seq <= ?", (last,)
+                ).rowcount
+            if last != rows[-1][0]:
+                break
+    finally:
+        con.close()
+    return removed
+
+
+__all__ = [
+    "DB_PATH",
+    "TRACKED_TABLES",
+    "MAX_LIMIT",
+    "RETENTION_DAYS",
+    "CursorExpired",
+    "get_changes",
+    "latest_seq",
+    "prune_change_log",
+]
@@ -0,0 +1,77 @@
+"""Distinct column values with row counts for the list page filters.
+
+Counts are scoped to the filters active on the page: every exact filter on
+another column and the free text search apply, while filters on the faceted
+column itself are ignored so its other values stay selectable. Results are
+cached per (table, column, filter set) until the table changes.
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from services.cache import SnapshotCache
+from services.search_text import search_condition
+
+# Maximum age in seconds of a cached facet list.
+FACET_TTL = 300.0
+
+# Cached filter combinations kept per table.
+MAX_ENTRIES = 256
+
+_caches: Dict[str, SnapshotCache] = {}
+
+
+def _cache_for(table: str) -> SnapshotCache:
+    cache = _caches.get(table)
+    if cache is None:
+        cache = _caches.setdefault(table, SnapshotCache((table,), FACET_TTL, MAX_ENTRIES))
+    return cache
+
+
+def column_facets(
+    db: Session,
+    model,
+    column: str,
+    filters: Iterable[Tuple[str, str]] = (),
+    q: str = "",
+) -> List[Tuple[Any, int]]:
+    """Return ``(value, count)`` for each non-null value of ``model.column``.
+
+    ``filters`` holds the page's ``(field, value)`` pairs; pairs naming
+    unknown columns or ``column`` itself are skipped. Raises ``KeyError``
+    for an unknown ``column``.
+    """
+    columns = model.__table__.columns
+    target = columns[column]
+    applied = tuple(
+        sorted(
+            {
+                (field, value)
+                for field, value in filters
+                if field in columns and field != column and value
+            }
+        )
+    )
+
+    def load() -> List[Tuple[Any, int]]:
+        query = db.query(target, func.count()).filter(target.isnot(None))
+        for field, value in applied:
+            query = query.filter(columns[field] == value)
+        if q:
+            query = query.filter(search_condition(model, q))
+        rows = query.group_by(target).order_by(target).all()
+        return [(value, count) for value, count in rows]
+
+    key = (db.get_bind(), column, applied, q)
+    return _cache_for(model.__tablename__).get(key, load)
+
+
+def clear_facets() -> None:
+    """Drop every cached facet list."""
+    for cache in list(_caches.values()):
+        cache.clear()
+
+
+__all__ = ["FACET_TTL", "MAX_ENTRIES", "clear_facets", "column_facets"]
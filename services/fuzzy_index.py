@@ -0,0 +1,306 @@
+"""In-memory trigram index for typo-tolerant device lookups.
+
+Serial numbers, host and computer names are split into trigrams of their
+normalized form (see :func:`services.search_text.normalize_tr`); a query is
+scored against every indexed value sharing a trigram with it by Jaccard
+similarity of the trigram sets.
+
+The index is built in the background at startup (:func:`build_fuzzy_index`),
+or by the first search if that has not finished, and kept current by
+committed ORM writes. Writes by other processes are picked up through
+``table_versions``: a change in a table's shared version the index did not
+see reloads that table.
+"""
+
+import heapq
+import logging
+import math
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import ORMExecuteState, Session
+
+import models
+from models import HardwareInventory, LicenseInventory, PrinterInventory
+from services.cache import table_versions
+from services.search_text import normalize_tr
+
+logger = logging.getLogger(__name__)
+
+# Indexed fields per inventory type; the first field labels a hit.
+FUZZY_FIELDS = {
+    "hardware": (HardwareInventory, ("no", "bilgisayar_adi", "seri_no")),
+    "printer": (PrinterInventory, ("envanter_no", "hostname")),
+    "license": (LicenseInventory, ("envanter_no", "yazilim_adi")),
+}
+
+# Hits scoring below this Jaccard similarity are dropped.
+MIN_SCORE = 0.2
+
+# Trigrams found in more than this share of the indexed values, and in at
+# least COMMON_GRAM_MIN of them, are not used to find candidates (they still
+# count towards scores).
+COMMON_GRAM_SHARE = 0.05
+COMMON_GRAM_MIN = 1000
+
+# Session.info keys collecting indexed objects written in the transaction
+# and types changed by bulk statements.
+_PENDING = "fuzzy_index_pending"
+_RELOAD = "fuzzy_index_reload"
+
+DocKey = Tuple[str, int]
+FieldKey = Tuple[str, int, str]
+
+
+def trigrams(value: str) -> FrozenSet[str]:
+    """Return the trigrams of ``value`` padded like PostgreSQL's pg_trgm."""
+    text = normalize_tr(value)
+    if not text:
+        return frozenset()
+    padded = f"  {text} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """Trigram postings over the fields listed in :data:`FUZZY_FIELDS`."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[FieldKey]] = {}
+        self._fields: Dict[FieldKey, Tuple[str, FrozenSet[str]]] = {}
+        self._labels: Dict[DocKey, Optional[str]] = {}
+        self._bind = None
+        self._seen: Dict[str, int] = {}
+
+    def _remove(self, doc: DocKey) -> None:
+        self._labels.pop(doc, None)
+        for field in FUZZY_FIELDS[doc[0]][1]:
+            entry = self._fields.pop((*doc, field), None)
+            if entry is None:
+                continue
+            for gram in entry[1]:
+                keys = self._postings.get(gram)
+                if keys is not None:
+                    keys.discard((*doc, field))
+                    if not keys:
+                        del self._postings[gram]
+
+    def _add(self, doc: DocKey, values: Dict[str, Any]) -> None:
+        fields = FUZZY_FIELDS[doc[0]][1]
+        self._labels[doc] = values.get(fields[0])
+        for field in fields:
+            value = values.get(field)
+            grams = trigrams(value) if value else frozenset()
+            if not grams:
+                continue
+            self._fields[(*doc, field)] = (str(value), grams)
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add((*doc, field))
+
+    def update(self, kind: str, item_id: int, values: Optional[Dict[str, Any]]) -> None:
+        """Replace the indexed fields of one row; ``values=None`` removes it."""
+        with self._lock:
+            self._remove((kind, item_id))
+            if values is not None:
+                self._add((kind, item_id), values)
+
+    def _load(self, db: Session, kind: str) -> None:
+        model, fields = FUZZY_FIELDS[kind]
+        for doc in [d for d in self._labels if d[0] == kind]:
+            self._remove(doc)
+        columns = [getattr(model, f) for f in fields]
+        for row in db.query(model.id, *columns):
+            self._add((kind, row[0]), dict(zip(fields, row[1:])))
+
+    @staticmethod
+    def _shared_versions() -> Dict[str, int]:
+        shared = table_versions.snapshot()
+        return {
+            kind: shared.get(model.__tablename__, (0, None))[0]
+            for kind, (model, _) in FUZZY_FIELDS.items()
+        }
+
+    def rebuild(self, db: Session) -> None:
+        """Load the whole index from ``db`` and swap it in at once.
+
+        Searches keep using the current index while the new one loads.
+        Writes committed meanwhile are reloaded by the next search, as the
+        versions recorded are those from before loading.
+        """
+        shared = self._shared_versions()
+        fresh = TrigramIndex()
+        for kind in FUZZY_FIELDS:
+            fresh._load(db, kind)
+        with self._lock:
+            self._postings = fresh._postings
+            self._fields = fresh._fields
+            self._labels = fresh._labels
+            self._bind = db.get_bind()
+            self._seen = shared
+
+    def ensure_current(self, db: Session) -> None:
+        """Build the index, or reload tables changed by other processes."""
+        if db.get_bind() is not self._bind:
+            self.rebuild(db)
+            return
+        shared = self._shared_versions()
+        with self._lock:
+            for kind, version in shared.items():
+                if self._seen.get(kind) != version:
+                    self._load(db, kind)
+            self._seen = shared
+
+    def apply_committed(
+        self,
+        session: Session,
+        rows: Iterable[Tuple[str, int, Optional[Dict[str, Any]]]],
+        reload: Iterable[str] = (),
+    ) -> None:
+        """Apply rows committed by ``session`` if it writes the indexed database.
+
+        Types in ``reload`` were changed by bulk statements and are reloaded
+        on the next search.
+        """
+        with self._lock:
+            if self._bind is None or session.bind is not self._bind:
+                return
+            for kind, item_id, values in rows:
+                self.update(kind, item_id, values)
+            # Our own commit moved the shared versions; don't reload for it.
+            self._seen = self._shared_versions()
+            for kind in reload:
+                self._seen.pop(kind, None)
+
+    def clear(self) -> None:
+        """Drop the index; the next search rebuilds it."""
+        with self._lock:
+            self._postings.clear()
+            self._fields.clear()
+            self._labels.clear()
+            self._bind = None
+            self._seen = {}
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        limit: int = 20,
+        kinds: Optional[Iterable[str]] = None,
+        min_score: float = MIN_SCORE,
+    ) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` rows whose fields best resemble ``query``.
+
+        Each hit holds the ``type``, ``id`` and label (``no``) of the row and
+        the best matching ``field``, its ``value`` and the ``score``.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+        allowed = set(FUZZY_FIELDS) if kinds is None else set(kinds)
+        self.ensure_current(db)
+        with self._lock:
+            # A hit scoring at least ``min_score`` shares that share of the
+            # query's trigrams, so it shares one of the rarest
+            # ``len(grams) - needed + 1``. Of those, trigrams found in more
+            # than COMMON_GRAM_SHARE of the values (like "pc-") are skipped
+            # unless nothing rarer is left; they would make every value a
+            # candidate while adding little to its score.
+            needed = max(1, math.ceil(min_score * len(grams)))
+            rarest = sorted(grams, key=lambda g: len(self._postings.get(g, ())))
+            rarest = rarest[: len(grams) - needed + 1]
+            common_size = max(COMMON_GRAM_MIN, COMMON_GRAM_SHARE * len(self._fields))
+            probe = [g for g in rarest if len(self._postings.get(g, ())) <= common_size]
+            candidates: Set[FieldKey] = set()
+            for gram in probe or rarest[:1]:
+                candidates.update(
+                    key for key in self._postings.get(gram, ()) if key[0] in allowed
+                )
+            best: Dict[DocKey, Tuple[float, str]] = {}
+            for key in candidates:
+                field_grams = self._fields[key][1]
+                common = len(grams & field_grams)
+                score = common / (len(grams) + len(field_grams) - common)
+                doc = key[:2]
+                if score >= min_score and score > best.get(doc, (0.0, ""))[0]:
+                    best[doc] = (score, key[2])
+            top = heapq.nlargest(limit, best.items(), key=lambda item: item[1][0])
+            return [
+                {
+                    "type": doc[0],
+                    "id": doc[1],
+                    "no": self._labels.get(doc),
+                    "field": field,
+                    "value": self._fields[(*doc, field)][0],
+                    "score": round(score, 3),
+                }
+                for doc, (score, field) in top
+            ]
+
+
+fuzzy_index = TrigramIndex()
+
+
+def build_fuzzy_index() -> None:
+    """Build :data:`fuzzy_index` from the application database."""
+    db = models.SessionLocal()
+    try:
+        fuzzy_index.rebuild(db)
+    except OperationalError:
+        logger.warning("Inventory tables are missing; skipping the fuzzy index")
+    finally:
+        db.close()
+
+
+_KIND_BY_MODEL = {model: kind for kind, (model, _) in FUZZY_FIELDS.items()}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_indexed_rows(session: Session, flush_context) -> None:
+    pending = session.info.setdefault(_PENDING, {})
+    for obj in (*session.new, *session.dirty):
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind is not None:
+            fields = FUZZY_FIELDS[kind][1]
+            pending[(kind, obj.id)] = {f: getattr(obj, f) for f in fields}
+    for obj in session.deleted:
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind is not None:
+            pending[(kind, obj.id)] = None
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_kinds(state: ORMExecuteState) -> None:
+    if (state.is_update or state.is_delete) and state.bind_mapper is not None:
+        kind = _KIND_BY_MODEL.get(state.bind_mapper.class_)
+        if kind is not None:
+            state.session.info.setdefault(_RELOAD, set()).add(kind)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_indexed_rows(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    reload = session.info.pop(_RELOAD, None)
+    if pending or reload:
+        fuzzy_index.apply_committed(
+            session,
+            [(kind, item_id, values) for (kind, item_id), values in (pending or {}).items()],
+            reload or (),
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_indexed_rows(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+    session.info.pop(_RELOAD, None)
+
+
+__all__ = [
+    "FUZZY_FIELDS",
+    "MIN_SCORE",
+    "TrigramIndex",
+    "build_fuzzy_index",
+    "fuzzy_index",
+    "trigrams",
+]
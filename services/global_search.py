@@ -0,0 +1,122 @@
+"""Full text search across every inventory table in one query.
+
+``search_index`` is an FTS5 table holding a title and body per record of
+the inventory tables, licenses and requests, kept current by triggers (see
+``db/migrations/014_search_index.sql``). Its rowid encodes the source row
+as ``id * 8 + kind``, so a single ranked query returns hits of every type
+and per-type counts without touching the source tables.
+
+Databases created without the migrations have no index; searching them
+raises ``sqlalchemy.exc.OperationalError``.
+"""
+
+import html
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+from sqlalchemy.orm import Session
+
+from services.search_text import normalize_tr
+
+# Kind code in ``rowid % 8`` -> (result type, link for a hit).
+KINDS = {
+    1: ("hardware", "/inventory?q={title}"),
+    2: ("printer", "/printer?q={title}"),
+    3: ("license", "/license?q={title}"),
+    4: ("accessory", "/accessories?q={title}"),
+    5: ("stock", "/stock?q={title}"),
+    6: ("license_record", "/licenses/{id}"),
+    7: ("request", "/requests?q={title}"),
+}
+TYPES = {name: code for code, (name, _) in KINDS.items()}
+
+_TOKEN = re.compile(r"\w+")
+
+_SEARCH_SQL = """
+WITH hits AS (
+    SELECT rowid AS doc, title,
+           snippet(search_index, 1, '', '', '…', 12) AS snippet,
+           -- Title matches weigh four times body matches.
+           bm25(search_index, 4.0, 1.0, 1.0) AS score
+    FROM search_index
+    WHERE search_index MATCH ? {kinds}
+), ranked AS (
+    SELECT *,
+           ROW_NUMBER() OVER (PARTITION BY doc % 8 ORDER BY score, doc) AS pos,
+           COUNT(*) OVER (PARTITION BY doc % 8) AS total
+    FROM hits
+)
+SELECT doc, title, snippet, score, total FROM ranked
+WHERE pos <= ?
+ORDER BY doc % 8, pos
+"""
+
+
+def _tokens(query: str) -> List[str]:
+    return _TOKEN.findall(normalize_tr(query))
+
+
+def match_expression(query: str) -> str:
+    """Return the FTS5 query matching every word of ``query`` as a prefix."""
+    return " ".join(f'"{token}"*' for token in _tokens(query))
+
+
+def _highlight(snippet: Optional[str], tokens: List[str]) -> str:
+    """Escape ``snippet`` and wrap words starting with a query token in ``<mark>``.
+
+    Done here rather than by ``snippet()`` so words matched only through the
+    folded column (``Çağrı`` for ``cagri``) are marked too.
+    """
+    parts = []
+    for piece in re.split(r"(\w+)", snippet or ""):
+        escaped = html.escape(piece)
+        if piece and normalize_tr(piece).startswith(tuple(tokens)):
+            escaped = f"<mark>{escaped}</mark>"
+        parts.append(escaped)
+    return "".join(parts)
+
+
+def global_search(
+    db: Session, query: str, per_type: int = 5, types: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Return the best ``per_type`` hits of each record type for ``query``.
+
+    Groups are returned in :data:`KINDS` order and hold the ``type``, the
+    total ``count`` of matching records and the ``hits``, best first. Each
+    hit has the record ``id``, its ``title``, a ``snippet`` of the body with
+    matches wrapped in ``<mark>``, the bm25 ``score`` (lower is better) and
+    a ``url`` for it. ``types`` restricts the result to those type names.
+    """
+    tokens = _tokens(query)
+    match = match_expression(query)
+    groups: Dict[int, Dict[str, Any]] = {}
+    if match:
+        codes = [TYPES[t] for t in types or () if t in TYPES]
+        kinds = f"AND rowid % 8 IN ({', '.join(map(str, codes))})" if codes else ""
+        rows = db.connection().exec_driver_sql(
+            _SEARCH_SQL.format(kinds=kinds),
+            (match, per_type),
+        ).all()
+        for doc, title, snippet, score, total in rows:
+            code, item_id = doc % 8, doc // 8
+            name, url = KINDS[code]
+            group = groups.setdefault(code, {"type": name, "count": total, "hits": []})
+            group["hits"].append(
+                {
+                    "id": item_id,
+                    "title": title,
+                    "snippet": _highlight(snippet, tokens),
+                    "score": round(score, 4),
+                    "url": url.format(id=item_id, title=quote(title or "")),
+                }
+            )
+    ordered = [groups[code] for code in sorted(groups)]
+    return {
+        "query": query,
+        "total": sum(g["count"] for g in ordered),
+        "groups": ordered,
+    }
+
+
+__all__ = ["KINDS", "TYPES", "global_search", "match_expression"]
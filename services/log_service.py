@@ -1,41 +1,214 @@
+import base64
+import json
 import sqlite3
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Dict, Any, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
 
 from logs import InventoryLogCreate
+from services.archive_service import needs_archive, union_source
+from services.broadcaster import broadcaster
+from services.cache import bump
 
 DB_PATH = "data/envanter.db"
 
+# Rows per executemany/IN (...) chunk, well below SQLite's variable limit.
+BATCH_CHUNK_SIZE = 500
+
+# Table and column holding the inventory number for each inventory type.
+INVENTORY_NO_COLUMNS = {
+    "pc": ("hardware_inventory", "no"),
+    "license": ("license_inventory", "envanter_no"),
+    # Support accessory and stock inventories as well.
+    "accessory": ("accessory_inventory", "ifs_no"),
+    "stock": ("stock_tracking", "id"),
+}
+
 
 def _row_to_dict(cursor, row):
     return {desc[0]: row[idx] for idx, desc in enumerate(cursor.description)}
 
 
-def add_inventory_log(payload: InventoryLogCreate) -> int:
-    q = """
+_INSERT_LOG = """
     INSERT INTO inventory_logs
     (inventory_type, inventory_id, old_user_id, new_user_id, old_location, new_location, old_inventory_no, new_inventory_no, action, note, changed_by)
     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
+
+
+def _log_params(payload: InventoryLogCreate) -> tuple:
+    return (
+        payload.inventory_type,
+        payload.inventory_id,
+        payload.old_user_id,
+        payload.new_user_id,
+        payload.old_location,
+        payload.new_location,
+        payload.old_inventory_no,
+        payload.new_inventory_no,
+        payload.action,
+        payload.note,
+        payload.changed_by,
+    )
+
+
+# Session.info key holding log rows staged in the session's transaction.
+_PENDING_EVENTS = "pending_inventory_log_events"
+
+
+def _log_events(payloads: List[InventoryLogCreate]) -> List[Dict[str, Any]]:
+    """Return ``payloads`` as the records page shows them.
+
+    Events carry the server's ``change_date`` and the display names of the
+    users and locations, resolved with the same lookups as the rows' cached
+    name columns (see ``db/migrations/005_inventory_log_names.sql``).
+    """
+    stamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    user_ids = sorted(
+        {
+            uid
+            for p in payloads
+            for uid in (p.old_user_id, p.new_user_id, p.changed_by)
+            if uid is not None
+        }
+    )
+    location_ids = sorted(
+        {
+            str(loc)
+            for p in payloads
+            for loc in (p.old_location, p.new_location)
+            if loc is not None
+        }
+    )
+    users: Dict[int, str] = {}
+    locations: Dict[str, str] = {}
+    try:
+        with sqlite3.connect(DB_PATH) as con:
+            if user_ids:
+                users = dict(
+                    con.execute(
+                        "SELECT id, COALESCE(TRIM(first_name || ' ' || last_name), username) "
+                        f"FROM users WHERE id IN ({','.join('?' * len(user_ids))})",
+                        user_ids,
+                    )
+                )
+            if location_ids:
+                locations = {
+                    str(loc_id): name
+                    for loc_id, name in con.execute(
+                        "SELECT id, name FROM lookup_items "
+                        f"WHERE id IN ({','.join('?' * len(location_ids))})",
+                        location_ids,
+                    )
+                }
+    except sqlite3.OperationalError:
+        pass
+    events = []
+    for p in payloads:
+        data = p.model_dump(mode="json")
+        data.update(
+            change_date=stamp,
+            old_user_name=users.get(p.old_user_id),
+            new_user_name=users.get(p.new_user_id),
+            changed_by_name=users.get(p.changed_by),
+            old_location=locations.get(str(p.old_location), p.old_location),
+            new_location=locations.get(str(p.new_location), p.new_location),
+        )
+        events.append(data)
+    return events
+
+
+def _publish_logs(payloads: Iterable[InventoryLogCreate]) -> None:
+    """Push committed log rows to live feed subscribers."""
+    payloads = list(payloads)
+    if not payloads:
+        return
+    bump("inventory_logs")
+    if not broadcaster.subscriber_count():
+        return
+    for data in _log_events(payloads):
+        broadcaster.publish("inventory_log", data)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_logs(session: Session) -> None:
+    _publish_logs(session.info.pop(_PENDING_EVENTS, []))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_logs(session: Session) -> None:
+    session.info.pop(_PENDING_EVENTS, None)
+
+
+def add_inventory_log(payload: InventoryLogCreate) -> int:
     with sqlite3.connect(DB_PATH) as con:
         cur = con.cursor()
-        cur.execute(
-            q,
-            (
-                payload.inventory_type,
-                payload.inventory_id,
-                payload.old_user_id,
-                payload.new_user_id,
-                payload.old_location,
-                payload.new_location,
-                payload.old_inventory_no,
-                payload.new_inventory_no,
-                payload.action,
-                payload.note,
-                payload.changed_by,
-            ),
-        )
+        cur.execute(_INSERT_LOG, _log_params(payload))
+        con.commit()
+        log_id = cur.lastrowid
+    _publish_logs([payload])
+    return log_id
+
+
+def stage_inventory_logs(con, payloads: Iterable[InventoryLogCreate]) -> None:
+    """Insert log rows inside the caller's open transaction.
+
+    ``con`` may be a SQLAlchemy ``Session``, a SQLAlchemy ``Connection`` or a
+    ``sqlite3.Connection``. Nothing is committed here, so the rows become
+    visible together with the inventory change that produced them. Rows
+    staged through a ``Session`` reach the live feed once it commits.
+    """
+    payloads = list(payloads)
+    rows = [_log_params(p) for p in payloads]
+    if not rows:
+        return
+    if isinstance(con, Session):
+        con.info.setdefault(_PENDING_EVENTS, []).extend(payloads)
+        con = con.connection()
+    if isinstance(con, Connection):
+        con.exec_driver_sql(_INSERT_LOG, rows)
+    else:
+        con.executemany(_INSERT_LOG, rows)
+
+
+def stage_inventory_log(con, payload: InventoryLogCreate) -> None:
+    """Insert a single log row inside the caller's open transaction."""
+    stage_inventory_logs(con, [payload])
+
+
+def add_inventory_logs(
+    payloads: List[InventoryLogCreate], chunk_size: int = BATCH_CHUNK_SIZE
+) -> int:
+    """Insert many log rows in one transaction and return how many were added.
+
+    Missing inventory numbers are resolved with one query per inventory type
+    (per chunk of ids) instead of one lookup per event. Relabel events keep
+    the numbers they were given.
+    """
+    with sqlite3.connect(DB_PATH) as con:
+        missing: Dict[str, set] = {}
+        for p in payloads:
+            if p.action != "relabel" and p.new_inventory_no is None:
+                missing.setdefault(p.inventory_type, set()).add(p.inventory_id)
+        numbers = {
+            inv_type: get_inventory_nos(con, inv_type, ids)
+            for inv_type, ids in missing.items()
+        }
+        rows = []
+        for p in payloads:
+            if p.action != "relabel" and p.new_inventory_no is None:
+                inv_no = numbers[p.inventory_type].get(p.inventory_id)
+                if inv_no is not None:
+                    p = p.model_copy(update={"new_inventory_no": str(inv_no)})
+            rows.append(p)
+        for start in range(0, len(rows), chunk_size):
+            stage_inventory_logs(con, rows[start:start + chunk_size])
         con.commit()
-        return cur.lastrowid
+    _publish_logs(rows)
+    return len(rows)
 
 
 def get_inventory_logs(
@@ -44,38 +217,18 @@ def get_inventory_logs(
     user_id: Optional[int] = None,
     limit: int = 200,
     offset: int = 0,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
-    # Base queries: one using inventory number columns (for newer schemas)
-    # and a fallback without them for backwards compatibility.
-    base_with_inv = (
-        "SELECT il.*, "
-        "COALESCE(il.new_inventory_no, il.old_inventory_no) AS inventory_no, "
-        "COALESCE(TRIM(uo.first_name || ' ' || uo.last_name), uo.username) AS old_user_name, "
-        "COALESCE(TRIM(un.first_name || ' ' || un.last_name), un.username) AS new_user_name, "
-        "COALESCE(TRIM(uc.first_name || ' ' || uc.last_name), uc.username) AS changed_by_name, "
-        "COALESCE(olo.name, il.old_location) AS old_location, "
-        "COALESCE(nlo.name, il.new_location) AS new_location "
-        "FROM inventory_logs il "
-        "LEFT JOIN users uo ON il.old_user_id = uo.id "
-        "LEFT JOIN users un ON il.new_user_id = un.id "
-        "LEFT JOIN users uc ON il.changed_by = uc.id "
-        "LEFT JOIN lookup_items olo ON CAST(il.old_location AS INTEGER) = olo.id "
-        "LEFT JOIN lookup_items nlo ON CAST(il.new_location AS INTEGER) = nlo.id"
-    )
-    base_legacy = (
-        "SELECT il.*, "
-        "COALESCE(TRIM(uo.first_name || ' ' || uo.last_name), uo.username) AS old_user_name, "
-        "COALESCE(TRIM(un.first_name || ' ' || un.last_name), un.username) AS new_user_name, "
-        "COALESCE(TRIM(uc.first_name || ' ' || uc.last_name), uc.username) AS changed_by_name, "
-        "COALESCE(olo.name, il.old_location) AS old_location, "
-        "COALESCE(nlo.name, il.new_location) AS new_location "
-        "FROM inventory_logs il "
-        "LEFT JOIN users uo ON il.old_user_id = uo.id "
-        "LEFT JOIN users un ON il.new_user_id = un.id "
-        "LEFT JOIN users uc ON il.changed_by = uc.id "
-        "LEFT JOIN lookup_items olo ON CAST(il.old_location AS INTEGER) = olo.id "
-        "LEFT JOIN lookup_items nlo ON CAST(il.new_location AS INTEGER) = nlo.id"
-    )
+    """Return inventory log rows, newest first.
+
+    ``before``/``after`` are cursor tokens from :func:`encode_cursor`; they
+    seek on ``(change_date, id)`` so deep pages cost the same as the first.
+    ``date_from`` (inclusive) and ``date_to`` (exclusive) bound
+    ``change_date`` and are produced by :func:`parse_date_bound`.
+    """
     conds: List[str] = []
     params: List[Any] = []
     if inventory_type:
@@ -84,46 +237,282 @@ def get_inventory_logs(
     if inventory_id is not None:
         conds.append("il.inventory_id = ?")
         params.append(inventory_id)
-    if user_id is not None:
-        conds.append("(il.old_user_id = ? OR il.new_user_id = ?)")
-        params.extend([user_id, user_id])
-    def build_query(base: str) -> str:
-        q = base
-        if conds:
-            q += " WHERE " + " AND ".join(conds)
-        q += " ORDER BY il.change_date DESC, il.id DESC LIMIT ? OFFSET ?"
-        return q
+    if date_from:
+        conds.append("il.change_date >= ?")
+        params.append(date_from)
+    if date_to:
+        conds.append("il.change_date < ?")
+        params.append(date_to)
+    if before:
+        conds.append("(il.change_date, il.id) < (?, ?)")
+        params.extend(decode_cursor(before))
+    elif after:
+        conds.append("(il.change_date, il.id) > (?, ?)")
+        params.extend(decode_cursor(after))
+    # Rows after a cursor are read oldest first and flipped afterwards.
+    order = "ASC" if after and not before else "DESC"
+    order_by = f" ORDER BY il.change_date {order}, il.id {order}"
 
-    params.extend([limit, offset])
+    def fetch(cur: sqlite3.Cursor, table: str) -> List[Dict[str, Any]]:
+        """Run the listing against ``table`` (a table name or subquery)."""
+        source = f"{table} il"
+        where_conds, where_params = conds, list(params)
+        if user_id is not None:
+            # ``old_user_id = ? OR new_user_id = ?`` cannot use an index, so read
+            # the top rows of each side from its own (user, date) index and merge
+            # them. The second branch skips rows already matched by the first.
+            branches = []
+            branch_params: List[Any] = []
+            for user_cond, user_params in (
+                ("il.old_user_id = ?", [user_id]),
+                ("il.new_user_id = ? AND il.old_user_id IS NOT ?", [user_id, user_id]),
+            ):
+                where = " AND ".join([user_cond] + conds)
+                branches.append(
+                    f"SELECT * FROM (SELECT il.* FROM {table} il "
+                    f"WHERE {where}{order_by} LIMIT ?)"
+                )
+                branch_params.extend(user_params + params + [limit + offset])
+            source = "(" + " UNION ALL ".join(branches) + ") il"
+            where_conds, where_params = [], branch_params
+
+        # Base queries: one reading the display names cached on each log row,
+        # one joining users/lookup_items with inventory number columns and a
+        # fallback without them for backwards compatibility.
+        base_cached = (
+            "SELECT il.*, "
+            "COALESCE(il.new_inventory_no, il.old_inventory_no) AS inventory_no, "
+            "COALESCE(il.old_location_name, il.old_location) AS old_location, "
+            "COALESCE(il.new_location_name, il.new_location) AS new_location "
+            f"FROM {source}"
+        )
+        base_with_inv = (
+            "SELECT il.*, "
+            "COALESCE(il.new_inventory_no, il.old_inventory_no) AS inventory_no, "
+            "COALESCE(TRIM(uo.first_name || ' ' || uo.last_name), uo.username) AS old_user_name, "
+            "COALESCE(TRIM(un.first_name || ' ' || un.last_name), un.username) AS new_user_name, "
+            "COALESCE(TRIM(uc.first_name || ' ' || uc.last_name), uc.username) AS changed_by_name, "
+            "COALESCE(olo.name, il.old_location) AS old_location, "
+            "COALESCE(nlo.name, il.new_location) AS new_location "
+            f"FROM {source} "
+            "LEFT JOIN users uo ON il.old_user_id = uo.id "
+            "LEFT JOIN users un ON il.new_user_id = un.id "
+            "LEFT JOIN users uc ON il.changed_by = uc.id "
+            "LEFT JOIN lookup_items olo ON CAST(il.old_location AS INTEGER) = olo.id "
+            "LEFT JOIN lookup_items nlo ON CAST(il.new_location AS INTEGER) = nlo.id"
+        )
+        base_legacy = (
+            "SELECT il.*, "
+            "COALESCE(TRIM(uo.first_name || ' ' || uo.last_name), uo.username) AS old_user_name, "
+            "COALESCE(TRIM(un.first_name || ' ' || un.last_name), un.username) AS new_user_name, "
+            "COALESCE(TRIM(uc.first_name || ' ' || uc.last_name), uc.username) AS changed_by_name, "
+            "COALESCE(olo.name, il.old_location) AS old_location, "
+            "COALESCE(nlo.name, il.new_location) AS new_location "
+            f"FROM {source} "
+            "LEFT JOIN users uo ON il.old_user_id = uo.id "
+            "LEFT JOIN users un ON il.new_user_id = un.id "
+            "LEFT JOIN users uc ON il.changed_by = uc.id "
+            "LEFT JOIN lookup_items olo ON CAST(il.old_location AS INTEGER) = olo.id "
+            "LEFT JOIN lookup_items nlo ON CAST(il.new_location AS INTEGER) = nlo.id"
+        )
+
+        def build_query(base: str) -> str:
+            q = base
+            if where_conds:
+                q += " WHERE " + " AND ".join(where_conds)
+            q += f"{order_by} LIMIT ? OFFSET ?"
+            return q
+
+        where_params.extend([limit, offset])
+        for base in (base_cached, base_with_inv):
+            try:
+                cur.execute(build_query(base), where_params)
+                break
+            except sqlite3.OperationalError:
+                continue
+        else:
+            cur.execute(build_query(base_legacy), where_params)
+        return cur.fetchall()
+
+    # The lowest change_date the request can reach; archived rows are only
+    # read when it lies before the archive boundary.
+    lower_bound = date_from
+    if after and not before:
+        cursor_date = decode_cursor(after)[0]
+        lower_bound = max(lower_bound or "", str(cursor_date))
 
     with sqlite3.connect(DB_PATH) as con:
         con.row_factory = _row_to_dict
         cur = con.cursor()
-        try:
-            cur.execute(build_query(base_with_inv), params)
-        except sqlite3.OperationalError:
-            cur.execute(build_query(base_legacy), params)
-        return cur.fetchall()
+        rows = fetch(cur, "inventory_logs")
+        if len(rows) < limit and needs_archive(con, "inventory_logs", lower_bound):
+            source = union_source(con, DB_PATH, "inventory_logs")
+            if source:
+                rows = fetch(cur, source)
+    if order == "ASC":
+        rows.reverse()
+    return rows
+
+
+def encode_cursor(change_date: Any, log_id: int) -> str:
+    """Return an opaque pagination token for a ``(change_date, id)`` pair."""
+    raw = json.dumps([change_date, log_id], default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Any, int]:
+    """Decode a token from :func:`encode_cursor`; raise ``ValueError`` if invalid."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        change_date, log_id = json.loads(base64.urlsafe_b64decode(padded))
+        return change_date, int(log_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def next_cursor(
+    rows: List[Dict[str, Any]], limit: int, date_key: str = "change_date"
+) -> Optional[str]:
+    """Return the cursor for the page after ``rows`` or ``None`` on the last page."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last[date_key], last["id"])
+
+
+def parse_date_bound(value: Optional[str], end: bool = False) -> Optional[str]:
+    """Normalise a ``from``/``to`` query value to a comparable timestamp.
+
+    Dates (``YYYY-MM-DD``) are expanded to midnight; as an upper bound a date
+    means "up to and including that day". Raises ``ValueError`` when the value
+    cannot be parsed.
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+
+_USER_NAME_SQL = (
+    "SELECT COALESCE(TRIM(u.first_name || ' ' || u.last_name), u.username) "
+    "FROM users u WHERE u.id = ?"
+)
+
+
+def refresh_inventory_log_names(
+    user_ids: Optional[Iterable[int]] = None,
+    location_ids: Optional[Iterable[int]] = None,
+) -> None:
+    """Re-resolve the display names cached on inventory log rows.
+
+    Renames are applied by triggers (see
+    ``db/migrations/019_inventory_log_name_refresh.sql``); this repairs rows
+    written before them or with the triggers missing. Without arguments
+    every row is refreshed.
+    """
+    user_cols = (
+        ("old_user_id", "old_user_name"),
+        ("new_user_id", "new_user_name"),
+        ("changed_by", "changed_by_name"),
+    )
+    location_cols = (
+        ("old_location", "old_location_name"),
+        ("new_location", "new_location_name"),
+    )
+    with sqlite3.connect(DB_PATH) as con:
+        if user_ids is None and location_ids is None:
+            sets = [
+                f"{name_col} = ({_USER_NAME_SQL.replace('?', 'inventory_logs.' + id_col)})"
+                for id_col, name_col in user_cols
+            ] + [
+                f"{name_col} = (SELECT l.name FROM lookup_items l "
+                f"WHERE l.id = CAST(inventory_logs.{id_col} AS INTEGER))"
+                for id_col, name_col in location_cols
+            ]
+            con.execute("UPDATE inventory_logs SET " + ", ".join(sets))
+        for user_id in user_ids or ():
+            for id_col, name_col in user_cols:
+                con.execute(
+                    f"UPDATE inventory_logs SET {name_col} = ({_USER_NAME_SQL}) "
+                    f"WHERE {id_col} = ?",
+                    (user_id, user_id),
+                )
+        for location_id in location_ids or ():
+            for id_col, name_col in location_cols:
+                con.execute(
+                    f"UPDATE inventory_logs SET {name_col} = "
+                    "(SELECT name FROM lookup_items WHERE id = ?) "
+                    f"WHERE {id_col} = ?",
+                    (location_id, str(location_id)),
+                )
+        con.commit()
 
 
 def get_activity_logs(
-    username: Optional[str] = None, limit: int = 200, offset: int = 0
+    username: Optional[str] = None,
+    limit: int = 200,
+    offset: int = 0,
+    action_prefix: Optional[str] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
-    q = "SELECT * FROM activity_log"
+    """Return activity log rows, newest first.
+
+    Cursors and date bounds work as in :func:`get_inventory_logs`, keyed on
+    ``(timestamp, id)``. ``action_prefix`` keeps entries whose action starts
+    with the given text (e.g. ``"Deleted"``).
+    """
     conds: List[str] = []
     params: List[Any] = []
     if username:
         conds.append("username = ?")
         params.append(username)
-    if conds:
-        q += " WHERE " + " AND ".join(conds)
-    q += " ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?"
+    if action_prefix:
+        conds.append("action LIKE ? ESCAPE '\\'")
+        params.append(_like_escape(action_prefix) + "%")
+    if date_from:
+        conds.append("timestamp >= ?")
+        params.append(date_from)
+    if date_to:
+        conds.append("timestamp < ?")
+        params.append(date_to)
+    if before:
+        conds.append("(timestamp, id) < (?, ?)")
+        params.extend(decode_cursor(before))
+    elif after:
+        conds.append("(timestamp, id) > (?, ?)")
+        params.extend(decode_cursor(after))
+    order = "ASC" if after and not before else "DESC"
+    where = " WHERE " + " AND ".join(conds) if conds else ""
     params.extend([limit, offset])
+
+    def query(table: str) -> str:
+        return (
+            f"SELECT * FROM {table}{where} "
+            f"ORDER BY timestamp {order}, id {order} LIMIT ? OFFSET ?"
+        )
+
+    lower_bound = date_from
+    if after and not before:
+        lower_bound = max(lower_bound or "", str(decode_cursor(after)[0]))
+
     with sqlite3.connect(DB_PATH) as con:
         con.row_factory = _row_to_dict
         cur = con.cursor()
-        cur.execute(q, params)
-        return cur.fetchall()
+        cur.execute(query("activity_log"), params)
+        rows = cur.fetchall()
+        if len(rows) < limit and needs_archive(con, "activity_log", lower_bound):
+            source = union_source(con, DB_PATH, "activity_log")
+            if source:
+                cur.execute(query(source), params)
+                rows = cur.fetchall()
+    if order == "ASC":
+        rows.reverse()
+    return rows
 
 
 def get_inventory_items() -> List[Dict[str, Any]]:
@@ -163,16 +552,117 @@ def get_inventory_items() -> List[Dict[str, Any]]:
     ]
 
 
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_inventory_items(query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Return up to ``limit`` items whose inventory number or name matches ``query``.
+
+    Inventory number prefix matches come first and are served from the
+    ``inventory_numbers`` index; substring matches on the number or name
+    fill the remaining slots.
+    """
+    query = (query or "").strip()
+    if not query or limit <= 0:
+        return []
+    pattern = _like_escape(query)
+    cols = "inventory_type, inventory_id, name, inventory_no"
+    with sqlite3.connect(DB_PATH) as con:
+        cur = con.cursor()
+        try:
+            cur.execute(
+                f"SELECT {cols} FROM inventory_numbers "
+                "WHERE inventory_no LIKE ? ESCAPE '\\' "
+                "ORDER BY inventory_no LIMIT ?",
+                (pattern + "%", limit),
+            )
+            rows = cur.fetchall()
+            if len(rows) < limit:
+                cur.execute(
+                    f"SELECT {cols} FROM inventory_numbers "
+                    "WHERE (inventory_no LIKE ? ESCAPE '\\' OR name LIKE ? ESCAPE '\\') "
+                    "AND IFNULL(inventory_no, '') NOT LIKE ? ESCAPE '\\' "
+                    "ORDER BY inventory_no LIMIT ?",
+                    ("%" + pattern + "%", "%" + pattern + "%", pattern + "%", limit - len(rows)),
+                )
+                rows.extend(cur.fetchall())
+        except sqlite3.OperationalError:
+            # Databases without the index table: search the inventories directly.
+            rows = [
+                (r["type"], r["id"], r["name"], r["inv_no"])
+                for r in get_inventory_items()
+                if query.lower() in (r["inv_no"] or "").lower()
+                or query.lower() in (r["name"] or "").lower()
+            ]
+            rows.sort(key=lambda r: not (r[3] or "").lower().startswith(query.lower()))
+            rows = rows[:limit]
+    return [
+        {
+            "type": r[0],
+            "id": r[1],
+            "name": r[2],
+            "inv_no": str(r[3]) if r[3] is not None else None,
+        }
+        for r in rows
+    ]
+
+
+def find_inventory_item(inventory_no: str) -> Optional[Tuple[str, int]]:
+    """Return ``(inventory_type, id)`` of the item with ``inventory_no``."""
+    if not inventory_no:
+        return None
+    with sqlite3.connect(DB_PATH) as con:
+        cur = con.cursor()
+        try:
+            # The NOCASE index narrows the candidates; keep exact matches only.
+            cur.execute(
+                "SELECT inventory_type, inventory_id, inventory_no FROM inventory_numbers "
+                "WHERE inventory_no = ? ORDER BY inventory_type, inventory_id",
+                (inventory_no,),
+            )
+            for inv_type, inv_id, number in cur.fetchall():
+                if number == inventory_no:
+                    return inv_type, inv_id
+            return None
+        except sqlite3.OperationalError:
+            pass
+        for inv_type, (table, col) in INVENTORY_NO_COLUMNS.items():
+            try:
+                cur.execute(f"SELECT id FROM {table} WHERE {col} = ? LIMIT 1", (inventory_no,))
+            except sqlite3.OperationalError:
+                continue
+            row = cur.fetchone()
+            if row:
+                return inv_type, row[0]
+    return None
+
+
+def get_inventory_nos(
+    con: sqlite3.Connection, inventory_type: str, inventory_ids: Iterable[int]
+) -> Dict[int, Any]:
+    """Return ``{id: inventory number}`` for many items of one inventory type."""
+    table_col = INVENTORY_NO_COLUMNS.get(inventory_type)
+    ids = list(inventory_ids)
+    if not table_col or not ids:
+        return {}
+    table, col = table_col
+    result: Dict[int, Any] = {}
+    cur = con.cursor()
+    for start in range(0, len(ids), BATCH_CHUNK_SIZE):
+        chunk = ids[start:start + BATCH_CHUNK_SIZE]
+        marks = ", ".join("?" * len(chunk))
+        try:
+            cur.execute(f"SELECT id, {col} FROM {table} WHERE id IN ({marks})", chunk)
+        except sqlite3.OperationalError:
+            return {}
+        result.update(cur.fetchall())
+    return result
+
+
 def get_inventory_no(inventory_type: str, inventory_id: int) -> Optional[str]:
     """Return the inventory number for the given item, if available."""
-    mapping = {
-        "pc": ("hardware_inventory", "no"),
-        "license": ("license_inventory", "envanter_no"),
-        # Support accessory and stock inventories as well.
-        "accessory": ("accessory_inventory", "ifs_no"),
-        "stock": ("stock_tracking", "id"),
-    }
-    table_col = mapping.get(inventory_type)
+    table_col = INVENTORY_NO_COLUMNS.get(inventory_type)
     if not table_col:
         return None
     table, col = table_col
@@ -188,6 +678,13 @@ def get_inventory_no(inventory_type: str, inventory_id: int) -> Optional[str]:
 
 def get_latest_assignments(limit: int = 200, offset: int = 0) -> List[Dict[str, Any]]:
     q = (
+        "SELECT s.inventory_type, s.inventory_id, s.new_user_id, u.username AS new_user_name, "
+        "s.new_location, s.action, s.change_date, s.log_id AS id "
+        "FROM inventory_current_state s "
+        "LEFT JOIN users u ON s.new_user_id = u.id "
+        "ORDER BY s.change_date DESC, s.log_id DESC LIMIT ? OFFSET ?"
+    )
+    q_view = (
         "SELECT v.inventory_type, v.inventory_id, v.new_user_id, u.username AS new_user_name, "
         "v.new_location, v.action, v.change_date, v.id "
         "FROM v_inventory_latest v "
@@ -197,5 +694,8 @@ def get_latest_assignments(limit: int = 200, offset: int = 0) -> List[Dict[str,
     with sqlite3.connect(DB_PATH) as con:
         con.row_factory = _row_to_dict
         cur = con.cursor()
-        cur.execute(q, (limit, offset))
+        try:
+            cur.execute(q, (limit, offset))
+        except sqlite3.OperationalError:
+            cur.execute(q_view, (limit, offset))
         return cur.fetchall()
@@ -0,0 +1,137 @@
+"""Turkish-aware text normalization for inventory searches and sorting.
+
+SQLite only folds ASCII letters, so ``ilike`` misses "IŞIK" when searching
+"ışık". Inventory models keep shadow columns holding their text in the form
+produced by :func:`normalize_tr`: ``search_norm`` with every text field,
+which searches match the normalized query anywhere in, and an indexed
+``<column>_norm`` per commonly searched field. :func:`prefix_rank` ranks
+rows with one of those fields starting with the query first.
+
+Commonly sorted columns also get a ``<column>_sort`` shadow column holding
+:func:`sort_key`, whose binary order is the Turkish alphabetical order, so
+an index on it serves ``ORDER BY`` directly.
+"""
+
+import unicodedata
+from typing import Iterable, Optional
+
+from sqlalchemy import String, and_, case, or_
+
+# Turkish dotted/dotless I do not fold like their ASCII look-alikes.
+_TR_UPPER = str.maketrans({"İ": "i", "I": "ı"})
+
+# Separates fields in ``search_norm`` so matches don't span two fields.
+FIELD_SEPARATOR = "\n"
+
+
+# Turkish alphabet with the letters it lacks placed as in English.
+_ALPHABET = "abcçdefgğhıijklmnoöpqrsştuüvwxyz"
+# Letters map above every ASCII character, so digits and punctuation sort first.
+_RANKS = {ch: chr(0x3000 + rank) for rank, ch in enumerate(_ALPHABET)}
+
+
+def _strip_marks(value: str) -> str:
+    return "".join(
+        ch for ch in unicodedata.normalize("NFKD", value) if not unicodedata.combining(ch)
+    )
+
+
+def normalize_tr(value: Optional[str]) -> str:
+    """Casefold ``value`` with Turkish rules and strip diacritics.
+
+    ``"İSTANBUL"`` becomes ``"istanbul"`` and ``"IŞIK"`` and ``"ışık"`` both
+    become ``"isik"``.
+    """
+    if not value:
+        return ""
+    folded = str(value).translate(_TR_UPPER).lower()
+    return _strip_marks(folded).replace("ı", "i")
+
+
+def sort_key(value: Optional[str]) -> str:
+    """Return a case-insensitive key for ``value`` ordering as Turkish text.
+
+    Keys compare correctly with SQLite's default ``BINARY`` collation:
+    "çay" sorts between "cam" and "dağ" and "ılık" before "iğne". Empty
+    and ``None`` values get an empty key and sort first.
+    """
+    if value is None:
+        return ""
+    key = []
+    for ch in str(value).translate(_TR_UPPER).lower():
+        rank = _RANKS.get(ch)
+        if rank is None:
+            base = _strip_marks(ch)
+            rank = _RANKS.get(base, ch) if len(base) == 1 else ch
+        key.append(rank)
+    return "".join(key)
+
+
+def search_document(values: Iterable[Optional[str]]) -> str:
+    """Return the ``search_norm`` value for a record's text ``values``."""
+    return FIELD_SEPARATOR.join(normalize_tr(v) for v in values if v)
+
+
+def _escape_like(query: str) -> str:
+    term = normalize_tr(query)
+    for ch in ("\\", "%", "_"):
+        term = term.replace(ch, "\\" + ch)
+    return term
+
+
+def like_pattern(query: str) -> str:
+    """Return a ``LIKE`` substring pattern for ``query`` escaped with ``\\``."""
+    return f"%{_escape_like(query)}%"
+
+
+def prefix_pattern(query: str) -> str:
+    """Return a ``LIKE`` prefix pattern for ``query`` escaped with ``\\``."""
+    return f"{_escape_like(query)}%"
+
+
+def _ilike_condition(model, query: str):
+    columns = model.__table__.columns
+    return or_(*(c.ilike(f"%{query}%") for c in columns if isinstance(c.type, String)))
+
+
+def search_condition(model, query: str):
+    """Return the filter matching ``query`` anywhere in ``model``'s text fields.
+
+    Rows whose shadow columns raw SQL writes cleared are matched with
+    ``ilike`` until ``init_db`` refills them. Models without ``search_norm``
+    always use ``ilike`` on each text column.
+    """
+    columns = model.__table__.columns
+    if "search_norm" not in columns:
+        return _ilike_condition(model, query)
+    norm = columns["search_norm"]
+    return or_(
+        norm.like(like_pattern(query), escape="\\"),
+        and_(norm.is_(None), _ilike_condition(model, query)),
+    )
+
+
+def prefix_rank(model, query: str):
+    """Return an ``ORDER BY`` key putting rows with a field starting with ``query`` first.
+
+    Only the ``<column>_norm`` fields count; returns ``None`` for models
+    without them.
+    """
+    columns = model.__table__.columns
+    norms = [c for c in columns if c.name.endswith("_norm") and c.name != "search_norm"]
+    if not norms:
+        return None
+    pattern = prefix_pattern(query)
+    return case((or_(*(c.like(pattern, escape="\\") for c in norms)), 0), else_=1)
+
+
+__all__ = [
+    "FIELD_SEPARATOR",
+    "like_pattern",
+    "normalize_tr",
+    "prefix_pattern",
+    "prefix_rank",
+    "search_condition",
+    "search_document",
+    "sort_key",
+]
@@ -0,0 +1,234 @@
+"""Stock balance lookups backed by the ``stock_balance`` ledger.
+
+``stock_balance`` holds the net quantity per (urun_adi, kategori, lokasyon)
+and is kept current by triggers on ``stock_tracking`` (see
+``db/migrations/011_stock_balance.sql``). Databases created without the
+migrations fall back to aggregating ``stock_tracking`` directly.
+
+Historical balances start from the nearest ``stock_balance_snapshots`` row
+set and apply only the movements in between. Snapshots are written for each
+day with movements by :func:`ensure_stock_snapshots`, which runs at startup
+and again from :func:`stock_balance_as_of` whenever writes invalidated the
+latest snapshots (see ``db/migrations/016_stock_snapshot_dates.sql``).
+Snapshots hold dated movements only; movements with neither ``tarih`` nor
+``guncelleme_tarihi`` count towards every date and are added on top.
+
+Assignments and transfers lower ``adet`` on the stock row they draw from
+instead of recording a movement of their own, so historical balances on or
+after that row's date change afterwards: they are not stable.
+
+Run ``python -m services.stock_service rebuild`` to recompute the ledger and
+``python -m services.stock_service snapshot`` to write missing snapshots.
+"""
+
+import argparse
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+import models
+from models import StockItem
+
+logger = logging.getLogger(__name__)
+
+_SIGNED_ADET = "CASE WHEN islem = 'giris' THEN COALESCE(adet, 0) ELSE -COALESCE(adet, 0) END"
+_BALANCE_KEY = "COALESCE(urun_adi, ''), COALESCE(kategori, ''), COALESCE(lokasyon, '')"
+# Effective date of a movement; matches idx_stock_tracking_move_date.
+_MOVE_DATE = "COALESCE(tarih, guncelleme_tarihi, '')"
+
+REBUILD_SQL = (
+    "INSERT INTO stock_balance (urun_adi, kategori, lokasyon, net_adet, movements) "
+    f"SELECT {_BALANCE_KEY}, SUM({_SIGNED_ADET}), COUNT(*) "
+    "FROM stock_tracking GROUP BY 1, 2, 3"
+)
+
+Key = Tuple[str, str, str]
+
+# Serializes snapshot writes within the process.
+_snapshot_lock = threading.Lock()
+
+
+def stock_totals(db: Session) -> List[Tuple[Optional[str], int]]:
+    """Return ``(urun_adi, net_adet)`` for every product, ordered by name."""
+    try:
+        rows = db.execute(
+            text(
+                "SELECT NULLIF(urun_adi, '') AS urun_adi, SUM(net_adet) AS net_adet "
+                "FROM stock_balance GROUP BY urun_adi ORDER BY urun_adi"
+            )
+        ).all()
+    except OperationalError:
+        # No ledger table (e.g. a database created without migrations).
+        db.rollback()
+        rows = (
+            db.query(
+                StockItem.urun_adi,
+                func.sum(
+                    case((StockItem.islem == "giris", StockItem.adet), else_=-StockItem.adet)
+                ).label("net_adet"),
+            )
+            .group_by(StockItem.urun_adi)
+            .order_by(StockItem.urun_adi)
+            .all()
+        )
+    return [(name, qty or 0) for name, qty in rows]
+
+
+def rebuild_stock_balance() -> int:
+    """Recompute ``stock_balance`` from ``stock_tracking``; return the row count."""
+    with models.engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM stock_balance")
+        conn.exec_driver_sql(REBUILD_SQL)
+        return conn.exec_driver_sql("SELECT COUNT(*) FROM stock_balance").scalar()
+
+
+def _movements(conn, after: Optional[str], until: str) -> List[Tuple[str, Key, int]]:
+    """Return ``(day, key, net change)`` for dated movements in ``(after, until]``."""
+    conds = [f"{_MOVE_DATE} <= ?", f"{_MOVE_DATE} > ?"]
+    params: List[Any] = [until, after or ""]
+    rows = conn.exec_driver_sql(
+        f"SELECT {_MOVE_DATE}, {_BALANCE_KEY}, SUM({_SIGNED_ADET}) FROM stock_tracking "
+        f"WHERE {' AND '.join(conds)} GROUP BY 1, 2, 3, 4 ORDER BY 1",
+        tuple(params),
+    ).all()
+    return [(r[0], (r[1], r[2], r[3]), r[4] or 0) for r in rows]
+
+
+def _undated(conn) -> Dict[Key, int]:
+    """Return the net change per key of movements without any date."""
+    rows = conn.exec_driver_sql(
+        f"SELECT {_BALANCE_KEY}, SUM({_SIGNED_ADET}) FROM stock_tracking "
+        f"WHERE {_MOVE_DATE} = '' GROUP BY 1, 2, 3"
+    ).all()
+    return {(r[0], r[1], r[2]): r[3] or 0 for r in rows}
+
+
+def _snapshot(conn, snapshot_date: str) -> Dict[Key, int]:
+    rows = conn.exec_driver_sql(
+        "SELECT urun_adi, kategori, lokasyon, net_adet FROM stock_balance_snapshots "
+        "WHERE snapshot_date = ?",
+        (snapshot_date,),
+    ).all()
+    return {(r[0], r[1], r[2]): r[3] for r in rows}
+
+
+def _write_snapshots(until_s: str) -> int:
+    with _snapshot_lock, models.engine.begin() as conn:
+        last = conn.exec_driver_sql(
+            "SELECT MAX(snapshot_date) FROM stock_balance_snapshots"
+        ).scalar()
+        balances = _snapshot(conn, last) if last else {}
+        by_day: Dict[str, List[Tuple[Key, int]]] = {}
+        for day, key, delta in _movements(conn, last, until_s):
+            by_day.setdefault(day, []).append((key, delta))
+        written = 0
+        for day, changes in by_day.items():
+            for key, delta in changes:
+                balances[key] = balances.get(key, 0) + delta
+            rows = [(day, *key, qty) for key, qty in balances.items() if qty]
+            if rows:
+                # Another worker may have written the same day meanwhile.
+                conn.exec_driver_sql(
+                    "INSERT OR REPLACE INTO stock_balance_snapshots "
+                    "(snapshot_date, urun_adi, kategori, lokasyon, net_adet) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                written += 1
+        return written
+
+
+def ensure_stock_snapshots(until: Optional[date] = None) -> int:
+    """Write snapshots for days with movements up to ``until`` (yesterday).
+
+    Work starts from the latest remaining snapshot, so after the first run
+    only new days (or days invalidated by backdated changes) are computed.
+    Returns the number of snapshot days written.
+    """
+    try:
+        return _write_snapshots((until or date.today() - timedelta(days=1)).isoformat())
+    except OperationalError:
+        logger.warning("stock_balance_snapshots is missing; skipping stock snapshots")
+        return 0
+
+
+def stock_balance_as_of(as_of: date) -> Dict[str, Any]:
+    """Return per-product balances at the end of ``as_of``.
+
+    Snapshots invalidated by writes since the last call are rebuilt first,
+    starting from the latest one left. The nearest snapshot (before or after
+    ``as_of``) is then adjusted by the movements between it and ``as_of``;
+    without snapshots every movement up to ``as_of`` is summed. Undated
+    movements are added last.
+    """
+    try:
+        _write_snapshots((date.today() - timedelta(days=1)).isoformat())
+    except OperationalError:
+        pass
+    target = as_of.isoformat()
+    with models.engine.connect() as conn:
+        try:
+            prev = conn.exec_driver_sql(
+                "SELECT MAX(snapshot_date) FROM stock_balance_snapshots WHERE snapshot_date <= ?",
+                (target,),
+            ).scalar()
+            nxt = conn.exec_driver_sql(
+                "SELECT MIN(snapshot_date) FROM stock_balance_snapshots WHERE snapshot_date > ?",
+                (target,),
+            ).scalar()
+        except OperationalError:
+            prev = nxt = None
+        if nxt and (
+            not prev
+            or date.fromisoformat(nxt) - as_of < as_of - date.fromisoformat(prev)
+        ):
+            snapshot, sign = nxt, -1
+            balances = _snapshot(conn, nxt)
+            movements = _movements(conn, target, nxt)
+        else:
+            snapshot, sign = prev, 1
+            balances = _snapshot(conn, prev) if prev else {}
+            movements = _movements(conn, prev, target)
+        undated = _undated(conn)
+    for _day, key, delta in movements:
+        balances[key] = balances.get(key, 0) + sign * delta
+    for key, delta in undated.items():
+        balances[key] = balances.get(key, 0) + delta
+    return {
+        "as_of": target,
+        "snapshot": snapshot,
+        "balances": [
+            {"urun_adi": k[0], "kategori": k[1], "lokasyon": k[2], "net_adet": qty}
+            for k, qty in sorted(balances.items())
+            if qty
+        ],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stock balance maintenance.")
+    parser.add_argument("command", choices=["rebuild", "snapshot"])
+    args = parser.parse_args(argv)
+    if args.command == "rebuild":
+        count = rebuild_stock_balance()
+        print(f"stock_balance rebuilt: {count} rows")
+    elif args.command == "snapshot":
+        count = ensure_stock_snapshots()
+        print(f"stock snapshots written: {count} days")
+
+
+__all__ = [
+    "stock_totals",
+    "rebuild_stock_balance",
+    "ensure_stock_snapshots",
+    "stock_balance_as_of",
+]
+
+
+if __name__ == "__main__":
+    main()
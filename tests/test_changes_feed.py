@@ -0,0 +1,83 @@
+import os
+import sys
+import sqlite3
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import models
+from routes.changes import router as changes_router
+import services.change_feed as change_feed
+from utils.auth import require_login
+
+
+def setup_db(path):
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    con = sqlite3.connect(path)
+    with open("db/migrations/010_change_log.sql") as f:
+        con.executescript(f.read())
+    return con
+
+
+def create_app():
+    app = FastAPI()
+    app.include_router(changes_router)
+    app.dependency_overrides[require_login] = lambda: None
+    return app
+
+
+def test_changes_are_collapsed_per_row_and_paged(tmp_path):
+    db_file = tmp_path / "envanter.db"
+    con = setup_db(db_file)
+    change_feed.DB_PATH = str(db_file)
+    with TestClient(create_app()) as client:
+        start = client.get("/changes").json()
+        assert start == {"changes": [], "next": 0, "has_more": False}
+
+        con.execute("INSERT INTO hardware_inventory (id, no) VALUES (1, 'PC-1')")
+        con.execute("INSERT INTO hardware_inventory (id, no) VALUES (2, 'PC-2')")
+        con.execute("INSERT INTO license (id, adi) VALUES (1, 'Office')")
+        con.execute("UPDATE hardware_inventory SET no = 'PC-1B' WHERE id = 1")
+        con.execute("DELETE FROM hardware_inventory WHERE id = 2")
+        con.commit()
+
+        page = client.get("/changes", params={"since": 0, "limit": 2}).json()
+        assert page["has_more"] is True
+        assert [(c["table"], c["id"], c["op"]) for c in page["changes"]] == [
+            ("license", 1, "upsert"),
+            ("hardware_inventory", 1, "upsert"),
+        ]
+        assert page["changes"][1]["data"]["no"] == "PC-1B"
+        # Shadow columns used for searching and sorting are not reported.
+        for change, model in zip(page["changes"], (models.License, models.HardwareInventory)):
+            assert list(change["data"]) == [col.name for col in models.data_columns(model)]
+
+        rest = client.get("/changes", params={"since": page["next"]}).json()
+        assert [(c["table"], c["id"], c["op"]) for c in rest["changes"]] == [
+            ("hardware_inventory", 2, "delete")
+        ]
+        assert rest["has_more"] is False
+        assert client.get("/changes", params={"since": rest["next"]}).json()["changes"] == []
+    con.close()
+
+
+def test_pruned_changes_expire_old_cursors(tmp_path):
+    db_file = tmp_path / "envanter.db"
+    con = setup_db(db_file)
+    change_feed.DB_PATH = str(db_file)
+    for n in range(1, 4):
+        con.execute("INSERT INTO hardware_inventory (id, no) VALUES (?, ?)", (n, f"PC-{n}"))
+    con.execute("UPDATE change_log SET changed_at = '2000-01-01 00:00:00' WHERE seq <= 2")
+    con.commit()
+
+    assert change_feed.prune_change_log(str(db_file), batch_size=1) == 2
+    with TestClient(create_app()) as client:
+        assert client.get("/changes", params={"since": 1}).status_code == 410
+        page = client.get("/changes", params={"since": 2}).json()
+        assert [c["id"] for c in page["changes"]] == [3]
+    con.close()
@@ -0,0 +1,59 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.middleware.sessions import SessionMiddleware
+
+import models
+from models import HardwareInventory
+from routes.inventory_pages import router as inventory_pages_router
+from utils.auth import require_login
+
+
+def test_column_values_counts_are_scoped_and_cached():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.engine = engine
+    models.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    db = models.SessionLocal()
+    db.add_all(
+        [
+            HardwareInventory(no="1", marka="Dell", departman="IT"),
+            HardwareInventory(no="2", marka="Dell", departman="IK"),
+            HardwareInventory(no="3", marka="HP", departman="IT"),
+            HardwareInventory(no="4", marka=None, departman="IT"),
+        ]
+    )
+    db.commit()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    app.include_router(inventory_pages_router)
+    app.dependency_overrides[require_login] = lambda: None
+    with TestClient(app) as client:
+        url = "/column-values?table_name=inventory&column=marka"
+        assert client.get(url).json()["facets"] == [
+            {"value": "Dell", "count": 2},
+            {"value": "HP", "count": 1},
+        ]
+        # Other filters narrow the counts; a filter on the column itself does not.
+        scoped = url + "&filter_field=departman&filter_value=IT&filter_field=marka&filter_value=HP"
+        assert client.get(scoped).json()["facets"] == [
+            {"value": "Dell", "count": 1},
+            {"value": "HP", "count": 1},
+        ]
+        assert client.get(url + "&q=hp").json()["values"] == ["HP"]
+
+        queries = len(statements)
+        client.get(scoped)
+        assert len(statements) == queries
+
+        db.add(HardwareInventory(no="5", marka="HP", departman="IT"))
+        db.commit()
+        assert client.get(scoped).json()["facets"][1] == {"value": "HP", "count": 2}
+    db.close()
@@ -0,0 +1,36 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+from models import HardwareInventory
+from routes import reporting
+from services import cache
+
+
+def test_dashboard_context_is_cached_until_a_write(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    monkeypatch.setattr(reporting, "load_home_stock", lambda: [])
+    db = sessionmaker(bind=engine)()
+
+    first = reporting._main_context(db)
+    queries = len(statements)
+    assert queries > 0
+    assert reporting._main_context(db) == first
+    assert len(statements) == queries
+
+    db.add(HardwareInventory(no="PC-1", donanim_tipi="Laptop"))
+    db.commit()
+    assert reporting._main_context(db)["device_summary"] == [("Laptop", 1)]
+
+    # Writes made outside the ORM invalidate through ``bump``.
+    queries = len(statements)
+    cache.bump("activity_log")
+    reporting._main_context(db)
+    assert len(statements) > queries
+    db.close()
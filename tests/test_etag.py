@@ -0,0 +1,62 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.middleware.sessions import SessionMiddleware
+
+import models
+import utils
+from routes.hardware import router as hardware_router
+from routes.inventory_pages import router as inventory_pages_router
+from utils.auth import require_login
+
+
+def create_client():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.engine = utils.engine = engine
+    models.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    app.include_router(hardware_router, prefix="/hardware")
+    app.include_router(inventory_pages_router)
+    app.dependency_overrides[require_login] = lambda: None
+    return TestClient(app)
+
+
+def test_column_values_revalidate_until_a_write():
+    with create_client() as client:
+        url = "/column-values?table_name=inventory&column=donanim_tipi"
+        first = client.get(url)
+        etag = first.headers["ETag"]
+        assert first.json()["values"] == []
+
+        cached = client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+
+        # Other query parameters get their own ETag.
+        other = client.get(url + "x", headers={"If-None-Match": etag})
+        assert other.status_code == 200
+
+        client.post("/hardware/add", data={"no": "1", "donanim_tipi": "Laptop"})
+        fresh = client.get(url, headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert fresh.json()["values"] == ["Laptop"]
+        assert fresh.headers["ETag"] != etag
+
+
+def test_page_etag_follows_csrf_cookie():
+    with create_client() as client:
+        first = client.get("/inventory")
+        etag = first.headers["ETag"]
+        assert client.get("/inventory", headers={"If-None-Match": etag}).status_code == 304
+
+        # Rendering another page replaces the CSRF cookie, so the cached page's
+        # token is stale and must be rendered again.
+        client.get("/printer")
+        assert client.get("/inventory", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,78 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+from models import HardwareInventory, PrinterInventory
+from routes.search import router as search_router
+from services.fuzzy_index import build_fuzzy_index, fuzzy_index
+from utils.auth import require_login
+
+
+def test_fuzzy_search_tolerates_typos_and_follows_writes():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.engine = engine
+    models.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    db = models.SessionLocal()
+    pc = HardwareInventory(no="PC-100", bilgisayar_adi="MUHASEBE-PC01", seri_no="5CG1234XYZ")
+    db.add_all([pc, PrinterInventory(envanter_no="YZ-7", hostname="ofis-yazici-3")])
+    db.add(HardwareInventory(no="PC-200", bilgisayar_adi="DEPO-PC02", seri_no="8HJ9876QWE"))
+    db.commit()
+    pc_id = pc.id
+
+    app = FastAPI()
+    app.include_router(search_router)
+    app.dependency_overrides[require_login] = lambda: None
+    with TestClient(app) as client:
+        hits = client.get("/search/fuzzy", params={"q": "5CG1243XYZ"}).json()["results"]
+        assert hits[0]["id"] == pc_id
+        assert hits[0]["field"] == "seri_no"
+
+        hits = client.get("/search/fuzzy", params={"q": "ofis yazci"}).json()["results"]
+        assert (hits[0]["type"], hits[0]["no"]) == ("printer", "YZ-7")
+        only_hw = client.get("/search/fuzzy", params={"q": "ofis yazci", "type": "hardware"})
+        assert all(h["type"] == "hardware" for h in only_hw.json()["results"])
+
+        # Committed writes update the index without reloading it.
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+        pc.seri_no = "7TR5555ABC"
+        db.commit()
+        queries = len(statements)
+        hits = client.get("/search/fuzzy", params={"q": "7TR555ABC"}).json()["results"]
+        assert hits[0]["id"] == pc_id
+        assert len(statements) == queries
+        db.delete(pc)
+        db.commit()
+        hits = client.get("/search/fuzzy", params={"q": "7TR555ABC"}).json()["results"]
+        assert all(h["id"] != pc_id or h["type"] != "hardware" for h in hits)
+    fuzzy_index.clear()
+    db.close()
+
+
+def test_index_built_at_startup_serves_first_search():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.engine = engine
+    models.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    db = models.SessionLocal()
+    db.add(HardwareInventory(no="PC-300", bilgisayar_adi="LAB-PC03", seri_no="9ZX4321ABC"))
+    db.commit()
+    db.close()
+
+    build_fuzzy_index()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+    db = models.SessionLocal()
+    hits = fuzzy_index.search(db, "9ZX4312ABC")
+    assert hits[0]["no"] == "PC-300"
+    assert statements == []
+    fuzzy_index.clear()
+    db.close()
@@ -0,0 +1,92 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.middleware.sessions import SessionMiddleware
+
+import models
+from models import HardwareInventory, License, PrinterInventory, RequestItem, StockItem
+from routes.inventory_pages import router as inventory_pages_router
+from routes.search import router as search_router
+from utils.auth import require_login
+
+
+def test_search_groups_ranked_hits_and_follows_writes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    models.engine = engine
+    models.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    models.init_db()
+    db = models.SessionLocal()
+    pc = HardwareInventory(no="PC-100", sorumlu_personel="Çağrı Işık", marka="Dell")
+    db.add_all(
+        [
+            pc,
+            HardwareInventory(no="PC-200", sorumlu_personel="Ayşe Kaya", marka="HP"),
+            PrinterInventory(envanter_no="YZ-7", yazici_markasi="HP", notlar="Çağrı merkezi"),
+            StockItem(urun_adi="Dell klavye", kategori="inventory", adet=3, islem="giris"),
+            License(adi="Office", sorumlu_personel="Çağrı Işık"),
+        ]
+    )
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(search_router)
+    app.dependency_overrides[require_login] = lambda: None
+    with TestClient(app) as client:
+        body = client.get("/search", params={"q": "cagri isi"}).json()
+        groups = {g["type"]: g for g in body["groups"]}
+        # Every word must match; the printer only mentions "Çağrı".
+        assert list(groups) == ["hardware", "license_record"]
+        hit = groups["hardware"]["hits"][0]
+        assert (hit["id"], hit["title"], hit["url"]) == (pc.id, "PC-100", "/inventory?q=PC-100")
+        assert "<mark>Çağrı</mark>" in hit["snippet"]
+        assert groups["license_record"]["hits"][0]["url"].startswith("/licenses/")
+
+        dell = client.get("/search", params={"q": "dell"}).json()
+        assert [g["type"] for g in dell["groups"]] == ["hardware", "stock"]
+        # Title matches rank above body matches.
+        assert dell["groups"][1]["hits"][0]["title"] == "Dell klavye"
+
+        hp = client.get("/search", params={"q": "hp", "per_type": 1}).json()
+        assert hp["total"] == 2
+        assert all(len(g["hits"]) == 1 for g in hp["groups"])
+        only = client.get("/search", params={"q": "hp", "type": "printer"}).json()
+        assert [g["type"] for g in only["groups"]] == ["printer"]
+
+        pc.sorumlu_personel = "Mehmet Öz"
+        db.commit()
+        assert client.get("/search", params={"q": "ozz"}).json()["total"] == 0
+        assert client.get("/search", params={"q": "mehmet oz"}).json()["total"] == 1
+        db.delete(pc)
+        db.commit()
+        assert client.get("/search", params={"q": "mehmet"}).json()["total"] == 0
+    db.close()
+
+
+def test_request_hits_link_to_the_filtered_requests_page(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    models.engine = engine
+    models.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    models.init_db()
+    db = models.SessionLocal()
+    db.add_all(
+        [
+            RequestItem(kategori="aksesuar", urun_adi="Kablosuz mouse", ifs_no="IFS-1"),
+            RequestItem(kategori="aksesuar", urun_adi="Monitör", ifs_no="IFS-2"),
+        ]
+    )
+    db.commit()
+    db.close()
+
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    app.include_router(search_router)
+    app.include_router(inventory_pages_router)
+    app.dependency_overrides[require_login] = lambda: None
+    with TestClient(app) as client:
+        group = client.get("/search", params={"q": "kablosuz"}).json()["groups"][0]
+        url = group["hits"][0]["url"]
+        assert (group["type"], url) == ("request", "/requests?q=Kablosuz%20mouse")
+        page = client.get(url).text
+        assert "IFS-1" in page
+        assert "IFS-2" not in page
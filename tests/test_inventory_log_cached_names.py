@@ -0,0 +1,73 @@
+import sqlite3
+
+from services import log_service
+
+
+def setup_db(db_path):
+    con = sqlite3.connect(db_path)
+    con.executescript(
+        """
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY,
+            username TEXT,
+            first_name TEXT,
+            last_name TEXT
+        );
+        CREATE TABLE lookup_items (
+            id INTEGER PRIMARY KEY,
+            type TEXT,
+            name TEXT
+        );
+        """
+    )
+    for mig in [
+        "001_inventory_logs.sql",
+        "003_add_inventory_no_columns.sql",
+        "005_inventory_log_names.sql",
+        "019_inventory_log_name_refresh.sql",
+    ]:
+        with open(f"db/migrations/{mig}") as f:
+            con.executescript(f.read())
+    return con
+
+
+def test_names_are_cached_on_insert_and_refreshed(tmp_path):
+    db_file = tmp_path / "envanter.db"
+    con = setup_db(db_file)
+    con.execute("INSERT INTO users VALUES (1, 'u1', 'Ali', 'Veli')")
+    con.execute("INSERT INTO users VALUES (2, 'u2', NULL, NULL)")
+    con.execute("INSERT INTO lookup_items VALUES (10, 'lokasyon', 'Depo')")
+    con.execute(
+        "INSERT INTO inventory_logs (inventory_type, inventory_id, old_user_id, new_user_id, old_location, new_location, action, changed_by) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        ("pc", 1, 1, 2, "10", "Ofis", "move", 1),
+    )
+    con.commit()
+    cached = con.execute(
+        "SELECT old_user_name, new_user_name, changed_by_name, old_location_name, new_location_name FROM inventory_logs"
+    ).fetchone()
+    assert cached == ("Ali Veli", "u2", "Ali Veli", "Depo", None)
+
+    log_service.DB_PATH = str(db_file)
+    row = log_service.get_inventory_logs(inventory_type="pc", inventory_id=1)[0]
+    assert row["old_user_name"] == "Ali Veli"
+    assert row["new_user_name"] == "u2"
+    assert row["old_location"] == "Depo"
+    assert row["new_location"] == "Ofis"
+
+    # Renames made outside the application reach the cached names too.
+    con.execute("UPDATE users SET first_name = 'Ahmet', last_name = 'Kaya' WHERE id = 1")
+    con.execute("UPDATE lookup_items SET name = 'Ana Depo' WHERE id = 10")
+    con.commit()
+    row = log_service.get_inventory_logs(inventory_type="pc", inventory_id=1)[0]
+    assert row["old_user_name"] == "Ahmet Kaya"
+    assert row["changed_by_name"] == "Ahmet Kaya"
+    assert row["new_user_name"] == "u2"
+    assert row["old_location"] == "Ana Depo"
+
+    con.execute("UPDATE inventory_logs SET old_user_name = 'eski', old_location_name = NULL")
+    con.commit()
+    con.close()
+    log_service.refresh_inventory_log_names(user_ids=[1], location_ids=[10])
+    row = log_service.get_inventory_logs(inventory_type="pc", inventory_id=1)[0]
+    assert row["old_user_name"] == "Ahmet Kaya"
+    assert row["old_location"] == "Ana Depo"
@@ -0,0 +1,78 @@
+import os
+import sys
+import sqlite3
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from routes.inventory_logs import router as logs_router
+import services.log_service as log_service
+
+
+def setup_log_db(path):
+    con = sqlite3.connect(path)
+    for mig in ["001_inventory_logs.sql", "003_add_inventory_no_columns.sql"]:
+        with open(f"db/migrations/{mig}") as f:
+            con.executescript(f.read())
+    con.execute(
+        "CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, first_name TEXT, last_name TEXT)"
+    )
+    con.execute("CREATE TABLE lookup_items (id INTEGER PRIMARY KEY, name TEXT)")
+    # Two rows share a timestamp so the id tiebreaker is exercised.
+    dates = [
+        "2024-01-01 09:00:00",
+        "2024-01-02 09:00:00",
+        "2024-01-02 09:00:00",
+        "2024-01-03 09:00:00",
+        "2024-01-04 09:00:00",
+    ]
+    for d in dates:
+        con.execute(
+            "INSERT INTO inventory_logs (inventory_type, inventory_id, action, changed_by, change_date) VALUES ('pc', 1, 'move', 1, ?)",
+            (d,),
+        )
+    con.commit()
+    con.close()
+
+
+def create_app():
+    app = FastAPI()
+    app.include_router(logs_router)
+    return app
+
+
+def test_logs_page_through_history_with_cursors(tmp_path):
+    log_db = tmp_path / "logs.db"
+    setup_log_db(log_db)
+    log_service.DB_PATH = str(log_db)
+    with TestClient(create_app()) as client:
+        seen = []
+        resp = client.get("/logs", params={"limit": 2})
+        while True:
+            assert resp.status_code == 200
+            seen.extend(row["id"] for row in resp.json())
+            cursor = resp.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            resp = client.get("/logs", params={"limit": 2, "before": cursor})
+        assert seen == [5, 4, 3, 2, 1]
+
+        first_page = client.get("/logs", params={"limit": 2})
+        cursor = first_page.headers["X-Next-Cursor"]
+        resp = client.get("/logs", params={"limit": 2, "after": cursor})
+        assert [row["id"] for row in resp.json()] == [5]
+
+        resp = client.get("/logs", params={"before": "not-a-cursor"})
+        assert resp.status_code == 400
+
+
+def test_logs_filter_by_date_range(tmp_path):
+    log_db = tmp_path / "logs.db"
+    setup_log_db(log_db)
+    log_service.DB_PATH = str(log_db)
+    with TestClient(create_app()) as client:
+        resp = client.get("/logs", params={"from": "2024-01-02", "to": "2024-01-03"})
+        assert [row["id"] for row in resp.json()] == [4, 3, 2]
+        assert "X-Next-Cursor" not in resp.headers
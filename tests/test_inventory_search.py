@@ -0,0 +1,57 @@
+import sqlite3
+
+from services import log_service
+
+
+def setup_db(path):
+    con = sqlite3.connect(path)
+    con.executescript(
+        """
+        CREATE TABLE hardware_inventory (id INTEGER PRIMARY KEY, bilgisayar_adi TEXT, no TEXT);
+        CREATE TABLE license_inventory (id INTEGER PRIMARY KEY, yazilim_adi TEXT, envanter_no TEXT);
+        CREATE TABLE accessory_inventory (id INTEGER PRIMARY KEY, urun_adi TEXT, ifs_no TEXT);
+        CREATE TABLE stock_tracking (id INTEGER PRIMARY KEY, urun_adi TEXT);
+        INSERT INTO hardware_inventory VALUES (1, 'Muhasebe PC', 'PC-100');
+        INSERT INTO license_inventory VALUES (1, 'Office', 'LIC-7');
+        """
+    )
+    with open("db/migrations/008_inventory_numbers.sql") as f:
+        con.executescript(f.read())
+    return con
+
+
+def test_search_is_kept_current_by_triggers(tmp_path):
+    db_file = tmp_path / "envanter.db"
+    con = setup_db(db_file)
+    con.execute("INSERT INTO hardware_inventory VALUES (2, 'Depo PC', 'XPC-200')")
+    con.execute("INSERT INTO accessory_inventory VALUES (1, 'Klavye', 'ACC-1')")
+    con.execute("UPDATE license_inventory SET envanter_no = 'LIC-8' WHERE id = 1")
+    con.commit()
+    con.close()
+    log_service.DB_PATH = str(db_file)
+
+    results = log_service.search_inventory_items("pc")
+    # Prefix matches come before substring matches.
+    assert [r["inv_no"] for r in results] == ["PC-100", "XPC-200"]
+    assert log_service.search_inventory_items("klav") == [
+        {"type": "accessory", "id": 1, "name": "Klavye", "inv_no": "ACC-1"}
+    ]
+    assert log_service.search_inventory_items("LIC-7") == []
+    assert log_service.search_inventory_items("%") == []
+
+    assert log_service.find_inventory_item("LIC-8") == ("license", 1)
+    assert log_service.find_inventory_item("pc-100") is None
+
+    with sqlite3.connect(db_file) as con:
+        con.execute("DELETE FROM hardware_inventory WHERE id = 1")
+    assert log_service.find_inventory_item("PC-100") is None
+
+
+def test_find_falls_back_without_index_table(tmp_path):
+    db_file = tmp_path / "envanter.db"
+    with sqlite3.connect(db_file) as con:
+        con.execute("CREATE TABLE stock_tracking (id INTEGER PRIMARY KEY, urun_adi TEXT)")
+        con.execute("INSERT INTO stock_tracking VALUES (5, 'Kablo')")
+    log_service.DB_PATH = str(db_file)
+    assert log_service.find_inventory_item("5") == ("stock", 5)
+    assert log_service.search_inventory_items("kab")[0]["inv_no"] == "5"
@@ -0,0 +1,69 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.middleware.sessions import SessionMiddleware
+
+import models
+import utils
+from models import LicenseInventory
+from routes.common_list import fetch_page
+from routes.inventory_pages import router as inventory_pages_router
+from services.cache import SnapshotCache
+from utils.auth import require_login
+
+
+def test_license_pages_are_served_from_cache_until_a_write():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.engine = utils.engine = engine
+    models.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    db = models.SessionLocal()
+    db.add_all([LicenseInventory(yazilim_adi=f"Office {n}") for n in range(30)])
+    db.commit()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    app.include_router(inventory_pages_router)
+    app.dependency_overrides[require_login] = lambda: None
+    with TestClient(app) as client:
+        assert "Office 29" in client.get("/license?page=2").text
+        assert "Office 0" in client.get("/license?page=1").text
+        queries = len(statements)
+        assert "Office 29" in client.get("/license?page=2").text
+        assert "Office 0" in client.get("/license?page=1").text
+        assert len(statements) == queries
+
+        db.add(LicenseInventory(yazilim_adi="Office 30"))
+        db.commit()
+        assert "Office 30" in client.get("/license?page=2").text
+    db.close()
+
+
+def test_cached_rows_hold_only_data_columns():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(LicenseInventory(yazilim_adi="Office", departman="Muhasebe"))
+    db.commit()
+    _, rows = fetch_page(db, LicenseInventory, [], "office", 1, 25, "departman")
+    assert list(rows[0]._fields) == [c.name for c in models.data_columns(LicenseInventory)]
+    db.close()
+
+
+def test_snapshot_cache_evicts_least_recently_used_over_memory_cap():
+    cache = SnapshotCache((), ttl=60, max_bytes=4000)
+    for key in range(10):
+        cache.get(key, lambda: tuple(range(100)))
+    assert cache.size_bytes <= 4000
+    loads = []
+    cache.get(9, lambda: loads.append(9))
+    cache.get(0, lambda: loads.append(0))
+    assert loads == [0]
@@ -0,0 +1,61 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.middleware.sessions import SessionMiddleware
+
+import models
+import utils
+from models import HardwareInventory
+from routes.common_list import fetch_page, sort_order
+from routes.inventory_pages import router as inventory_pages_router
+from utils.auth import require_login
+
+
+def test_list_sorts_by_turkish_sort_keys_without_temp_sort():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    for name in ["Zeynep", "çağla", "Ilgın", "Can", "İpek", "Ömer", "Oya"]:
+        db.add(HardwareInventory(no=name[:2], sorumlu_personel=name))
+    db.commit()
+
+    _, rows = fetch_page(db, HardwareInventory, [], "", 1, 25, "sorumlu_personel")
+    assert [r.sorumlu_personel for r in rows] == [
+        "Can", "çağla", "Ilgın", "İpek", "Oya", "Ömer", "Zeynep"
+    ]
+    _, rows = fetch_page(db, HardwareInventory, [], "", 1, 2, "-sorumlu_personel")
+    assert [r.sorumlu_personel for r in rows] == ["Zeynep", "Ömer"]
+
+    query = db.query(HardwareInventory.id).order_by(
+        *sort_order(HardwareInventory, "-sorumlu_personel")
+    )
+    plan = " ".join(
+        str(row[-1])
+        for row in db.execute(text("EXPLAIN QUERY PLAN " + str(query.statement.compile(engine))))
+    )
+    assert "TEMP B-TREE" not in plan
+    assert "sorumlu_personel_sort" in plan
+    db.close()
+
+
+def test_search_and_filter_form_keeps_sort():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.engine = utils.engine = engine
+    models.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    app.include_router(inventory_pages_router)
+    app.dependency_overrides[require_login] = lambda: None
+    with TestClient(app) as client:
+        page = client.get("/inventory?sort=-departman").text
+        start = page.index('id="search-form"')
+        form = page[start : page.index("</form>", start)]
+        assert '<input type="hidden" name="sort" value="-departman">' in form
+        assert 'name="sort"' not in client.get("/inventory").text
@@ -0,0 +1,65 @@
+import asyncio
+import sqlite3
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from logs import InventoryLogCreate
+from services import log_service
+from services.broadcaster import Broadcaster
+
+
+def test_broadcaster_drops_oldest_events_for_slow_clients():
+    async def scenario():
+        hub = Broadcaster(queue_size=2)
+        queue = hub.subscribe()
+        for n in range(3):
+            hub.publish("activity", {"n": n})
+        await asyncio.sleep(0)
+        received = [queue.get_nowait(), queue.get_nowait()]
+        hub.unsubscribe(queue)
+        assert hub.subscriber_count() == 0
+        return received
+
+    assert asyncio.run(scenario()) == [("activity", {"n": 1}), ("activity", {"n": 2})]
+
+
+def test_staged_logs_are_published_only_after_commit(tmp_path, monkeypatch):
+    db_file = tmp_path / "envanter.db"
+    con = sqlite3.connect(db_file)
+    for mig in ["001_inventory_logs.sql", "003_add_inventory_no_columns.sql"]:
+        with open(f"db/migrations/{mig}") as f:
+            con.executescript(f.read())
+    con.execute(
+        "CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, first_name TEXT, last_name TEXT)"
+    )
+    con.execute("INSERT INTO users VALUES (2, 'ayse', 'Ayşe', 'Kaya')")
+    con.commit()
+    con.close()
+    monkeypatch.setattr(log_service, "DB_PATH", str(db_file))
+    monkeypatch.setattr(log_service.broadcaster, "subscriber_count", lambda: 1)
+    published = []
+    monkeypatch.setattr(
+        log_service.broadcaster, "publish", lambda event, data: published.append((event, data))
+    )
+    Session = sessionmaker(bind=create_engine(f"sqlite:///{db_file}"))
+    payload = InventoryLogCreate(
+        inventory_type="pc", inventory_id=1, action="assign", changed_by=1, new_user_id=2
+    )
+
+    db = Session()
+    log_service.stage_inventory_log(db, payload)
+    db.rollback()
+    assert published == []
+
+    log_service.stage_inventory_log(db, payload)
+    assert published == []
+    db.commit()
+    db.close()
+    assert [(event, data["inventory_id"], data["new_user_id"]) for event, data in published] == [
+        ("inventory_log", 1, 2)
+    ]
+    # Events render like the page: display names and a server timestamp.
+    data = published[0][1]
+    assert data["new_user_name"] == "Ayşe Kaya"
+    assert len(data["change_date"]) == 19
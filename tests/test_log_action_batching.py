@@ -0,0 +1,62 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+from models import ActivityLog
+from services.activity_log import ActivityLogWriter
+import services.activity_log as activity_module
+import utils
+
+
+def setup_in_memory_db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    return TestingSessionLocal
+
+
+def test_entries_are_buffered_until_flush():
+    SessionLocal = setup_in_memory_db()
+    writer = ActivityLogWriter(max_batch=10, flush_interval=60)
+    original = activity_module.activity_writer
+    utils.activity_writer = writer
+    db = SessionLocal()
+    try:
+        utils.log_action(db, "alice", "Added stock item 1")
+        utils.log_action(db, "bob", "Added stock item 2")
+        assert db.query(ActivityLog).count() == 0
+        assert writer.pending() == 2
+
+        assert writer.flush() == 2
+        rows = db.query(ActivityLog).order_by(ActivityLog.id).all()
+        assert [(r.username, r.action) for r in rows] == [
+            ("alice", "Added stock item 1"),
+            ("bob", "Added stock item 2"),
+        ]
+        assert all(r.timestamp is not None for r in rows)
+    finally:
+        utils.activity_writer = original
+        db.close()
+
+
+def test_full_batch_is_written_immediately():
+    SessionLocal = setup_in_memory_db()
+    writer = ActivityLogWriter(max_batch=3, flush_interval=60)
+    db = SessionLocal()
+    try:
+        for i in range(3):
+            writer.add(db.get_bind(), "alice", f"action {i}")
+        assert writer.pending() == 0
+        assert db.query(ActivityLog).count() == 3
+    finally:
+        db.close()
@@ -0,0 +1,62 @@
+import sqlite3
+from datetime import datetime
+
+from services import archive_service, log_service
+
+
+def setup_db(path):
+    con = sqlite3.connect(path)
+    con.executescript(
+        """
+        CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, first_name TEXT, last_name TEXT);
+        CREATE TABLE lookup_items (id INTEGER PRIMARY KEY, type TEXT, name TEXT);
+        CREATE TABLE activity_log (id INTEGER PRIMARY KEY, username TEXT, action TEXT, timestamp DATETIME);
+        """
+    )
+    for mig in [
+        "001_inventory_logs.sql",
+        "003_add_inventory_no_columns.sql",
+        "005_inventory_log_names.sql",
+    ]:
+        with open(f"db/migrations/{mig}") as f:
+            con.executescript(f.read())
+    dates = ["2022-03-01 10:00:00", "2022-06-01 10:00:00", "2024-02-01 10:00:00", "2024-03-01 10:00:00"]
+    for d in dates:
+        con.execute(
+            "INSERT INTO inventory_logs (inventory_type, inventory_id, action, changed_by, change_date) VALUES ('pc', 1, 'move', 1, ?)",
+            (d,),
+        )
+        con.execute(
+            "INSERT INTO activity_log (username, action, timestamp) VALUES ('admin', 'x', ?)", (d,)
+        )
+    con.commit()
+    con.close()
+
+
+def test_old_rows_move_to_archive_and_stay_readable(tmp_path):
+    db_file = tmp_path / "envanter.db"
+    setup_db(db_file)
+    moved = archive_service.archive_logs(str(db_file), before=datetime(2023, 1, 1), batch_size=1)
+    assert moved == {"inventory_logs": 2, "activity_log": 2}
+    assert (tmp_path / "envanter_archive.db").exists()
+    with sqlite3.connect(db_file) as con:
+        assert con.execute("SELECT COUNT(*) FROM inventory_logs").fetchone()[0] == 2
+        assert archive_service.archive_boundary(con, "inventory_logs") == "2023-01-01 00:00:00"
+
+    log_service.DB_PATH = str(db_file)
+    # The hot table satisfies the page, so the archive is not consulted.
+    assert [r["id"] for r in log_service.get_inventory_logs(limit=2)] == [4, 3]
+    # Short pages continue into the archive transparently.
+    rows = log_service.get_inventory_logs(limit=10)
+    assert [r["id"] for r in rows] == [4, 3, 2, 1]
+    cursor = log_service.next_cursor(rows[:3], 3)
+    assert [r["id"] for r in log_service.get_inventory_logs(limit=3, before=cursor)] == [1]
+    recent = log_service.get_inventory_logs(limit=10, date_from="2024-01-01 00:00:00")
+    assert [r["id"] for r in recent] == [4, 3]
+    assert len(log_service.get_activity_logs(limit=10)) == 4
+
+    # Archiving again is a no-op for rows already moved.
+    assert archive_service.archive_logs(str(db_file), before=datetime(2023, 1, 1)) == {
+        "inventory_logs": 0,
+        "activity_log": 0,
+    }
@@ -0,0 +1,66 @@
+import os
+import sys
+import sqlite3
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from routes.inventory_logs import router as logs_router
+import services.log_service as log_service
+from utils.auth import require_admin
+
+
+def setup_log_db(path):
+    con = sqlite3.connect(path)
+    con.execute(
+        "CREATE TABLE activity_log (id INTEGER PRIMARY KEY, username TEXT, action TEXT, timestamp DATETIME)"
+    )
+    with open("db/migrations/009_activity_log_indexes.sql") as f:
+        con.executescript(f.read())
+    entries = [
+        ("admin", "Added hardware 1", "2024-01-01 09:00:00"),
+        ("ali", "Deleted license 2", "2024-01-02 09:00:00"),
+        ("admin", "Deleted stock 3", "2024-01-02 09:00:00"),
+        ("admin", "Added license 4", "2024-01-03 09:00:00"),
+    ]
+    con.executemany(
+        "INSERT INTO activity_log (username, action, timestamp) VALUES (?, ?, ?)", entries
+    )
+    con.commit()
+    return con
+
+
+def create_app():
+    app = FastAPI()
+    app.include_router(logs_router)
+    app.dependency_overrides[require_admin] = lambda: None
+    return app
+
+
+def test_activity_api_pages_with_cursor_and_filters(tmp_path):
+    log_db = tmp_path / "logs.db"
+    con = setup_log_db(log_db)
+    log_service.DB_PATH = str(log_db)
+    with TestClient(create_app()) as client:
+        resp = client.get("/logs/activity", params={"limit": 2})
+        assert [r["id"] for r in resp.json()] == [4, 3]
+        resp = client.get(
+            "/logs/activity", params={"limit": 2, "before": resp.headers["X-Next-Cursor"]}
+        )
+        assert [r["id"] for r in resp.json()] == [2, 1]
+
+        resp = client.get("/logs/activity", params={"action": "Deleted"})
+        assert [r["id"] for r in resp.json()] == [3, 2]
+        resp = client.get("/logs/activity", params={"username": "admin", "action": "Added"})
+        assert [r["id"] for r in resp.json()] == [4, 1]
+        assert "X-Next-Cursor" not in resp.headers
+
+    plan = con.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM activity_log WHERE username = ? "
+        "ORDER BY timestamp DESC, id DESC LIMIT 10",
+        ("admin",),
+    ).fetchall()
+    assert any("idx_activity_log_user_time" in row[3] for row in plan)
+    con.close()
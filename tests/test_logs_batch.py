@@ -0,0 +1,86 @@
+import json
+import os
+import sys
+import sqlite3
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from routes.inventory_logs import router as logs_router
+import services.log_service as log_service
+
+
+def setup_log_db(path):
+    con = sqlite3.connect(path)
+    for mig in ["001_inventory_logs.sql", "003_add_inventory_no_columns.sql"]:
+        with open(f"db/migrations/{mig}") as f:
+            con.executescript(f.read())
+    con.execute(
+        "CREATE TABLE hardware_inventory (id INTEGER PRIMARY KEY, bilgisayar_adi TEXT, no TEXT)"
+    )
+    con.executemany(
+        "INSERT INTO hardware_inventory (id, bilgisayar_adi, no) VALUES (?, ?, ?)",
+        [(1, "PC1", "INV001"), (2, "PC2", "INV002")],
+    )
+    con.commit()
+    con.close()
+
+
+def create_app():
+    app = FastAPI()
+    app.include_router(logs_router)
+    return app
+
+
+def test_batch_inserts_json_array_and_resolves_inventory_numbers(tmp_path):
+    log_db = tmp_path / "logs.db"
+    setup_log_db(log_db)
+    log_service.DB_PATH = str(log_db)
+    events = [
+        {"inventory_type": "pc", "inventory_id": 1, "action": "assign", "changed_by": 1, "new_user_id": 5},
+        {"inventory_type": "pc", "inventory_id": 2, "action": "move", "changed_by": 1, "new_location": "Depo"},
+        {
+            "inventory_type": "pc",
+            "inventory_id": 2,
+            "action": "relabel",
+            "changed_by": 1,
+            "old_inventory_no": "OLD",
+            "new_inventory_no": "NEW",
+        },
+    ]
+    with TestClient(create_app()) as client:
+        resp = client.post("/logs/batch", json=events)
+        assert resp.status_code == 200
+        assert resp.json() == {"ok": True, "count": 3}
+    with sqlite3.connect(log_db) as con:
+        rows = con.execute(
+            "SELECT inventory_id, action, new_inventory_no FROM inventory_logs ORDER BY id"
+        ).fetchall()
+    assert rows == [(1, "assign", "INV001"), (2, "move", "INV002"), (2, "relabel", "NEW")]
+
+
+def test_batch_accepts_ndjson_and_rejects_invalid_batches(tmp_path):
+    log_db = tmp_path / "logs.db"
+    setup_log_db(log_db)
+    log_service.DB_PATH = str(log_db)
+    lines = [
+        {"inventory_type": "pc", "inventory_id": 1, "action": "return", "changed_by": 1},
+        {"inventory_type": "pc", "inventory_id": 2, "action": "return", "changed_by": 1},
+    ]
+    with TestClient(create_app()) as client:
+        resp = client.post(
+            "/logs/batch",
+            content="\n".join(json.dumps(line) for line in lines),
+            headers={"content-type": "application/x-ndjson"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["count"] == 2
+
+        bad = lines + [{"inventory_type": "pc", "inventory_id": 3, "action": "explode", "changed_by": 1}]
+        resp = client.post("/logs/batch", json=bad)
+        assert resp.status_code == 422
+        assert resp.json()["detail"][0]["loc"][0] == 2
+    with sqlite3.connect(log_db) as con:
+        assert con.execute("SELECT COUNT(*) FROM inventory_logs").fetchone()[0] == 2
@@ -0,0 +1,45 @@
+import os
+import sqlite3
+
+from sqlalchemy import create_engine
+
+import models
+import utils
+
+# Columns init_db adds in Python to databases created before they existed.
+UPGRADED = {
+    "printer_inventory": ("envanter_no",),
+    "accessory_inventory": ("ifs_no",),
+    "license_inventory": ("ifs_no",),
+    "stock_tracking": ("ifs_no",),
+    "request_tracking": ("ifs_no",),
+    "hardware_inventory": ("ifs_no", "tarih"),
+}
+
+
+def test_migrations_run_on_databases_missing_upgraded_columns(tmp_path, monkeypatch):
+    path = tmp_path / "old.db"
+    engine = create_engine(f"sqlite:///{path}")
+    monkeypatch.setattr(models, "engine", engine)
+    monkeypatch.setattr(utils, "engine", engine)
+    models.Base.metadata.create_all(bind=engine)
+    with sqlite3.connect(path) as con:
+        for table, columns in UPGRADED.items():
+            for column in columns:
+                for row in con.execute(f"PRAGMA index_list({table})").fetchall():
+                    info = con.execute(f"PRAGMA index_info({row[1]})").fetchall()
+                    if column in [col[2] for col in info]:
+                        con.execute(f"DROP INDEX {row[1]}")
+                con.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+
+    # 008 and 014 read the upgraded columns, so the column upgrades must run
+    # first; the migrations only ALTER inventory_logs, which they don't touch.
+    models.init_db()
+    migrations = os.listdir(os.path.join(os.path.dirname(models.__file__), "db", "migrations"))
+    with sqlite3.connect(path) as con:
+        applied = {row[0] for row in con.execute("SELECT filename FROM schema_migrations")}
+        assert applied == {name for name in migrations if name.endswith(".sql")}
+        for table, columns in UPGRADED.items():
+            cols = {row[1] for row in con.execute(f"PRAGMA table_info({table})")}
+            assert set(columns) <= cols, table
+    engine.dispose()
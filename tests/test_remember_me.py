@@ -0,0 +1,64 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.middleware.sessions import SessionMiddleware
+
+import models
+from models import RememberToken, User
+from utils.auth import RememberMeMiddleware, remember_tokens
+
+
+def test_remember_token_restores_session_from_cache():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.engine = engine
+    models.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    remember_tokens.clear()
+    db = models.SessionLocal()
+    user = User(username="ayse", first_name="Ayşe", last_name="Kaya", is_admin=False)
+    db.add(user)
+    db.commit()
+    db.add(RememberToken(user_id=user.id, token="tok"))
+    db.commit()
+
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    app = FastAPI()
+    app.add_middleware(RememberMeMiddleware)
+    app.add_middleware(SessionMiddleware, secret_key="test")
+
+    @app.get("/me")
+    def me(request: Request):
+        return {"user": request.session.get("full_name")}
+
+    @app.get("/static/app.css")
+    def asset():
+        return {}
+
+    with TestClient(app) as client:
+        client.cookies.set("session_token", "tok")
+        assert client.get("/me").json() == {"user": "Ayşe Kaya"}
+        assert len(queries) == 2  # token, then user
+        # The session is signed in now, and assets never look at the token.
+        assert client.get("/me").json() == {"user": "Ayşe Kaya"}
+        assert client.get("/static/app.css").status_code == 200
+        assert len(queries) == 2
+
+    # A new browser session with the same token is served from the cache.
+    with TestClient(app, cookies={"session_token": "tok"}) as client:
+        assert client.get("/me").json() == {"user": "Ayşe Kaya"}
+        assert len(queries) == 2
+
+    # Logging out deletes the token and invalidates the cache.
+    db.query(RememberToken).filter(RememberToken.token == "tok").delete()
+    db.commit()
+    db.close()
+    with TestClient(app, cookies={"session_token": "tok"}) as client:
+        response = client.get("/me")
+        assert response.json() == {"user": None}
+        assert 'session_token=""' in response.headers["set-cookie"]
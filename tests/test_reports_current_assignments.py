@@ -44,3 +44,44 @@ def test_current_assignments_returns_latest(tmp_path):
         assert len(data) == 2
         item1 = [d for d in data if d["inventory_id"] == 1][0]
         assert item1["user_id"] == 20
+
+
+def test_current_state_table_is_backfilled_and_maintained(tmp_path):
+    db_file = tmp_path / "envanter.db"
+    con = setup_db(db_file)
+    cur = con.cursor()
+    cur.execute(
+        "INSERT INTO inventory_logs (inventory_type, inventory_id, new_user_id, new_location, action, changed_by, change_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ("pc", 1, 10, "A", "assign", 1, "2024-01-01 10:00:00"),
+    )
+    with open("db/migrations/006_inventory_current_state.sql") as f:
+        con.executescript(f.read())
+    # Newer event replaces the backfilled state ...
+    cur.execute(
+        "INSERT INTO inventory_logs (inventory_type, inventory_id, new_user_id, new_location, action, changed_by, change_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ("pc", 1, 20, "B", "assign", 2, "2024-01-02 10:00:00"),
+    )
+    # ... while a back-dated one does not.
+    cur.execute(
+        "INSERT INTO inventory_logs (inventory_type, inventory_id, new_user_id, new_location, action, changed_by, change_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ("pc", 1, 30, "C", "assign", 3, "2023-12-31 10:00:00"),
+    )
+    cur.execute(
+        "INSERT INTO inventory_logs (inventory_type, inventory_id, new_user_id, new_location, action, changed_by) VALUES (?, ?, ?, ?, ?, ?)",
+        ("license", 5, 20, "D", "assign", 1),
+    )
+    con.commit()
+    assert con.execute("SELECT COUNT(*) FROM inventory_current_state").fetchone()[0] == 2
+    con.close()
+
+    reports_module.DB_PATH = str(db_file)
+    app = FastAPI()
+    app.include_router(reports_module.router)
+    with TestClient(app) as client:
+        resp = client.get("/reports/current-assignments?inv_type=pc")
+        data = resp.json()
+        assert len(data) == 1
+        assert data[0]["user_id"] == 20
+        assert data[0]["location"] == "B"
+        resp = client.get("/reports/current-assignments?user_id=20")
+        assert {d["inventory_type"] for d in resp.json()} == {"pc", "license"}
@@ -0,0 +1,109 @@
+import sqlite3
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+import utils
+from models import HardwareInventory
+from routes.common_list import fetch_page
+from services.search_text import normalize_tr
+
+
+def test_normalize_tr_folds_turkish_letters():
+    assert normalize_tr("İSTANBUL") == "istanbul"
+    assert normalize_tr("IŞIK") == normalize_tr("ışık") == "isik"
+    assert normalize_tr("Çağrı Göğüş") == "cagri gogus"
+
+
+def test_search_matches_turkish_case_and_diacritics():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    item = HardwareInventory(no="PC-1", departman="IŞIK Üretim", fabrika="İSTANBUL")
+    db.add(item)
+    db.add(HardwareInventory(no="PC-2", departman="Muhasebe"))
+    db.commit()
+
+    for q in ("ışık", "ISIK", "istanbul", "uretim"):
+        count, rows = fetch_page(db, HardwareInventory, [], q, 1, 25)
+        assert [r.no for r in rows] == ["PC-1"], q
+    # Wildcards in the query are matched literally.
+    assert fetch_page(db, HardwareInventory, [], "%", 1, 25)[0] == 0
+
+    item.departman = "Depo"
+    db.commit()
+    assert fetch_page(db, HardwareInventory, [], "ışık", 1, 25)[0] == 0
+    db.close()
+
+
+def test_init_db_backfills_existing_rows(tmp_path, monkeypatch):
+    path = tmp_path / "old.db"
+    engine = create_engine(f"sqlite:///{path}")
+    monkeypatch.setattr(models, "engine", engine)
+    monkeypatch.setattr(utils, "engine", engine)
+    models.Base.metadata.create_all(bind=engine)
+    with sqlite3.connect(path) as con:
+        # Rows written before the column existed, or by raw SQL.
+        con.execute("INSERT INTO hardware_inventory (no, departman) VALUES ('PC-9', 'IŞIK')")
+    models.init_db()
+    with sqlite3.connect(path) as con:
+        assert con.execute(
+            "SELECT search_norm, departman_norm FROM hardware_inventory"
+        ).fetchone() == ("pc-9\nisik", "isik")
+    assert "search_norm" not in utils.get_table_columns("hardware_inventory")
+    engine.dispose()
+
+
+def test_prefix_hits_rank_first_without_hiding_substring_matches():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all(
+        [
+            HardwareInventory(no="PC-1", marka="Dell"),
+            HardwareInventory(no="PC-2", bilgisayar_adi="muhasebe-dell"),
+            HardwareInventory(no="PC-3", bilgisayar_adi="DELL-LAB"),
+            HardwareInventory(no="PC-4", marka="HP"),
+        ]
+    )
+    db.commit()
+
+    count, rows = fetch_page(db, HardwareInventory, [], "dell", 1, 25)
+    assert count == 3
+    assert [r.no for r in rows] == ["PC-3", "PC-1", "PC-2"]
+    _, rows = fetch_page(db, HardwareInventory, [], "dell", 1, 25, "-no")
+    assert [r.no for r in rows] == ["PC-3", "PC-2", "PC-1"]
+    db.close()
+
+
+def test_raw_updates_stay_searchable(tmp_path, monkeypatch):
+    path = tmp_path / "inv.db"
+    engine = create_engine(f"sqlite:///{path}")
+    SessionLocal = sessionmaker(bind=engine)
+    monkeypatch.setattr(models, "engine", engine)
+    monkeypatch.setattr(utils, "engine", engine)
+    models.init_db()
+    db = SessionLocal()
+    db.add(HardwareInventory(no="PC-1", departman="Muhasebe"))
+    db.commit()
+    with sqlite3.connect(path) as con:
+        con.execute("UPDATE hardware_inventory SET departman = 'Bilgi Islem'")
+        assert con.execute(
+            "SELECT search_norm, departman_norm, departman_sort FROM hardware_inventory"
+        ).fetchone() == (None, None, None)
+
+    assert fetch_page(db, HardwareInventory, [], "bilgi", 1, 25)[0] == 1
+    assert fetch_page(db, HardwareInventory, [], "muhasebe", 1, 25)[0] == 0
+    db.close()
+    models.init_db()
+    with sqlite3.connect(path) as con:
+        assert con.execute(
+            "SELECT departman_norm FROM hardware_inventory"
+        ).fetchone() == ("bilgi islem",)
+    engine.dispose()
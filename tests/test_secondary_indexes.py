@@ -0,0 +1,33 @@
+import sqlite3
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import models
+from models import HardwareInventory
+
+
+def test_migration_creates_recommended_indexes(tmp_path, caplog):
+    path = tmp_path / "indexes.db"
+    models.engine = create_engine(f"sqlite:///{path}")
+    models.SessionLocal = sessionmaker(bind=models.engine)
+    models.init_db()
+    assert not [r for r in caplog.records if "Recommended index" in r.getMessage()]
+
+    db = models.SessionLocal()
+    query = db.query(HardwareInventory).filter(HardwareInventory.no == "PC-1")
+    sql = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+    db.close()
+
+    with sqlite3.connect(path) as con:
+        plan = " ".join(row[-1] for row in con.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        assert "USING INDEX idx_hardware_inventory_no" in plan
+        assert models.missing_indexes(con) == []
+        con.execute("DROP INDEX idx_lookup_items_type_name")
+        con.execute("CREATE INDEX other_name ON lookup_items (type, name, id)")
+        con.execute("DROP INDEX idx_stock_tracking_kategori")
+        assert models.missing_indexes(con) == [("stock_tracking", ("kategori",))]
+
+    caplog.clear()
+    models.init_db()
+    assert "stock_tracking (kategori)" in caplog.text
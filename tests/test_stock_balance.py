@@ -0,0 +1,60 @@
+import sqlite3
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import models
+from models import StockItem
+from services import stock_service
+
+
+def setup_db(path):
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    with sqlite3.connect(path) as con:
+        with open("db/migrations/011_stock_balance.sql") as f:
+            con.executescript(f.read())
+    return engine
+
+
+def test_ledger_follows_inserts_updates_and_deletes(tmp_path, monkeypatch):
+    engine = setup_db(tmp_path / "envanter.db")
+    monkeypatch.setattr(models, "engine", engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all(
+        [
+            StockItem(urun_adi="Mouse", kategori="Çevre", departman="Depo", adet=10, islem="giris"),
+            StockItem(urun_adi="Mouse", kategori="Çevre", departman="Depo", adet=3, islem="cikis"),
+            StockItem(urun_adi="Kablo", adet=5, islem="giris"),
+        ]
+    )
+    db.commit()
+    assert stock_service.stock_totals(db) == [("Kablo", 5), ("Mouse", 7)]
+
+    # Assign/transfer lower ``adet`` on the movement row.
+    kablo = db.query(StockItem).filter_by(urun_adi="Kablo").one()
+    kablo.adet = 2
+    db.commit()
+    assert stock_service.stock_totals(db) == [("Kablo", 2), ("Mouse", 7)]
+
+    db.delete(kablo)
+    db.commit()
+    assert stock_service.stock_totals(db) == [("Mouse", 7)]
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM stock_balance").scalar() == 1
+
+        conn.exec_driver_sql("UPDATE stock_balance SET net_adet = 999")
+        conn.commit()
+    assert stock_service.rebuild_stock_balance() == 1
+    assert stock_service.stock_totals(db) == [("Mouse", 7)]
+    db.close()
+
+
+def test_totals_fall_back_to_aggregation_without_ledger(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plain.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(StockItem(urun_adi="Mouse", adet=4, islem="giris"))
+    db.commit()
+    assert stock_service.stock_totals(db) == [("Mouse", 4)]
+    db.close()
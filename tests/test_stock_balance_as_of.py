@@ -0,0 +1,81 @@
+import sqlite3
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import models
+from models import StockItem
+from services import stock_service
+
+
+def setup_db(path):
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    with sqlite3.connect(path) as con:
+        for mig in ("012_stock_balance_snapshots.sql", "016_stock_snapshot_dates.sql"):
+            with open(f"db/migrations/{mig}", encoding="utf-8") as f:
+                con.executescript(f.read())
+    return engine
+
+
+def balances(result):
+    return {b["urun_adi"]: b["net_adet"] for b in result["balances"]}
+
+
+def test_balance_as_of_uses_nearest_snapshot(tmp_path, monkeypatch):
+    engine = setup_db(tmp_path / "envanter.db")
+    monkeypatch.setattr(models, "engine", engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all(
+        [
+            StockItem(urun_adi="Mouse", adet=10, islem="giris", tarih=date(2024, 1, 5)),
+            StockItem(urun_adi="Mouse", adet=4, islem="cikis", tarih=date(2024, 1, 20)),
+            StockItem(urun_adi="Kablo", adet=7, islem="giris", tarih=date(2024, 2, 1)),
+            StockItem(urun_adi="Mouse", adet=1, islem="cikis", tarih=date(2024, 3, 1)),
+        ]
+    )
+    db.commit()
+    expected = {
+        date(2024, 1, 1): {},
+        date(2024, 1, 31): {"Mouse": 6},
+        date(2024, 2, 29): {"Mouse": 6, "Kablo": 7},
+        date(2024, 3, 31): {"Mouse": 5, "Kablo": 7},
+    }
+    # The first lookup writes the missing snapshots.
+    assert balances(stock_service.stock_balance_as_of(date(2024, 1, 1))) == {}
+    assert snapshot_days(engine) == ["2024-01-05", "2024-01-20", "2024-02-01", "2024-03-01"]
+    assert stock_service.ensure_stock_snapshots() == 0
+    for as_of, totals in expected.items():
+        assert balances(stock_service.stock_balance_as_of(as_of)) == totals
+    assert stock_service.stock_balance_as_of(date(2024, 1, 31))["snapshot"] == "2024-02-01"
+
+    # A backdated movement invalidates later snapshots; the next lookup
+    # rebuilds them from the one left.
+    db.add(StockItem(urun_adi="Mouse", adet=2, islem="giris", tarih=date(2024, 1, 10)))
+    db.commit()
+    assert snapshot_days(engine) == ["2024-01-05"]
+    assert balances(stock_service.stock_balance_as_of(date(2024, 2, 29))) == {"Mouse": 8, "Kablo": 7}
+    assert len(snapshot_days(engine)) == 5
+
+    # Undated movements count towards every date and keep the snapshots.
+    db.add(StockItem(urun_adi="Kablo", adet=1, islem="cikis"))
+    db.commit()
+    assert len(snapshot_days(engine)) == 5
+    assert balances(stock_service.stock_balance_as_of(date(2024, 1, 31))) == {"Mouse": 8, "Kablo": -1}
+    assert balances(stock_service.stock_balance_as_of(date(2024, 3, 31))) == {"Mouse": 7, "Kablo": 6}
+
+    # Lowering adet on a row (assign/transfer) only touches its own date on.
+    kablo = db.query(StockItem).filter_by(urun_adi="Kablo", islem="giris").one()
+    kablo.adet = 5
+    db.commit()
+    assert snapshot_days(engine) == ["2024-01-05", "2024-01-10", "2024-01-20"]
+    assert balances(stock_service.stock_balance_as_of(date(2024, 3, 31))) == {"Mouse": 7, "Kablo": 4}
+    db.close()
+
+
+def snapshot_days(engine):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(
+            "SELECT DISTINCT snapshot_date FROM stock_balance_snapshots ORDER BY 1"
+        ).scalars().all()
@@ -0,0 +1,38 @@
+import sqlite3
+
+from sqlalchemy import create_engine
+
+import models
+from services import cache
+
+
+def test_versions_see_commits_from_other_connections(tmp_path, monkeypatch):
+    db_file = tmp_path / "envanter.db"
+    engine = create_engine(f"sqlite:///{db_file}")
+    models.Base.metadata.create_all(bind=engine)
+    with sqlite3.connect(db_file) as con:
+        con.executescript(open("db/migrations/001_inventory_logs.sql").read())
+        con.executescript(open("db/migrations/013_table_versions.sql").read())
+    monkeypatch.setattr(models, "engine", engine)
+    checker = cache.TableVersions()
+    monkeypatch.setattr(cache, "table_versions", checker)
+
+    before = cache.versions(["hardware_inventory", "users"])
+    assert cache.versions(["hardware_inventory", "users"]) == before
+
+    # Another "worker" writes through its own connection.
+    with sqlite3.connect(db_file) as other:
+        other.execute("INSERT INTO hardware_inventory (no) VALUES ('PC-1')")
+    after = cache.versions(["hardware_inventory", "users"])
+    assert after[0][1] == before[0][1] + 1
+    assert after[1] == before[1]
+    assert cache.last_modified(["hardware_inventory"]) is not None
+    checker.close()
+
+
+def test_versions_fall_back_to_local_counters_in_memory(monkeypatch):
+    monkeypatch.setattr(models, "engine", create_engine("sqlite://"))
+    before = cache.versions(["lookup_items"])
+    cache.bump("lookup_items")
+    assert cache.versions(["lookup_items"])[0][0] == before[0][0] + 1
+    assert cache.versions(["lookup_items"])[0][1] == 0
@@ -8,7 +8,6 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 from starlette.middleware.sessions import SessionMiddleware
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -21,11 +20,12 @@ from utils.auth import require_login
 import services.log_service as log_service
 
 
-def setup_db():
+def setup_db(path):
+    # Inventory logs are written in the same transaction as the inventory
+    # change, so the ORM and the log service must share one database file.
     engine = create_engine(
-        "sqlite://",
+        f"sqlite:///{path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     models.engine = engine
@@ -62,9 +62,9 @@ def setup_log_db(path):
 
 
 def test_user_history_returns_assignment_changes(tmp_path):
-    setup_db()
     log_db = tmp_path / "log.db"
     setup_log_db(log_db)
+    setup_db(log_db)
     log_service.DB_PATH = str(log_db)
     reports_module.DB_PATH = str(log_db)
     app = create_app()
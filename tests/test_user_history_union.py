@@ -0,0 +1,53 @@
+import sqlite3
+
+from services import log_service
+
+
+def setup_log_db(path):
+    con = sqlite3.connect(path)
+    con.executescript(
+        """
+        CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, first_name TEXT, last_name TEXT);
+        CREATE TABLE lookup_items (id INTEGER PRIMARY KEY, type TEXT, name TEXT);
+        """
+    )
+    for mig in [
+        "001_inventory_logs.sql",
+        "003_add_inventory_no_columns.sql",
+        "007_inventory_log_user_indexes.sql",
+    ]:
+        with open(f"db/migrations/{mig}") as f:
+            con.executescript(f.read())
+    rows = [
+        # (old_user_id, new_user_id, change_date)
+        (None, 1, "2024-01-01 09:00:00"),
+        (1, 2, "2024-01-02 09:00:00"),
+        (2, 3, "2024-01-03 09:00:00"),
+        (1, 1, "2024-01-04 09:00:00"),
+        (3, 1, "2024-01-05 09:00:00"),
+    ]
+    con.executemany(
+        "INSERT INTO inventory_logs (inventory_type, inventory_id, old_user_id, new_user_id, action, changed_by, change_date) VALUES ('pc', 1, ?, ?, 'assign', 9, ?)",
+        rows,
+    )
+    con.commit()
+    con.close()
+
+
+def test_user_history_merges_both_sides_without_duplicates(tmp_path):
+    log_db = tmp_path / "logs.db"
+    setup_log_db(log_db)
+    log_service.DB_PATH = str(log_db)
+
+    rows = log_service.get_inventory_logs(user_id=1)
+    assert [r["id"] for r in rows] == [5, 4, 2, 1]
+
+    assert [r["id"] for r in log_service.get_inventory_logs(user_id=1, limit=2, offset=1)] == [4, 2]
+
+    cursor = log_service.next_cursor(rows[:2], 2)
+    older = log_service.get_inventory_logs(user_id=1, limit=2, before=cursor)
+    assert [r["id"] for r in older] == [2, 1]
+
+    after = log_service.encode_cursor(rows[2]["change_date"], rows[2]["id"])
+    newer = log_service.get_inventory_logs(user_id=1, limit=1, after=after)
+    assert [r["id"] for r in newer] == [4]
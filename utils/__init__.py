@@ -9,13 +9,15 @@ from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 
 from models import (
+    is_shadow_column,
     engine,
-    ActivityLog,
     DeletedHardwareInventory,
     DeletedPrinterInventory,
     DeletedLicenseInventory,
     DeletedStockItem,
 )
+from services.activity_log import activity_writer
+from services.cache import bump
 
 TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
 # Reusable Jinja2 template loader using an absolute path
@@ -60,13 +62,15 @@ def save_home_stock(items: List[str]) -> None:
     os.makedirs(os.path.dirname(HOME_STOCK_FILE), exist_ok=True)
     with open(HOME_STOCK_FILE, "w") as fh:
         json.dump(items, fh)
+    bump("home_stock")
 
 
 def get_table_columns(table_name: str) -> List[str]:
     """Return a list of column names for the given table."""
     columns = [col["name"] for col in inspect(engine).get_columns(table_name)]
-    # Skip primary key identifiers which are not meant for display/editing
-    cols = [c for c in columns if c != "id"]
+    # Skip primary key identifiers and shadow columns which are not meant
+    # for display/editing
+    cols = [c for c in columns if c != "id" and not is_shadow_column(c)]
     # Ensure inventory number appears first if present
     if "envanter_no" in cols:
         cols.remove("envanter_no")
@@ -98,6 +102,10 @@ def cleanup_deleted(db: Session) -> None:
 
 
 def log_action(db: Session, username: str, action: str) -> None:
-    """Record a user action in the activity log."""
-    db.add(ActivityLog(username=username, action=action))
-    db.commit()
+    """Record a user action in the activity log.
+
+    The entry is buffered and written in a batch by the activity log writer,
+    so callers must commit their own changes; ``db`` only selects the target
+    database.
+    """
+    activity_writer.add(db.get_bind(), username, action)
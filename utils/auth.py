@@ -1,8 +1,15 @@
+import os
+from typing import Any, Dict, Optional
+
 from fastapi import Depends, HTTPException, Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from models import User, get_db
+from services.cache import SnapshotCache
 
 
 def require_login(request: Request):
@@ -35,38 +42,96 @@ def require_admin(
     return None
 
 
-class RememberMeMiddleware(BaseHTTPMiddleware):
-    """Populate sessions based on persistent remember-me tokens."""
-
-    async def dispatch(self, request: Request, call_next):
-        token = request.cookies.get("session_token")
-        invalid_token = False
-        if token:
-            from models import RememberToken, SessionLocal, User
-
-            db = SessionLocal()
-            try:
-                record = db.query(RememberToken).filter_by(token=token).first()
-                if record:
-                    if not request.session.get("user_id"):
-                        user = db.get(User, record.user_id)
-                        if user:
-                            request.session["user_id"] = user.id
-                            request.session["username"] = user.username
-                            request.session["is_admin"] = user.is_admin
-                            request.session["full_name"] = (
-                                f"{user.first_name or ''} {user.last_name or ''}".strip()
-                            )
-                        else:
-                            db.delete(record)
-                            db.commit()
-                            invalid_token = True
-                else:
-                    invalid_token = True
-                    request.session.clear()
-            finally:
-                db.close()
-        response = await call_next(request)
-        if invalid_token:
-            response.delete_cookie("session_token")
-        return response
+# Maximum age in seconds of a cached remember-me token lookup.
+REMEMBER_CACHE_TTL = float(os.getenv("REMEMBER_CACHE_TTL", "300"))
+REMEMBER_CACHE_SIZE = 1024
+
+# Paths served without looking at the session or remember-me cookie.
+PUBLIC_PREFIXES = ("/static/", "/image/")
+
+# Resolved tokens; any write to either table (a login or logout replaces the
+# user's tokens) invalidates every entry.
+remember_tokens = SnapshotCache(
+    ("remember_tokens", "users"), REMEMBER_CACHE_TTL, REMEMBER_CACHE_SIZE
+)
+
+
+def _expired_cookie(name: str) -> str:
+    response = Response()
+    response.delete_cookie(name)
+    return response.headers["set-cookie"]
+
+
+_EXPIRED_TOKEN_COOKIE = _expired_cookie("session_token")
+
+
+def resolve_remember_token(token: str) -> Optional[Dict[str, Any]]:
+    """Return the session values for ``token``, or ``None`` if it is invalid.
+
+    Tokens whose user no longer exists are deleted.
+    """
+
+    def load() -> Optional[Dict[str, Any]]:
+        from models import RememberToken, SessionLocal
+
+        db = SessionLocal()
+        try:
+            record = db.query(RememberToken).filter_by(token=token).first()
+            if not record:
+                return None
+            user = db.get(User, record.user_id)
+            if not user:
+                db.delete(record)
+                db.commit()
+                return None
+            return {
+                "user_id": user.id,
+                "username": user.username,
+                "is_admin": user.is_admin,
+                "full_name": f"{user.first_name or ''} {user.last_name or ''}".strip(),
+            }
+        finally:
+            db.close()
+
+    return remember_tokens.get(token, load)
+
+
+class RememberMeMiddleware:
+    """Populate sessions based on persistent remember-me tokens.
+
+    Must run inside ``SessionMiddleware``. Requests for static assets and
+    requests whose session is already signed in pass straight through; for
+    the rest the ``session_token`` cookie is resolved through
+    :data:`remember_tokens`. An invalid token clears the session and the
+    cookie.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(PUBLIC_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        session = scope.get("session")
+        if session is None or session.get("user_id"):
+            await self.app(scope, receive, send)
+            return
+        token = HTTPConnection(scope).cookies.get("session_token")
+        if not token:
+            await self.app(scope, receive, send)
+            return
+        values = resolve_remember_token(token)
+        if values is not None:
+            session.update(values)
+            await self.app(scope, receive, send)
+            return
+
+        session.clear()
+
+        async def send_expiring_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("set-cookie", _EXPIRED_TOKEN_COOKIE)
+            await send(message)
+
+        await self.app(scope, receive, send_expiring_cookie)
@@ -0,0 +1,144 @@
+"""Conditional GET support for list pages and JSON endpoints.
+
+ETags are derived from the versions of the tables a response is built from
+(see :mod:`services.cache`), the request path and query string and, for
+pages, the signed-in user and CSRF cookie. A matching ``If-None-Match`` is
+answered with ``304 Not Modified`` from the route dependency, before the
+handler runs any query or renders a template.
+"""
+
+import glob
+import hashlib
+import os
+from datetime import date, datetime, timezone
+from email.utils import format_datetime
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, Request, Response
+from fastapi_csrf_protect import CsrfProtect
+
+from services.cache import last_modified, versions
+
+# Changes when a migration ships, so schema-derived responses refresh.
+_MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "db", "migrations")
+SCHEMA_TAG = ",".join(
+    sorted(os.path.basename(p) for p in glob.glob(os.path.join(_MIGRATIONS_DIR, "*.sql")))
+)
+
+_SESSION_KEYS = ("user_id", "username", "is_admin", "full_name")
+
+
+def _http_date(stamp: str) -> Optional[str]:
+    try:
+        parsed = datetime.strptime(stamp[:19], "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+    return format_datetime(parsed.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return whether an ``If-None-Match`` header value matches ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _digest(parts) -> str:
+    return 'W/"%s"' % hashlib.sha1("\n".join(parts).encode()).hexdigest()[:20]
+
+
+class ConditionalGet:
+    """Route dependency implementing ETag revalidation.
+
+    ``tables`` lists the tables the response is built from, ``files`` any
+    settings files it reads and ``schema=True`` marks responses derived from
+    the table layout. ``page=True`` marks HTML pages, whose ETag also covers
+    the signed-in user, the current date and the CSRF cookie the embedded
+    token belongs to. Handlers returning a ``Response`` themselves pass it
+    to :func:`apply_etag`.
+    """
+
+    def __init__(
+        self,
+        *tables: str,
+        files: Iterable[str] = (),
+        page: bool = False,
+        schema: bool = False,
+    ):
+        self.tables = tables
+        self.files = tuple(files)
+        self.page = page
+        self.schema = schema
+
+    def parts(self, request: Request) -> list:
+        parts = [
+            request.url.path,
+            repr(sorted(request.query_params.multi_items())),
+            repr(versions(self.tables)),
+        ]
+        for path in self.files:
+            try:
+                parts.append(str(os.stat(path).st_mtime_ns))
+            except OSError:
+                parts.append("-")
+        if self.schema:
+            parts.append(SCHEMA_TAG)
+        if self.page:
+            session = request.scope.get("session") or {}
+            parts.append(repr([session.get(k) for k in _SESSION_KEYS]))
+            parts.append(date.today().isoformat())
+        return parts
+
+    def headers(self, etag: str) -> dict:
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        # Table timestamps only date responses built from nothing else. They
+        # have one second resolution, so revalidation relies on the ETag.
+        if not (self.files or self.schema or self.page):
+            stamp = last_modified(self.tables)
+            http_date = _http_date(stamp) if stamp else None
+            if http_date:
+                headers["Last-Modified"] = http_date
+        return headers
+
+    def __call__(self, request: Request, response: Response) -> str:
+        parts = self.parts(request)
+        if self.page:
+            csrf_cookie = request.cookies.get(CsrfProtect._cookie_key)
+            etag = _digest(parts + [csrf_cookie or ""])
+        else:
+            etag = _digest(parts)
+        headers = self.headers(etag)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        request.state.etag_parts = parts
+        request.state.etag_headers = headers
+        return etag
+
+
+def apply_etag(
+    response: Response, request: Request, csrf_cookie: Optional[str] = None
+) -> Response:
+    """Copy the headers computed by :class:`ConditionalGet` onto ``response``.
+
+    Pages pass the signed CSRF token they set as ``csrf_cookie``; the ETag
+    then matches the browser's next request only while that cookie is still
+    current, so a page revalidated with 304 never carries a stale token.
+    """
+    headers = getattr(request.state, "etag_headers", None)
+    if headers is None:
+        return response
+    headers = dict(headers)
+    if csrf_cookie is not None:
+        headers["ETag"] = _digest(request.state.etag_parts + [csrf_cookie])
+    response.headers.update(headers)
+    return response
+
+
+__all__ = ["ConditionalGet", "apply_etag", "etag_matches"]